@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Iterable
 import contextlib
 from datetime import datetime, timedelta
+import importlib
 import logging
 import logging.handlers
 import os
@@ -21,12 +23,14 @@ from .const import (
     REQUIRED_NEXT_PYTHON_HA_RELEASE,
     REQUIRED_NEXT_PYTHON_VER,
     SIGNAL_BOOTSTRAP_INTEGRATONS,
+    Platform,
 )
 from .exceptions import HomeAssistantError
-from .helpers import area_registry, device_registry, entity_registry
+from .helpers import area_registry, device_registry, entity_registry, template
 from .helpers.dispatcher import async_dispatcher_send
 from .helpers.typing import ConfigType
 from .setup import (
+    DATA_IMPORT_TIME,
     DATA_SETUP,
     DATA_SETUP_STARTED,
     DATA_SETUP_TIME,
@@ -36,7 +40,7 @@ from .setup import (
 from .util import dt as dt_util
 from .util.async_ import gather_with_concurrency
 from .util.logging import async_activate_log_queue_handler
-from .util.package import async_get_user_site, is_virtual_env
+from .util.package import async_get_user_site, is_installed, is_virtual_env
 
 if TYPE_CHECKING:
     from .runner import RuntimeConfig
@@ -540,11 +544,14 @@ async def _async_set_up_integrations(
 
     stage_2_domains = domains_to_setup - logging_domains - debuggers - stage_1_domains
 
-    # Load the registries
+    # Load the registries and the compiled templates of the previous run
+    # while the integrations are imported in the executor
     await asyncio.gather(
         device_registry.async_load(hass),
         entity_registry.async_load(hass),
         area_registry.async_load(hass),
+        template.async_load_bytecode_cache(hass),
+        _async_preload_integrations(hass, integration_cache, domains_to_setup),
     )
 
     # Start setup
@@ -591,3 +598,107 @@ async def _async_set_up_integrations(
             )
         },
     )
+    _LOGGER.debug(
+        "Integration import times: %s",
+        {
+            module: import_time.total_seconds()
+            for module, import_time in sorted(
+                hass.data.get(DATA_IMPORT_TIME, {}).items(),
+                key=lambda item: item[1].total_seconds(),
+            )
+        },
+    )
+
+
+def _preload_integration(
+    integration: loader.Integration, platforms: Iterable[str]
+) -> dict[str, timedelta]:
+    """Import an integration and its platforms, return the time per module.
+
+    Import errors are left to the setup of the integration to report.
+    """
+    import_time: dict[str, timedelta] = {}
+    if not all(is_installed(req) for req in integration.requirements):
+        # Importing would fail until setup installs the requirements
+        return import_time
+
+    modules = [(integration.domain, integration.pkg_path)]
+    modules.extend(
+        (f"{integration.domain}.{platform}", f"{integration.pkg_path}.{platform}")
+        for platform in platforms
+        if platform in integration.platforms
+    )
+    for name, module in modules:
+        start = monotonic()
+        try:
+            importlib.import_module(module)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("Preloading %s failed", module, exc_info=True)
+            if name == integration.domain:
+                break
+            continue
+        import_time[name] = timedelta(seconds=monotonic() - start)
+    return import_time
+
+
+async def _async_preload_integrations(
+    hass: core.HomeAssistant,
+    integrations: dict[str, loader.Integration],
+    domains: set[str],
+) -> None:
+    """Import the integrations and their entity platforms in the executor.
+
+    Setup imports them from the event loop otherwise. An integration is
+    imported once its dependencies are, integrations that do not depend
+    on each other are imported in parallel. Integrations that depend on
+    each other are imported in any order.
+    """
+    import_time: dict[str, timedelta] = hass.data.setdefault(DATA_IMPORT_TIME, {})
+    loaded = hass.data.get(loader.DATA_COMPONENTS, {})
+    platforms = [platform.value for platform in Platform if platform.value in domains]
+    tasks: dict[str, asyncio.Task] = {}
+    waits_on: dict[str, set[str]] = {}
+
+    def _async_waits_on(domain: str, target: str) -> bool:
+        """Return if the preload of domain waits on target, directly or not."""
+        seen: set[str] = set()
+        pending = [domain]
+        while pending:
+            if (current := pending.pop()) == target:
+                return True
+            if current not in seen:
+                seen.add(current)
+                pending.extend(waits_on.get(current, ()))
+        return False
+
+    async def _async_preload(integration: loader.Integration) -> None:
+        dependencies = []
+        for dep in integration.dependencies:
+            if (task := _async_preload_task(dep)) is None:
+                continue
+            # Circular dependencies are reported by setup, waiting on
+            # each other would never finish
+            if _async_waits_on(dep, integration.domain):
+                continue
+            waits_on.setdefault(integration.domain, set()).add(dep)
+            dependencies.append(task)
+        if dependencies:
+            await asyncio.wait(dependencies)
+        import_time.update(
+            await hass.async_add_executor_job(
+                _preload_integration, integration, platforms
+            )
+        )
+
+    def _async_preload_task(domain: str) -> asyncio.Task | None:
+        if (task := tasks.get(domain)) is not None:
+            return task
+        if (integration := integrations.get(domain)) is None or domain in loaded:
+            return None
+        task = tasks[domain] = asyncio.create_task(_async_preload(integration))
+        return task
+
+    for domain in domains:
+        _async_preload_task(domain)
+    if tasks:
+        await asyncio.wait(tasks.values())
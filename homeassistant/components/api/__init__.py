@@ -13,6 +13,7 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_TIME_CHANGED,
     MATCH_ALL,
@@ -165,6 +166,13 @@ class APIConfigView(HomeAssistantView):
         return self.json(request.app["hass"].config.as_dict())
 
 
+def _json_response(body: str) -> web.Response:
+    """Return a response for JSON that has already been serialized."""
+    response = web.Response(body=body.encode("UTF-8"), content_type=CONTENT_TYPE_JSON)
+    response.enable_compression()
+    return response
+
+
 class APIStatesView(HomeAssistantView):
     """View to handle States requests."""
 
@@ -181,7 +189,13 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            return _json_response(
+                "[" + ",".join(state.as_json() for state in states) + "]"
+            )
+        except (ValueError, TypeError):
+            # Let the regular serializer log and report the bad data
+            return self.json(states)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -198,7 +212,10 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         if state := request.app["hass"].states.get(entity_id):
-            return self.json(state)
+            try:
+                return _json_response(state.as_json())
+            except (ValueError, TypeError):
+                return self.json(state)
         return self.json_message("Entity not found.", HTTPStatus.NOT_FOUND)
 
     async def post(self, request, entity_id):
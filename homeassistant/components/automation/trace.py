@@ -5,7 +5,7 @@ from contextlib import contextmanager
 from typing import Any
 
 from homeassistant.components.trace import ActionTrace, async_store_trace
-from homeassistant.components.trace.const import CONF_STORED_TRACES
+from homeassistant.components.trace.const import CONF_COMPACT, CONF_STORED_TRACES
 from homeassistant.core import Context
 
 from .const import DOMAIN
@@ -50,6 +50,7 @@ def trace_automation(
 ):
     """Trace action execution of automation with automation_id."""
     trace = AutomationTrace(automation_id, config, blueprint_inputs, context)
+    trace.compact = trace_config[CONF_COMPACT]
     async_store_trace(hass, trace, trace_config[CONF_STORED_TRACES])
 
     try:
@@ -1,33 +1,47 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
-from collections.abc import Iterable
+import asyncio
+from collections.abc import Callable, Iterable
 from datetime import datetime as dt, timedelta
+from functools import partial
 from http import HTTPStatus
 import logging
+import threading
 import time
-from typing import cast
+from typing import Any, cast
 
 from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 from sqlalchemy import not_, or_
 import voluptuous as vol
 
 from homeassistant.components import frontend, websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder import history, models as history_models
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
     statistics_during_period,
 )
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_DOMAINS,
+    CONF_ENTITIES,
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.deprecation import deprecated_class, deprecated_function
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.json import JSON_DUMP
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
@@ -38,6 +52,14 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
 
+# Number of serialized entity series waiting to be sent when streaming
+STREAM_MAX_PENDING_CHUNKS = 4
+
+# Period of history sent per message by the history/stream command
+STREAM_CHUNK_DURATION = timedelta(hours=6)
+# Seconds to wait for the recorder to commit before streaming the history
+STREAM_COMMIT_TIMEOUT = 10
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -101,6 +123,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     frontend.async_register_built_in_panel(hass, "history", "history", "hass:chart-box")
     websocket_api.async_register_command(hass, ws_get_statistics_during_period)
     websocket_api.async_register_command(hass, ws_get_list_statistic_ids)
+    websocket_api.async_register_command(hass, ws_stream)
 
     return True
 
@@ -172,6 +195,269 @@ async def ws_get_list_statistic_ids(
     connection.send_result(msg["id"], statistic_ids)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Required("entity_ids"): cv.entity_ids,
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=True): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_stream(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Stream the history of entities, then follow their state changes.
+
+    The history is sent in time ordered chunks. Unless the end_time is in
+    the past, the subscription then switches to the live state changes of
+    the entities, the changes that happen while the history is streamed
+    are held back until it has been sent. Once the end_time is reached, a
+    finished event is sent and the subscription is removed.
+    """
+    msg_id = msg["id"]
+    start_time_str = msg["start_time"]
+    end_time_str = msg.get("end_time")
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg_id, "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str:
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg_id, "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    now = dt_util.utcnow()
+    stream = _HistoryStream(
+        hass,
+        connection,
+        msg_id,
+        msg["entity_ids"],
+        end_time,
+        msg["significant_changes_only"],
+        msg["minimal_response"],
+    )
+    if end_time is None or end_time > now:
+        stream.async_follow_live()
+
+    connection.subscriptions[msg_id] = stream.async_unsubscribe
+    connection.send_result(msg_id)
+
+    await stream.async_send_history(
+        start_time,
+        min(end_time, now) if end_time else now,
+        msg["include_start_time_state"],
+    )
+    stream.async_history_sent()
+
+
+class _HistoryStream:
+    """Send the history of entities followed by their live state changes."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        entity_ids: list[str],
+        end_time: dt | None,
+        significant_changes_only: bool,
+        minimal_response: bool,
+    ) -> None:
+        """Initialize the stream."""
+        self.hass = hass
+        self.connection = connection
+        self.msg_id = msg_id
+        self.entity_ids = entity_ids
+        self.end_time = end_time
+        self.significant_changes_only = significant_changes_only
+        self.minimal_response = minimal_response
+        self.held_back: list[State] | None = []
+        self.cancelled = False
+        self._unsub_live: CALLBACK_TYPE | None = None
+        self._unsub_end: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_follow_live(self) -> None:
+        """Start following the state changes until the end_time."""
+        self._unsub_live = self.hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED,
+            "entity_id",
+            self.entity_ids,
+            self._async_forward_state_change,
+        )
+        if self.end_time is not None:
+            self._unsub_end = async_track_point_in_utc_time(
+                self.hass, self._async_end_time_reached, self.end_time
+            )
+
+    @callback
+    def async_unsubscribe(self) -> None:
+        """Stop streaming."""
+        self.cancelled = True
+        self._async_stop_live()
+
+    async def async_send_history(
+        self, start_time: dt, history_end: dt, include_start_time_state: bool
+    ) -> None:
+        """Send the recorded history in time ordered chunks."""
+        if self._unsub_live and (instance := self.hass.data.get(DATA_INSTANCE)):
+            # The states recorded until now have to be in the database,
+            # the changes after are held back
+            try:
+                await asyncio.wait_for(
+                    instance.async_commit_pending(), STREAM_COMMIT_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                _LOGGER.warning("Timed out waiting for the recorder to commit")
+
+        chunk_start = start_time
+        while chunk_start < history_end and not self.cancelled:
+            chunk_end = min(chunk_start + STREAM_CHUNK_DURATION, history_end)
+            chunk_json = await self.hass.async_add_executor_job(
+                _history_chunk_message_json,
+                self.hass,
+                self.msg_id,
+                chunk_start,
+                chunk_end,
+                self.entity_ids,
+                include_start_time_state and chunk_start == start_time,
+                self.significant_changes_only,
+                self.minimal_response,
+            )
+            if chunk_json and not self.cancelled:
+                self.connection.send_message(chunk_json)
+            chunk_start = chunk_end
+
+    @callback
+    def async_history_sent(self) -> None:
+        """Send the held back changes and finish if the end_time has passed."""
+        states = self.held_back
+        self.held_back = None
+        if self.cancelled:
+            return
+        if states:
+            self._send_live_states(states)
+        if self.end_time is not None and self.end_time <= dt_util.utcnow():
+            self._async_finish()
+
+    def _send_live_states(self, states: list[State]) -> None:
+        """Send the live states of the entities."""
+        states_by_entity: dict[str, list[Any]] = {}
+        for state in states:
+            states_by_entity.setdefault(state.entity_id, []).append(
+                _live_state_dict(state, self.minimal_response)
+            )
+        self.connection.send_message(
+            JSON_DUMP(
+                websocket_api.event_message(self.msg_id, {"states": states_by_entity})
+            )
+        )
+
+    @callback
+    def _async_forward_state_change(self, event: Event) -> None:
+        """Forward the significant state changes of the entities."""
+        if (new_state := event.data["new_state"]) is None:
+            return
+        if self.end_time and new_state.last_updated >= self.end_time:
+            return
+        if self.significant_changes_only and not _is_significant_state(new_state):
+            return
+        if self.held_back is not None:
+            self.held_back.append(new_state)
+            return
+        self._send_live_states([new_state])
+
+    @callback
+    def _async_stop_live(self) -> None:
+        """Stop following the state changes."""
+        if self._unsub_live:
+            self._unsub_live()
+            self._unsub_live = None
+        if self._unsub_end:
+            self._unsub_end()
+            self._unsub_end = None
+
+    @callback
+    def _async_finish(self) -> None:
+        """Tell the client the end_time has been reached and unsubscribe."""
+        self._async_stop_live()
+        self.connection.subscriptions.pop(self.msg_id, None)
+        self.connection.send_message(
+            JSON_DUMP(websocket_api.event_message(self.msg_id, {"finished": True}))
+        )
+
+    @callback
+    def _async_end_time_reached(self, _: dt) -> None:
+        """Finish the stream, unless the history is still being sent."""
+        self._unsub_end = None
+        if self.held_back is None and not self.cancelled:
+            self._async_finish()
+
+
+def _is_significant_state(state: State) -> bool:
+    """Return if a new state is a significant change like the history queries."""
+    return (
+        state.domain in history.SIGNIFICANT_DOMAINS
+        or state.last_changed == state.last_updated
+    )
+
+
+def _live_state_dict(state: State, minimal_response: bool) -> Any:
+    """Return a live state in the format of the history."""
+    if minimal_response and state.domain not in history.NEED_ATTRIBUTE_DOMAINS:
+        return {
+            history.STATE_KEY: state.state,
+            history.LAST_CHANGED_KEY: state.last_changed.isoformat(),
+        }
+    return state.as_dict()
+
+
+def _history_chunk_message_json(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+) -> str | None:
+    """Fetch a chunk of the history and serialize it as an event message."""
+    states = history.get_significant_states(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        None,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    )
+    if not states:
+        return None
+    return JSON_DUMP(
+        websocket_api.event_message(
+            msg_id,
+            {
+                "states": states,
+                "start_time": start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+            },
+        )
+    )
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -230,6 +516,41 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        if (resolution_str := request.query.get("resolution")) is not None:
+            try:
+                resolution = timedelta(seconds=float(resolution_str))
+            except (OverflowError, ValueError):
+                resolution = None
+            if not resolution or resolution <= timedelta(0):
+                return self.json_message("Invalid resolution", HTTPStatus.BAD_REQUEST)
+            if not entity_ids:
+                return self.json_message(
+                    "filter_entity_id is required with resolution",
+                    HTTPStatus.BAD_REQUEST,
+                )
+            return self.json(
+                await hass.async_add_executor_job(
+                    history.get_downsampled_states,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    resolution,
+                )
+            )
+
+        if "stream" in request.query:
+            return await self._async_stream_significant_states(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -290,6 +611,102 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    async def _async_stream_significant_states(
+        self,
+        request: web.Request,
+        hass: HomeAssistant,
+        start_time: dt,
+        end_time: dt,
+        entity_ids: list[str] | None,
+        include_start_time_state: bool,
+        significant_changes_only: bool,
+        minimal_response: bool,
+    ) -> web.StreamResponse:
+        """Stream the significant states one entity series at a time.
+
+        The series are serialized in the executor and handed over through
+        a small bounded queue, so the memory use stays flat no matter how
+        long the period is. The include order is not applied.
+        """
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(STREAM_MAX_PENDING_CHUNKS)
+        cancelled = threading.Event()
+
+        def _put_chunk(chunk: bytes | None) -> bool:
+            """Wait for room in the queue, return False once the client is gone."""
+            if cancelled.is_set():
+                return False
+            asyncio.run_coroutine_threadsafe(queue.put(chunk), hass.loop).result()
+            return True
+
+        producer = hass.async_add_executor_job(
+            partial(
+                self._stream_significant_states_json,
+                hass,
+                _put_chunk,
+                start_time,
+                end_time,
+                entity_ids,
+                filters=self.filters,
+                include_start_time_state=include_start_time_state,
+                significant_changes_only=significant_changes_only,
+                minimal_response=minimal_response,
+            )
+        )
+        try:
+            while (chunk := await queue.get()) is not None:
+                await response.write(chunk)
+        finally:
+            cancelled.set()
+            # Unblock the producer if it is waiting for room in the queue
+            while not queue.empty():
+                queue.get_nowait()
+            await producer
+
+        await response.write_eof()
+        return response
+
+    def _stream_significant_states_json(
+        self,
+        hass: HomeAssistant,
+        put_chunk: Callable[[bytes | None], bool],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """Serialize the significant states to json chunks."""
+        timer_start = time.perf_counter()
+        separator = b"["
+        entities = 0
+        try:
+            with session_scope(hass=hass) as session:
+                for entity_id, states in history.stream_significant_states_with_session(
+                    hass, session, *args, **kwargs
+                ):
+                    try:
+                        chunk = JSON_DUMP(states).encode("utf-8")
+                    except (ValueError, TypeError) as err:
+                        _LOGGER.error(
+                            "Unable to serialize the history of %s to JSON: %s",
+                            entity_id,
+                            err,
+                        )
+                        continue
+                    if not put_chunk(separator + chunk):
+                        return
+                    separator = b","
+                    entities += 1
+            if put_chunk(b"[]" if separator == b"[" else b"]"):
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    elapsed = time.perf_counter() - timer_start
+                    _LOGGER.debug(
+                        "Streamed the history of %d entities in %fs", entities, elapsed
+                    )
+        finally:
+            put_chunk(None)
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf: ConfigType) -> Filters | None:
     """Build a sql filter from config."""
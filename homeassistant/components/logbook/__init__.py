@@ -1,24 +1,37 @@
 """Event parser and human readable log generator."""
+from __future__ import annotations
+
+import asyncio
 from contextlib import suppress
 from datetime import timedelta
 from http import HTTPStatus
 from itertools import groupby
 import json
+import logging
 import re
+import threading
+from typing import NamedTuple
 
 import sqlalchemy
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
-from homeassistant.components import frontend
+from homeassistant.components import frontend, websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
+    EVENTS_TIME_FIRED_AS_TIMESTAMP,
+    STATES_LAST_CHANGED_AS_TIMESTAMP,
+    STATES_LAST_UPDATED_AS_TIMESTAMP,
+    EventData,
     Events,
+    StateAttributes,
     States,
-    process_timestamp_to_utc_isoformat,
+    process_datetime_to_timestamp,
+    timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
@@ -29,6 +42,7 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -37,6 +51,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import (
     DOMAIN as HA_DOMAIN,
+    Event,
     HomeAssistant,
     ServiceCall,
     callback,
@@ -52,10 +67,14 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
+from homeassistant.helpers.json import JSON_DUMP, JSONEncoder
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
+_LOGGER = logging.getLogger(__name__)
+
 ENTITY_ID_JSON_TEMPLATE = '"entity_id":"{}"'
 ENTITY_ID_JSON_EXTRACT = re.compile('"entity_id": ?"([^"]+)"')
 DOMAIN_JSON_EXTRACT = re.compile('"domain": ?"([^"]+)"')
@@ -65,6 +84,7 @@ ATTR_MESSAGE = "message"
 CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
+DATA_LOGBOOK_FILTERS = "logbook_filters"
 
 GROUP_BY_MINUTES = 15
 
@@ -73,6 +93,13 @@ UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
 HA_DOMAIN_ENTITY_ID = f"{HA_DOMAIN}._"
 
+# Number of entries per message when streaming the logbook
+STREAM_BATCH_SIZE = 500
+# Seconds to wait for the recorder to commit before streaming the logbook
+STREAM_COMMIT_TIMEOUT = 10
+# Number of contexts remembered to describe the live entries
+MAX_LIVE_CONTEXTS = 10000
+
 CONFIG_SCHEMA = vol.Schema(
     {DOMAIN: INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA}, extra=vol.ALLOW_EXTRA
 )
@@ -88,20 +115,6 @@ ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED = [
     *HOMEASSISTANT_EVENTS,
 ]
 
-ALL_EVENT_TYPES = [
-    EVENT_STATE_CHANGED,
-    *ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED,
-]
-
-EVENT_COLUMNS = [
-    Events.event_type,
-    Events.event_data,
-    Events.time_fired,
-    Events.context_id,
-    Events.context_user_id,
-    Events.context_parent_id,
-]
-
 SCRIPT_AUTOMATION_EVENTS = [EVENT_AUTOMATION_TRIGGERED, EVENT_SCRIPT_STARTED]
 
 LOG_MESSAGE_SCHEMA = vol.Schema(
@@ -166,7 +179,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         filters = None
         entities_filter = None
 
+    hass.data[DATA_LOGBOOK_FILTERS] = (filters, entities_filter)
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    websocket_api.async_register_command(hass, ws_event_stream)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -257,6 +272,181 @@ class LogbookView(HomeAssistantView):
         return await hass.async_add_executor_job(json_events)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/event_stream",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+@websocket_api.async_response
+async def ws_event_stream(hass, connection, msg):  # noqa: C901
+    """Stream the logbook entries of a period, then follow the new entries.
+
+    The entries of the period are sent in batches as they are humanified.
+    Unless the end_time is in the past, the subscription then keeps sending
+    the new entries, the events that happen while the period is streamed
+    are held back until it has been sent. The entity attribute cache and
+    the context lookup are shared by the whole stream.
+    """
+    msg_id = msg["id"]
+    if start_time := dt_util.parse_datetime(msg["start_time"]):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg_id, "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str := msg.get("end_time"):
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg_id, "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    filters, entities_filter = hass.data[DATA_LOGBOOK_FILTERS]
+    if entity_ids := msg.get("entity_ids"):
+        live_filter = generate_filter([], entity_ids, [], [])
+    else:
+        entity_ids = None
+        live_filter = entities_filter
+
+    now = dt_util.utcnow()
+    history_end = min(end_time, now) if end_time else now
+    entity_attr_cache = EntityAttributeCache(hass)
+    context_lookup = {None: None}
+    held_back = []
+    cancelled = threading.Event()
+
+    @callback
+    def _async_send_live_events(events):
+        """Humanify and send the new events."""
+        entries = list(
+            humanify(
+                hass,
+                _keep_events(
+                    hass,
+                    filter(None, map(_event_to_row, events)),
+                    context_lookup,
+                    live_filter,
+                ),
+                entity_attr_cache,
+                context_lookup,
+            )
+        )
+        if len(context_lookup) > MAX_LIVE_CONTEXTS:
+            context_lookup.clear()
+            context_lookup[None] = None
+        if entries:
+            connection.send_message(
+                JSON_DUMP(websocket_api.event_message(msg_id, {"events": entries}))
+            )
+
+    @callback
+    def _async_forward_event(event):
+        """Forward the new events that end up in the logbook."""
+        if end_time and event.time_fired >= end_time:
+            return
+        if (
+            event.event_type == EVENT_STATE_CHANGED
+            and live_filter
+            and not live_filter(event.data["entity_id"])
+        ):
+            return
+        if held_back is not None:
+            held_back.append(event)
+            return
+        _async_send_live_events([event])
+
+    unsubs = []
+    if end_time is None or end_time > now:
+        if entity_ids:
+            unsubs.append(
+                hass.bus.async_listen_keyed(
+                    EVENT_STATE_CHANGED,
+                    ATTR_ENTITY_ID,
+                    entity_ids,
+                    _async_forward_event,
+                )
+            )
+        else:
+            unsubs.append(
+                hass.bus.async_listen(EVENT_STATE_CHANGED, _async_forward_event)
+            )
+        for event_type in (
+            *ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED,
+            *hass.data.get(DOMAIN, {}),
+        ):
+            unsubs.append(hass.bus.async_listen(event_type, _async_forward_event))
+
+    @callback
+    def _async_unsubscribe():
+        """Stop streaming."""
+        cancelled.set()
+        while unsubs:
+            unsubs.pop()()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+    connection.send_result(msg_id)
+
+    if unsubs and (instance := hass.data.get(DATA_INSTANCE)):
+        # The events until now have to be in the database,
+        # the events after are held back
+        try:
+            await asyncio.wait_for(
+                instance.async_commit_pending(), STREAM_COMMIT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Timed out waiting for the recorder to commit")
+
+    def _send_batch(batch):
+        """Send a batch of the entries of the period from the executor."""
+        message = JSON_DUMP(
+            websocket_api.event_message(
+                msg_id,
+                {
+                    "events": batch,
+                    "start_time": start_time.isoformat(),
+                    "end_time": history_end.isoformat(),
+                },
+            )
+        )
+        # Wait for the message to be queued so the batches are paced
+        run_callback_threadsafe(hass.loop, connection.send_message, message).result()
+
+    def _stream_period():
+        """Stream the entries of the period in batches."""
+        batch = []
+        for entry in _iter_events(
+            hass,
+            start_time,
+            history_end,
+            entity_attr_cache,
+            context_lookup,
+            entity_ids,
+            None if entity_ids else filters,
+            entities_filter,
+        ):
+            if cancelled.is_set():
+                return
+            batch.append(entry)
+            if len(batch) >= STREAM_BATCH_SIZE:
+                _send_batch(batch)
+                batch = []
+        if batch and not cancelled.is_set():
+            _send_batch(batch)
+
+    if start_time < history_end:
+        await hass.async_add_executor_job(_stream_period)
+
+    events = held_back
+    held_back = None
+    if events and not cancelled.is_set():
+        _async_send_live_events(events)
+
+
 def humanify(hass, events, entity_attr_cache, context_lookup):
     """Generate a converted list of events into Entry objects.
 
@@ -421,34 +611,49 @@ def _get_events(
     context_id=None,
 ):
     """Get events for a period of time."""
+    return list(
+        _iter_events(
+            hass,
+            start_day,
+            end_day,
+            EntityAttributeCache(hass),
+            {None: None},
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+            context_id,
+        )
+    )
+
+
+def _iter_events(
+    hass,
+    start_day,
+    end_day,
+    entity_attr_cache,
+    context_lookup,
+    entity_ids=None,
+    filters=None,
+    entities_filter=None,
+    entity_matches_only=False,
+    context_id=None,
+):
+    """Yield the logbook entries for a period of time as they are humanified."""
     assert not (
         entity_ids and context_id
     ), "can't pass in both entity_ids and context_id"
 
-    entity_attr_cache = EntityAttributeCache(hass)
-    context_lookup = {None: None}
-
-    def yield_events(query):
-        """Yield Events that are not filtered away."""
-        for row in query.yield_per(1000):
-            event = LazyEventPartialState(row)
-            context_lookup.setdefault(event.context_id, event)
-            if event.event_type == EVENT_CALL_SERVICE:
-                continue
-            if event.event_type == EVENT_STATE_CHANGED or _keep_event(
-                hass, event, entities_filter
-            ):
-                yield event
-
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
 
+    time_fired, last_updated, last_changed = _timestamp_columns(hass)
     with session_scope(hass=hass) as session:
         old_state = aliased(States, name="old_state")
 
         if entity_ids is not None:
-            query = _generate_events_query_without_states(session)
-            query = _apply_event_time_filter(query, start_day, end_day)
+            query = _generate_events_query_without_states(session, time_fired)
+            query = _apply_event_time_filter(query, time_fired, start_day, end_day)
             query = _apply_event_types_filter(
                 hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
             )
@@ -459,81 +664,208 @@ def _get_events(
 
             query = query.union_all(
                 _generate_states_query(
-                    session, start_day, end_day, old_state, entity_ids
+                    session,
+                    last_updated,
+                    last_changed,
+                    start_day,
+                    end_day,
+                    old_state,
+                    entity_ids,
                 )
             )
         else:
-            query = _generate_events_query(session)
-            query = _apply_event_time_filter(query, start_day, end_day)
-            query = _apply_events_types_and_states_filter(
-                hass, query, old_state
-            ).filter(
-                (States.last_updated == States.last_changed)
-                | (Events.event_type != EVENT_STATE_CHANGED)
+            query = _generate_events_query_without_states(session, time_fired)
+            query = _apply_event_time_filter(query, time_fired, start_day, end_day)
+            query = _apply_event_types_filter(
+                hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
+            )
+            states_query = _generate_states_query(
+                session, last_updated, last_changed, start_day, end_day, old_state
             )
             if filters:
-                query = query.filter(
-                    filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
-                )
+                states_query = states_query.filter(filters.entity_filter())
 
             if context_id is not None:
                 query = query.filter(Events.context_id == context_id)
+                states_query = states_query.filter(
+                    (States.context_id == context_id)
+                    | (Events.context_id == context_id)
+                )
+
+            query = query.union_all(states_query)
 
-        query = query.order_by(Events.time_fired)
+        query = query.order_by(time_fired)
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+        yield from humanify(
+            hass,
+            _keep_events(hass, query.yield_per(1000), context_lookup, entities_filter),
+            entity_attr_cache,
+            context_lookup,
         )
 
 
-def _generate_events_query(session):
-    return session.query(
-        *EVENT_COLUMNS,
-        States.state,
-        States.entity_id,
-        States.domain,
-        States.attributes,
+def _keep_events(hass, rows, context_lookup, entities_filter):
+    """Yield Events that are not filtered away."""
+    for row in rows:
+        event = LazyEventPartialState(row)
+        context_lookup.setdefault(event.context_id, event)
+        if event.event_type == EVENT_CALL_SERVICE:
+            continue
+        if event.event_type == EVENT_STATE_CHANGED or _keep_event(
+            hass, event, entities_filter
+        ):
+            yield event
+
+
+class EventAsRow(NamedTuple):
+    """A live event in the shape of a row of the logbook query."""
+
+    event_type: str
+    event_data: str | None
+    time_fired_ts: float
+    context_id: str | None
+    context_user_id: str | None
+    context_parent_id: str | None
+    shared_data: str | None
+    state: str | None
+    entity_id: str | None
+    domain: str | None
+    attributes: str | None
+    shared_attrs: str | None
+
+
+def _event_to_row(event: Event) -> EventAsRow | None:
+    """Convert a live event to a row, None if the query would not return it."""
+    if event.event_type != EVENT_STATE_CHANGED:
+        try:
+            event_data = json.dumps(event.data, cls=JSONEncoder, separators=(",", ":"))
+        except (TypeError, ValueError):
+            # The recorder does not record the event either
+            return None
+        context = event.context
+        return EventAsRow(
+            event.event_type,
+            event_data,
+            event.time_fired.timestamp(),
+            context.id,
+            context.user_id,
+            context.parent_id,
+            None,
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+
+    old_state = event.data["old_state"]
+    new_state = event.data["new_state"]
+    if old_state is None or new_state is None or old_state.state == new_state.state:
+        return None
+    if (
+        new_state.domain in CONTINUOUS_DOMAINS
+        and ATTR_UNIT_OF_MEASUREMENT in new_state.attributes
+    ):
+        return None
+    try:
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+    except (TypeError, ValueError):
+        shared_attrs = EMPTY_JSON_OBJECT
+    context = new_state.context
+    return EventAsRow(
+        EVENT_STATE_CHANGED,
+        EMPTY_JSON_OBJECT,
+        new_state.last_updated.timestamp(),
+        context.id,
+        context.user_id,
+        context.parent_id,
+        None,
+        new_state.state,
+        new_state.entity_id,
+        new_state.domain,
+        None,
+        shared_attrs,
     )
 
 
-def _generate_events_query_without_states(session):
+def _timestamp_columns(hass):
+    """Return the time_fired, last_updated and last_changed timestamp columns.
+
+    The DATETIME columns are read as timestamps while the timestamp
+    columns of the rows recorded before schema version 28 are still
+    being backfilled.
+    """
+    if hass.data[DATA_INSTANCE].timestamp_migration_done:
+        return Events.time_fired_ts, States.last_updated_ts, States.last_changed_ts
+    return (
+        EVENTS_TIME_FIRED_AS_TIMESTAMP,
+        STATES_LAST_UPDATED_AS_TIMESTAMP,
+        STATES_LAST_CHANGED_AS_TIMESTAMP,
+    )
+
+
+def _generate_events_query_without_states(session, time_fired):
     return session.query(
-        *EVENT_COLUMNS,
+        Events.event_type,
+        Events.event_data,
+        time_fired.label("time_fired_ts"),
+        Events.context_id,
+        Events.context_user_id,
+        Events.context_parent_id,
+        EventData.shared_data,
         literal(value=None, type_=sqlalchemy.String).label("state"),
         literal(value=None, type_=sqlalchemy.String).label("entity_id"),
         literal(value=None, type_=sqlalchemy.String).label("domain"),
         literal(value=None, type_=sqlalchemy.Text).label("attributes"),
-    )
+        literal(value=None, type_=sqlalchemy.Text).label("shared_attrs"),
+    ).outerjoin(EventData, (Events.data_id == EventData.data_id))
 
 
-def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
-    return (
-        _generate_events_query(session)
+def _generate_states_query(
+    session, last_updated, last_changed, start_day, end_day, old_state, entity_ids=None
+):
+    # The states are selected from the states table since the matching
+    # state_changed row in the events table is optional. The context
+    # is either stored on the state or on the linked event.
+    query = (
+        session.query(
+            literal(value=EVENT_STATE_CHANGED, type_=sqlalchemy.String).label(
+                "event_type"
+            ),
+            literal(value=EMPTY_JSON_OBJECT, type_=sqlalchemy.Text).label("event_data"),
+            last_updated.label("time_fired_ts"),
+            sqlalchemy.func.coalesce(States.context_id, Events.context_id).label(
+                "context_id"
+            ),
+            sqlalchemy.func.coalesce(
+                States.context_user_id, Events.context_user_id
+            ).label("context_user_id"),
+            sqlalchemy.func.coalesce(
+                States.context_parent_id, Events.context_parent_id
+            ).label("context_parent_id"),
+            literal(value=None, type_=sqlalchemy.Text).label("shared_data"),
+            States.state,
+            States.entity_id,
+            States.domain,
+            States.attributes,
+            StateAttributes.shared_attrs,
+        )
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
-        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
         .filter(
-            (States.last_updated == States.last_changed)
-            & States.entity_id.in_(entity_ids)
+            (last_updated > process_datetime_to_timestamp(start_day))
+            & (last_updated < process_datetime_to_timestamp(end_day))
         )
+        .filter(last_updated == last_changed)
     )
-
-
-def _apply_events_types_and_states_filter(hass, query, old_state):
-    events_query = (
-        query.outerjoin(States, (Events.event_id == States.event_id))
-        .outerjoin(old_state, (States.old_state_id == old_state.state_id))
-        .filter(
-            (Events.event_type != EVENT_STATE_CHANGED)
-            | _missing_state_matcher(old_state)
-        )
-        .filter(
-            (Events.event_type != EVENT_STATE_CHANGED) | _continuous_entity_matcher()
-        )
-    )
-    return _apply_event_types_filter(hass, events_query, ALL_EVENT_TYPES)
+    if entity_ids is not None:
+        query = query.filter(States.entity_id.in_(entity_ids))
+    return query
 
 
 def _missing_state_matcher(old_state):
@@ -552,15 +884,24 @@ def _continuous_entity_matcher():
     # Prefilter out continuous domains that have
     # ATTR_UNIT_OF_MEASUREMENT as its much faster in sql.
     #
+    # The attributes are either in the shared state_attributes
+    # table or, for rows recorded before schema 25, inline
+    # in the states table.
+    #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(
+            sqlalchemy.func.coalesce(
+                StateAttributes.shared_attrs, States.attributes
+            ).contains(UNIT_OF_MEASUREMENT_JSON)
+        ),
     )
 
 
-def _apply_event_time_filter(events_query, start_day, end_day):
+def _apply_event_time_filter(events_query, time_fired, start_day, end_day):
     return events_query.filter(
-        (Events.time_fired > start_day) & (Events.time_fired < end_day)
+        (time_fired > process_datetime_to_timestamp(start_day))
+        & (time_fired < process_datetime_to_timestamp(end_day))
     )
 
 
@@ -575,6 +916,9 @@ def _apply_event_entity_id_matchers(events_query, entity_ids):
         sqlalchemy.or_(
             *(
                 Events.event_data.contains(ENTITY_ID_JSON_TEMPLATE.format(entity_id))
+                | EventData.shared_data.contains(
+                    ENTITY_ID_JSON_TEMPLATE.format(entity_id)
+                )
                 for entity_id in entity_ids
             )
         )
@@ -701,7 +1045,7 @@ class LazyEventPartialState:
         self.context_id = self._row.context_id
         self.context_user_id = self._row.context_user_id
         self.context_parent_id = self._row.context_parent_id
-        self.time_fired_minute = self._row.time_fired.minute
+        self.time_fired_minute = int(self._row.time_fired_ts // 60 % 60)
 
     @property
     def attributes_icon(self):
@@ -709,7 +1053,9 @@ class LazyEventPartialState:
         if self._attributes:
             return self._attributes.get(ATTR_ICON)
 
-        result = ICON_JSON_EXTRACT.search(self._row.attributes)
+        result = ICON_JSON_EXTRACT.search(
+            self._row.shared_attrs or self._row.attributes
+        )
         return result and result.group(1)
 
     @property
@@ -718,7 +1064,9 @@ class LazyEventPartialState:
         if self._event_data:
             return self._event_data.get(ATTR_ENTITY_ID)
 
-        result = ENTITY_ID_JSON_EXTRACT.search(self._row.event_data)
+        result = ENTITY_ID_JSON_EXTRACT.search(
+            self._row.shared_data or self._row.event_data or ""
+        )
         return result and result.group(1)
 
     @property
@@ -727,38 +1075,41 @@ class LazyEventPartialState:
         if self._event_data:
             return self._event_data.get(ATTR_DOMAIN)
 
-        result = DOMAIN_JSON_EXTRACT.search(self._row.event_data)
+        result = DOMAIN_JSON_EXTRACT.search(
+            self._row.shared_data or self._row.event_data or ""
+        )
         return result and result.group(1)
 
     @property
     def attributes(self):
         """State attributes."""
         if not self._attributes:
-            if (
-                self._row.attributes is None
-                or self._row.attributes == EMPTY_JSON_OBJECT
-            ):
+            source = self._row.shared_attrs or self._row.attributes
+            if source is None or source == EMPTY_JSON_OBJECT:
                 self._attributes = {}
             else:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(source)
         return self._attributes
 
     @property
     def data(self):
         """Event data."""
         if not self._event_data:
-            if self._row.event_data == EMPTY_JSON_OBJECT:
+            source = self._row.shared_data or self._row.event_data
+            if not source or source == EMPTY_JSON_OBJECT:
                 self._event_data = {}
             else:
-                self._event_data = json.loads(self._row.event_data)
+                self._event_data = json.loads(source)
         return self._event_data
 
     @property
     def time_fired_isoformat(self):
         """Time event was fired in utc isoformat."""
         if not self._time_fired_isoformat:
-            self._time_fired_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.time_fired or dt_util.utcnow()
+            self._time_fired_isoformat = (
+                timestamp_to_utc_isoformat(self._row.time_fired_ts)
+                if self._row.time_fired_ts is not None
+                else dt_util.utcnow().isoformat()
             )
 
         return self._time_fired_isoformat
@@ -4,14 +4,14 @@ from __future__ import annotations
 from ast import literal_eval
 import asyncio
 from collections.abc import Awaitable, Callable
+from contextlib import suppress
 from dataclasses import dataclass
 import datetime as dt
-from functools import lru_cache, partial, wraps
+from functools import partial, wraps
 import inspect
-from itertools import groupby
 import logging
-from operator import attrgetter
 import ssl
+import threading
 import time
 from typing import Any, Union, cast
 import uuid
@@ -100,11 +100,15 @@ from .discovery import LAST_DISCOVERY
 from .models import (
     AsyncMessageCallbackType,
     MessageCallbackType,
+    ParsedPayload,
     PublishMessage,
     PublishPayloadType,
     ReceiveMessage,
     ReceivePayloadType,
+    current_payload_cv,
+    payload_json,
 )
+from .trie import TopicTrie
 from .util import _VALID_QOS_SCHEMA, valid_publish_topic, valid_subscribe_topic
 
 _LOGGER = logging.getLogger(__name__)
@@ -143,6 +147,16 @@ CONNECTION_FAILED_RECOVERABLE = "connection_failed_recoverable"
 DISCOVERY_COOLDOWN = 2
 TIMEOUT_ACK = 10
 
+# Subscription changes are sent to the broker in batches, this long after the
+# first change was queued, with at most this many topics per packet
+SUBSCRIBE_COOLDOWN = 0.1  # seconds
+MAX_SUBSCRIBES_PER_CALL = 500
+
+# Received messages are handed to the event loop in batches, a batch is
+# handed over once it is this old or this large, whichever comes first
+MESSAGE_BATCH_WINDOW = 0.005  # seconds
+MESSAGE_BATCH_SIZE = 500
+
 PLATFORMS = [
     Platform.ALARM_CONTROL_PANEL,
     Platform.BINARY_SENSOR,
@@ -370,6 +384,11 @@ class MqttValueTemplate:
 
         values: dict[str, Any] = {}
 
+        if not self._value_template.is_static:
+            # Share the parsed payload with the other subscribers
+            with suppress(ValueError, TypeError):
+                values["value_json"] = payload_json(payload)
+
         if variables is not None:
             values.update(variables)
 
@@ -751,7 +770,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str | None = attr.ib(default="utf-8")
@@ -774,7 +792,7 @@ class MQTT:
         self.hass = hass
         self.config_entry = config_entry
         self.conf = conf
-        self.subscriptions: list[Subscription] = []
+        self.subscriptions: TopicTrie[Subscription] = TopicTrie()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -782,6 +800,12 @@ class MQTT:
         self._paho_lock = asyncio.Lock()
 
         self._pending_operations: dict[str, asyncio.Event] = {}
+        self._pending_messages: list[Any] = []
+        # Dicts are used as ordered sets of topics
+        self._pending_subscribes: dict[str, None] = {}
+        self._pending_unsubscribes: dict[str, None] = {}
+        self._subscriptions_task: asyncio.Task | None = None
+        self._pending_messages_lock = threading.Lock()
 
         if self.hass.state == CoreState.running:
             self._ha_started.set()
@@ -948,59 +972,114 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
-        self.subscriptions.append(subscription)
-        self._matching_subscriptions.cache_clear()
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
+        self.subscriptions.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
-            self._last_subscribe = time.time()
-            await self._async_perform_subscription(topic, qos)
+            self._async_queue_subscribe(topic)
 
         @callback
         def async_remove() -> None:
             """Remove subscription."""
-            if subscription not in self.subscriptions:
-                raise HomeAssistantError("Can't remove subscription twice")
-            self.subscriptions.remove(subscription)
-            self._matching_subscriptions.cache_clear()
+            try:
+                self.subscriptions.remove(topic, subscription)
+            except KeyError as err:
+                raise HomeAssistantError("Can't remove subscription twice") from err
 
-            if any(other.topic == topic for other in self.subscriptions):
+            if topic in self.subscriptions:
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
             # Only unsubscribe if currently connected.
             if self.connected:
-                self.hass.async_create_task(self._async_unsubscribe(topic))
+                self._async_queue_unsubscribe(topic)
 
         return async_remove
 
-    async def _async_unsubscribe(self, topic: str) -> None:
-        """Unsubscribe from a topic.
+    @callback
+    def _async_queue_subscribe(self, topic: str) -> None:
+        """Queue a SUBSCRIBE for a topic.
 
-        This method is a coroutine.
+        A SUBSCRIBE is sent for every new subscription, even when the topic
+        is already subscribed, for the broker to resend the retained message.
         """
-        async with self._paho_lock:
-            result: int | None = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.unsubscribe, topic
-            )
-            _LOGGER.debug("Unsubscribing from %s, mid: %s", topic, mid)
-            _raise_on_error(result)
-        await self._wait_for_mid(mid)
+        self._last_subscribe = time.time()
+        self._pending_unsubscribes.pop(topic, None)
+        self._pending_subscribes[topic] = None
+        self._async_schedule_subscriptions()
 
-    async def _async_perform_subscription(self, topic: str, qos: int) -> None:
-        """Perform a paho-mqtt subscription."""
-        async with self._paho_lock:
-            result: int | None = None
-            result, mid = await self.hass.async_add_executor_job(
-                self._mqttc.subscribe, topic, qos
+    @callback
+    def _async_queue_unsubscribe(self, topic: str) -> None:
+        """Queue an UNSUBSCRIBE for a topic."""
+        self._pending_subscribes.pop(topic, None)
+        self._pending_unsubscribes[topic] = None
+        self._async_schedule_subscriptions()
+
+    async def _async_resubscribe(self) -> None:
+        """Queue a SUBSCRIBE for all topics after (re)connecting."""
+        self._pending_unsubscribes.clear()
+        for topic in self.subscriptions:
+            self._async_queue_subscribe(topic)
+
+    @callback
+    def _async_schedule_subscriptions(self) -> None:
+        """Send the queued subscription changes once the cooldown has passed."""
+        if self._subscriptions_task is None:
+            self._subscriptions_task = self.hass.async_create_task(
+                self._async_send_subscriptions()
             )
-            _LOGGER.debug("Subscribing to %s, mid: %s", topic, mid)
-            _raise_on_error(result)
-        await self._wait_for_mid(mid)
+
+    async def _async_send_subscriptions(self) -> None:
+        """Send the queued subscription changes as multi-topic packets."""
+        try:
+            await asyncio.sleep(SUBSCRIBE_COOLDOWN)
+            # Changes queued while sending are sent right after
+            while self._pending_subscribes or self._pending_unsubscribes:
+                unsubscribes = list(self._pending_unsubscribes)
+                subscribes = list(self._pending_subscribes)
+                self._pending_unsubscribes.clear()
+                self._pending_subscribes.clear()
+                if not self.connected:
+                    # All topics are subscribed again after reconnecting
+                    return
+                await self._async_perform_unsubscribes(unsubscribes)
+                await self._async_perform_subscribes(
+                    [
+                        # Subscribe with the highest requested qos
+                        (topic, max(sub.qos for sub in self.subscriptions.get(topic)))
+                        for topic in subscribes
+                        if topic in self.subscriptions
+                    ]
+                )
+        finally:
+            self._subscriptions_task = None
+
+    async def _async_perform_unsubscribes(self, topics: list[str]) -> None:
+        """Perform paho-mqtt unsubscriptions."""
+        for idx in range(0, len(topics), MAX_SUBSCRIBES_PER_CALL):
+            chunk = topics[idx : idx + MAX_SUBSCRIBES_PER_CALL]
+            async with self._paho_lock:
+                result: int | None = None
+                result, mid = await self.hass.async_add_executor_job(
+                    self._mqttc.unsubscribe, chunk
+                )
+                _LOGGER.debug("Unsubscribing from %s, mid: %s", chunk, mid)
+            if _log_on_error(result, "unsubscribe from", chunk):
+                await self._wait_for_mid(mid)
+
+    async def _async_perform_subscribes(self, topics: list[tuple[str, int]]) -> None:
+        """Perform paho-mqtt subscriptions."""
+        for idx in range(0, len(topics), MAX_SUBSCRIBES_PER_CALL):
+            chunk = topics[idx : idx + MAX_SUBSCRIBES_PER_CALL]
+            async with self._paho_lock:
+                result: int | None = None
+                result, mid = await self.hass.async_add_executor_job(
+                    self._mqttc.subscribe, chunk
+                )
+                _LOGGER.debug("Subscribing to %s, mid: %s", chunk, mid)
+            if _log_on_error(result, "subscribe to", chunk):
+                await self._wait_for_mid(mid)
 
     def _mqtt_on_connect(self, _mqttc, _userdata, _flags, result_code: int) -> None:
         """On connect callback.
@@ -1027,12 +1106,7 @@ class MQTT:
             result_code,
         )
 
-        # Group subscriptions to only re-subscribe once for each topic.
-        keyfunc = attrgetter("topic")
-        for topic, subs in groupby(sorted(self.subscriptions, key=keyfunc), keyfunc):
-            # Re-subscribe with the highest requested qos
-            max_qos = max(subscription.qos for subscription in subs)
-            self.hass.add_job(self._async_perform_subscription, topic, max_qos)
+        self.hass.add_job(self._async_resubscribe)
 
         if (
             CONF_BIRTH_MESSAGE in self.conf
@@ -1055,16 +1129,34 @@ class MQTT:
             )
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
 
-    @lru_cache(2048)
-    def _matching_subscriptions(self, topic):
-        subscriptions = []
-        for subscription in self.subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+        Runs in the paho thread, the messages are queued to be handled by the
+        event loop in batches to avoid waking up the event loop per message.
+        """
+        with self._pending_messages_lock:
+            self._pending_messages.append(msg)
+            pending = len(self._pending_messages)
+        if pending == 1:
+            self.hass.add_job(self._async_handle_messages_batch)
+        elif pending == MESSAGE_BATCH_SIZE:
+            self.hass.loop.call_soon_threadsafe(self._mqtt_handle_messages)
+
+    async def _async_handle_messages_batch(self) -> None:
+        """Handle the queued messages once the batch window has passed."""
+        await asyncio.sleep(MESSAGE_BATCH_WINDOW)
+        self._mqtt_handle_messages()
+
+    @callback
+    def _mqtt_handle_messages(self) -> None:
+        """Handle the messages queued by the paho thread."""
+        with self._pending_messages_lock:
+            messages = self._pending_messages
+            self._pending_messages = []
+        if not messages:
+            return
+        for msg in _coalesce_retained_messages(messages):
+            self._mqtt_handle_message(msg)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -1076,15 +1168,21 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        subscriptions = self._matching_subscriptions(msg.topic)
+        subscriptions = self.subscriptions.match(msg.topic)
 
-        for subscription in subscriptions:
-
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
+        # The payload is decoded and parsed as JSON once for all subscribers
+        parsed_payloads: dict[str | None, ParsedPayload | None] = {}
+        token = current_payload_cv.set(None)
+        try:
+            for subscription in subscriptions:
+                encoding = subscription.encoding
+                if encoding in parsed_payloads:
+                    parsed = parsed_payloads[encoding]
+                else:
+                    parsed = parsed_payloads[encoding] = _decode_payload(
+                        msg.payload, encoding
+                    )
+                if parsed is None:
                     _LOGGER.warning(
                         "Can't decode payload %s on %s with encoding %s (for %s)",
                         msg.payload[0:8192],
@@ -1094,17 +1192,20 @@ class MQTT:
                     )
                     continue
 
-            self.hass.async_run_hass_job(
-                subscription.job,
-                ReceiveMessage(
-                    msg.topic,
-                    payload,
-                    msg.qos,
-                    msg.retain,
-                    subscription.topic,
-                    timestamp,
-                ),
-            )
+                current_payload_cv.set(parsed)
+                self.hass.async_run_hass_job(
+                    subscription.job,
+                    ReceiveMessage(
+                        msg.topic,
+                        parsed.payload,
+                        msg.qos,
+                        msg.retain,
+                        subscription.topic,
+                        timestamp,
+                    ),
+                )
+        finally:
+            current_payload_cv.reset(token)
 
     def _mqtt_on_callback(self, _mqttc, _userdata, mid, _granted_qos=None) -> None:
         """Publish / Subscribe / Unsubscribe callback."""
@@ -1165,25 +1266,62 @@ class MQTT:
             )
 
 
-def _raise_on_error(result_code: int | None) -> None:
-    """Raise error if error result."""
+def _decode_payload(payload: bytes, encoding: str | None) -> ParsedPayload | None:
+    """Decode a received payload, return None if it can't be decoded."""
+    if encoding is None:
+        return ParsedPayload(payload)
+    try:
+        return ParsedPayload(payload.decode(encoding))
+    except (AttributeError, UnicodeDecodeError):
+        return None
+
+
+def _coalesce_retained_messages(messages: list[Any]) -> list[Any]:
+    """Drop the retained messages followed by a retained message on their topic.
+
+    A broker resends the retained messages for every new subscription, so
+    during discovery the same retained messages arrive over and over. The
+    order of the messages which are kept does not change.
+    """
+    retained_topics: set[str] = set()
+    coalesced: list[Any] = []
+    for msg in reversed(messages):
+        if msg.retain:
+            if msg.topic in retained_topics:
+                continue
+            retained_topics.add(msg.topic)
+        coalesced.append(msg)
+    if len(coalesced) == len(messages):
+        return messages
+    _LOGGER.debug(
+        "Dropped %s outdated retained messages", len(messages) - len(coalesced)
+    )
+    coalesced.reverse()
+    return coalesced
+
+
+def _log_on_error(result_code: int | None, action: str, topics: list[Any]) -> bool:
+    """Log an error result, return if the request was sent."""
     # pylint: disable-next=import-outside-toplevel
     import paho.mqtt.client as mqtt
 
     if result_code is not None and result_code != 0:
-        raise HomeAssistantError(
-            f"Error talking to MQTT: {mqtt.error_string(result_code)}"
+        _LOGGER.error(
+            "Failed to %s %s: %s", action, topics, mqtt.error_string(result_code)
         )
+        return False
+    return True
 
 
-def _matcher_for_topic(subscription: str) -> Any:
+def _raise_on_error(result_code: int | None) -> None:
+    """Raise error if error result."""
     # pylint: disable-next=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
+    import paho.mqtt.client as mqtt
 
-    return lambda topic: next(matcher.iter_match(topic), False)
+    if result_code is not None and result_code != 0:
+        raise HomeAssistantError(
+            f"Error talking to MQTT: {mqtt.error_string(result_code)}"
+        )
 
 
 @websocket_api.websocket_command(
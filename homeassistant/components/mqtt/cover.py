@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import functools
-from json import JSONDecodeError, loads as json_loads
+from json import JSONDecodeError
 import logging
 
 import voluptuous as vol
@@ -55,6 +55,7 @@ from .mixins import (
     async_setup_entry_helper,
     async_setup_platform_helper,
 )
+from .models import payload_json
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -404,7 +405,7 @@ class MqttCover(MqttEntity, CoverEntity):
                 return
 
             try:
-                payload = json_loads(payload)
+                payload = payload_json(payload)
             except JSONDecodeError:
                 pass
 
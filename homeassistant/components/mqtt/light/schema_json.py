@@ -311,7 +311,7 @@ class MqttLightJson(MqttEntity, LightEntity, RestoreEntity):
         @log_messages(self.hass, self.entity_id)
         def state_received(msg):
             """Handle new MQTT messages."""
-            values = json.loads(msg.payload)
+            values = msg.payload_json
 
             if values["state"] == "ON":
                 self._state = True
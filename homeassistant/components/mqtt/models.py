@@ -2,11 +2,20 @@
 from __future__ import annotations
 
 from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
 import datetime as dt
-from typing import Union
+import json
+from typing import Any, Union
 
 import attr
 
+try:
+    from orjson import loads as _fast_json_loads
+except ImportError:  # pragma: no cover
+    _fast_json_loads = json.loads
+
+_UNPARSED = object()
+
 PublishPayloadType = Union[str, bytes, int, float, None]
 ReceivePayloadType = Union[str, bytes]
 
@@ -32,6 +41,72 @@ class ReceiveMessage:
     subscribed_topic: str = attr.ib(default=None)
     timestamp: dt.datetime = attr.ib(default=None)
 
+    @property
+    def payload_json(self) -> Any:
+        """Return the payload parsed as JSON.
+
+        Raises ValueError if the payload is not valid JSON.
+        """
+        return payload_json(self.payload)
+
+
+def json_loads(payload: ReceivePayloadType) -> Any:
+    """Parse JSON, with orjson when it is installed."""
+    try:
+        return _fast_json_loads(payload)
+    except ValueError:
+        # orjson is stricter, e.g. it rejects NaN and integers above 64 bits
+        return json.loads(payload)
+
+
+class ParsedPayload:
+    """A received payload, parsed as JSON on first use."""
+
+    __slots__ = ("payload", "_json", "_error")
+
+    def __init__(self, payload: ReceivePayloadType) -> None:
+        """Initialize the parsed payload."""
+        self.payload = payload
+        self._json: Any = _UNPARSED
+        self._error: json.JSONDecodeError | None = None
+
+    @property
+    def json(self) -> Any:
+        """Return the payload parsed as JSON.
+
+        Raises ValueError if the payload is not valid JSON.
+        """
+        if self._json is _UNPARSED and self._error is None:
+            try:
+                self._json = json_loads(self.payload)
+            except json.JSONDecodeError as err:
+                self._error = err
+        if self._error is not None:
+            # Raise a new error, the traceback would keep growing otherwise
+            raise json.JSONDecodeError(
+                self._error.msg, self._error.doc, self._error.pos
+            )
+        return self._json
+
+
+# The payload of the message which is being handled, shared by all subscribers
+current_payload_cv: ContextVar[ParsedPayload | None] = ContextVar(
+    "current_payload_cv", default=None
+)
+
+
+def payload_json(payload: ReceivePayloadType) -> Any:
+    """Parse a received payload as JSON.
+
+    The payload of the message which is being handled is only parsed once
+    for all subscribers, other payloads are parsed every time.
+    Raises ValueError if the payload is not valid JSON.
+    """
+    parsed = current_payload_cv.get()
+    if parsed is not None and parsed.payload is payload:
+        return parsed.json
+    return json_loads(payload)
+
 
 AsyncMessageCallbackType = Callable[[ReceiveMessage], Awaitable[None]]
 MessageCallbackType = Callable[[ReceiveMessage], None]
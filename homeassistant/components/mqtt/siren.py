@@ -58,6 +58,7 @@ from .mixins import (
     async_setup_entry_helper,
     async_setup_platform_helper,
 )
+from .models import payload_json
 
 DEFAULT_NAME = "MQTT Siren"
 DEFAULT_PAYLOAD_ON = "ON"
@@ -238,7 +239,8 @@ class MqttSiren(MqttEntity, SirenEntity):
                 json_payload = {STATE: payload}
             else:
                 try:
-                    json_payload = json.loads(payload)
+                    # The parsed payload is shared with the other subscribers
+                    json_payload = copy.copy(payload_json(payload))
                     _LOGGER.debug(
                         "JSON payload detected after processing payload '%s' on topic %s",
                         json_payload,
@@ -0,0 +1,112 @@
+"""Match MQTT topics against the subscribed topic filters."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class _TrieNode(Generic[_T]):
+    """A level of a topic filter."""
+
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: dict[str, _TrieNode[_T]] = {}
+        self.values: dict[_T, None] | None = None
+
+
+class TopicTrie(Generic[_T]):
+    """Topic filters stored level by level, with `+` and `#` wildcard support.
+
+    Adding or removing a topic filter only touches the nodes of its levels,
+    matching a topic only visits the nodes that can match its levels.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trie."""
+        self._root: _TrieNode[_T] = _TrieNode()
+        # Dicts are used as ordered sets, shared with the nodes of the trie
+        self._topics: dict[str, dict[_T, None]] = {}
+
+    def __contains__(self, topic: str) -> bool:
+        """Return if there are values for a topic filter."""
+        return topic in self._topics
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the topic filters."""
+        return iter(self._topics)
+
+    def __len__(self) -> int:
+        """Return the number of topic filters."""
+        return len(self._topics)
+
+    def get(self, topic: str) -> list[_T]:
+        """Return the values for a topic filter."""
+        return list(self._topics.get(topic, ()))
+
+    def add(self, topic: str, value: _T) -> None:
+        """Add a value for a topic filter."""
+        if (values := self._topics.get(topic)) is None:
+            node = self._root
+            for level in topic.split("/"):
+                if (child := node.children.get(level)) is None:
+                    child = node.children[level] = _TrieNode()
+                node = child
+            values = self._topics[topic] = node.values = {}
+        values[value] = None
+
+    def remove(self, topic: str, value: _T) -> None:
+        """Remove a value for a topic filter.
+
+        Raises KeyError if the value was not added for the topic filter.
+        """
+        values = self._topics[topic]
+        del values[value]
+        if values:
+            return
+        del self._topics[topic]
+        path = [self._root]
+        levels = topic.split("/")
+        for level in levels:
+            path.append(path[-1].children[level])
+        path[-1].values = None
+        # Prune the levels which are no longer used by any topic filter
+        for depth in range(len(levels), 0, -1):
+            node = path[depth]
+            if node.children or node.values is not None:
+                break
+            del path[depth - 1].children[levels[depth - 1]]
+
+    def match(self, topic: str) -> list[_T]:
+        """Return the values of all topic filters matching a topic."""
+        levels = topic.split("/")
+        # Wildcards don't match the topics starting with $ at the first level
+        normal = not topic.startswith("$")
+        matches: list[_T] = []
+        _match(self._root, levels, 0, normal, matches)
+        return matches
+
+
+def _match(
+    node: _TrieNode[_T],
+    levels: list[str],
+    index: int,
+    normal: bool,
+    matches: list[_T],
+) -> None:
+    """Collect the values of the nodes matching the levels from index on."""
+    children = node.children
+    if index == len(levels):
+        if node.values is not None:
+            matches.extend(node.values)
+    else:
+        if (child := children.get(levels[index])) is not None:
+            _match(child, levels, index + 1, normal, matches)
+        if (child := children.get("+")) is not None and (normal or index):
+            _match(child, levels, index + 1, normal, matches)
+    if (child := children.get("#")) is not None and (normal or index):
+        if child.values is not None:
+            matches.extend(child.values)
@@ -7,14 +7,24 @@ from collections.abc import Callable, Iterable
 import concurrent.futures
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from itertools import groupby
 import logging
 import queue
 import sqlite3
 import threading
 import time
-from typing import Any
-
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
+from typing import Any, cast
+
+from lru import LRU  # pylint: disable=no-name-in-module
+from sqlalchemy import (
+    bindparam,
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    func,
+    select,
+    update,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
@@ -49,23 +59,33 @@ from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
 from homeassistant.helpers.service import async_extract_entity_ids
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
 from . import history, migration, purge, statistics, websocket_api
+from .backlog import RecorderBacklog
 from .const import (
+    BACKLOG_FILE,
     CONF_DB_INTEGRITY_CHECK,
     DATA_INSTANCE,
     DOMAIN,
+    MAX_BACKLOG_SPILL_SIZE,
+    MAX_EVENTS_TO_REPLAY,
     MAX_QUEUE_BACKLOG,
+    MAX_ROWS_TO_PURGE,
+    SPILL_QUEUE_BACKLOG,
     SQLITE_URL_PREFIX,
 )
 from .models import (
     Base,
+    EventData,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     process_timestamp,
 )
@@ -120,12 +140,28 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_STATE_CHANGED_EVENT_ROWS = True
+DEFAULT_BULK_INSERT = False
 KEEPALIVE_TIME = 30
 
+PURGE_PROGRESS_STORAGE_VERSION = 1
+PURGE_PROGRESS_STORAGE_KEY = "recorder.purge"
+PURGE_PROGRESS_SAVE_DELAY = 10
+
 # Controls how often we clean up
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# The number of attribute ids to cache in memory
+#
+# Based on:
+# - The number of overlapping attributes
+# - How frequently states with overlapping attributes will change
+# - How much memory our low end hardware has
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+EVENT_DATA_ID_CACHE_SIZE = 2048
+STATES_META_ID_CACHE_SIZE = 8192
+
 DB_LOCK_TIMEOUT = 30
 DB_LOCK_QUEUE_CHECK_TIMEOUT = 1
 
@@ -137,6 +173,8 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_STATE_CHANGED_EVENT_ROWS = "state_changed_event_rows"
+CONF_BULK_INSERT = "bulk_insert"
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -174,6 +212,13 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(
+                        CONF_STATE_CHANGED_EVENT_ROWS,
+                        default=DEFAULT_STATE_CHANGED_EVENT_ROWS,
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_BULK_INSERT, default=DEFAULT_BULK_INSERT
+                    ): cv.boolean,
                 }
             ),
         )
@@ -263,8 +308,11 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        state_changed_event_rows=conf[CONF_STATE_CHANGED_EVENT_ROWS],
+        bulk_insert=conf[CONF_BULK_INSERT],
     )
     instance.async_initialize()
+    await instance.async_load_purge_progress()
     instance.start()
     _async_register_services(hass, instance)
     history.async_setup(hass)
@@ -368,19 +416,59 @@ class PurgeTask(RecorderTask):
     purge_before: datetime
     repack: bool
     apply_filter: bool
+    resume: bool = False
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
-        if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
-        ):
+        progress = instance.purge_progress
+        if progress is None:
+            progress = instance.purge_progress = purge.PurgeProgress(
+                self.purge_before, self.repack, self.apply_filter
+            )
+        elif not self.resume:
+            # The purge in progress takes this one over, so they do not
+            # reset each other's batch size and counters
+            progress.merge(self.purge_before, self.repack, self.apply_filter)
+            # pylint: disable-next=protected-access
+            instance.hass.add_job(
+                instance._async_save_purge_progress, progress.as_dict()
+            )
+            return
+        start = time.monotonic()
+        try:
+            finished = purge.purge_old_data(
+                instance,
+                progress.purge_before,
+                progress.repack,
+                progress.apply_filter,
+                progress,
+            )
+        except Exception:
+            # Nothing resumes the purge anymore, let the next one start over
+            instance.purge_progress = None
+            raise
+        progress.record_batch(time.monotonic() - start)
+        if finished:
+            instance.purge_progress = None
+            # pylint: disable-next=protected-access
+            instance.hass.add_job(instance._async_save_purge_progress, None)
             # We always need to do the db cleanups after a purge
             # is finished to ensure the WAL checkpoint and other
             # tasks happen after a vacuum.
             perodic_db_cleanups(instance)
             return
-        # Schedule a new purge task if this one didn't finish
-        instance.queue.put(PurgeTask(self.purge_before, self.repack, self.apply_filter))
+        # pylint: disable-next=protected-access
+        instance.hass.add_job(instance._async_save_purge_progress, progress.as_dict())
+        # Schedule a new purge task if this one didn't finish, it goes
+        # behind the events queued in the meantime so they are not held back
+        instance.queue.put(
+            PurgeTask(
+                progress.purge_before,
+                progress.repack,
+                progress.apply_filter,
+                resume=True,
+            )
+        )
 
 
 @dataclass
@@ -435,6 +523,35 @@ class ExternalStatisticsTask(RecorderTask):
         instance.queue.put(ExternalStatisticsTask(self.metadata, self.statistics))
 
 
+@dataclass
+class StatesMetaMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to backfill the states metadata_id."""
+
+    def run(self, instance: Recorder) -> None:
+        """Run the states metadata_id backfill."""
+        # Commit the pending states first to make sure the
+        # migration does not create duplicate states_meta rows
+        instance._commit_event_session_or_retry()  # pylint: disable=protected-access
+        if migration.migrate_entity_ids(instance):
+            instance.states_meta_migration_done = True
+            return
+        # Schedule a new migration task if this one didn't finish
+        instance.queue.put(StatesMetaMigrationTask())
+
+
+@dataclass
+class TimestampMigrationTask(RecorderTask):
+    """An object to insert into the recorder queue to backfill the timestamp columns."""
+
+    def run(self, instance: Recorder) -> None:
+        """Run the timestamp columns backfill."""
+        if migration.migrate_timestamp_columns(instance):
+            instance.timestamp_migration_done = True
+            return
+        # Schedule a new migration task if this one didn't finish
+        instance.queue.put(TimestampMigrationTask())
+
+
 @dataclass
 class WaitTask(RecorderTask):
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
@@ -444,6 +561,22 @@ class WaitTask(RecorderTask):
         instance._queue_watch.set()  # pylint: disable=[protected-access]
 
 
+@dataclass
+class CommitTask(RecorderTask):
+    """An object to insert into the recorder queue to commit the events queued before it."""
+
+    done: asyncio.Event
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        try:
+            if instance.event_session is not None:
+                # pylint: disable-next=[protected-access]
+                instance._commit_event_session_or_retry()
+        finally:
+            instance.hass.loop.call_soon_threadsafe(self.done.set)
+
+
 @dataclass
 class DatabaseLockTask(RecorderTask):
     """An object to insert into the recorder queue to prevent writes to the database."""
@@ -457,6 +590,56 @@ class DatabaseLockTask(RecorderTask):
         instance._lock_database(self)  # pylint: disable=[protected-access]
 
 
+@dataclass
+class BacklogLoadTask(RecorderTask):
+    """An object to insert into the recorder queue to replay the events spilled by the previous run."""
+
+    def run(self, instance: Recorder) -> None:
+        """Replay the events left over from the previous run."""
+        backlog = instance.backlog
+        if not (left_over := backlog.load()):
+            return
+        _LOGGER.info("Replaying %s events spilled by the previous run", left_over)
+        # The events queued since the start are more recent
+        while (replayed := backlog.replayed_events) < left_over:
+            if (
+                events := backlog.read_events(
+                    min(MAX_EVENTS_TO_REPLAY, left_over - replayed), timeout=0
+                )
+            ) is None:
+                return
+            for event in events:
+                # pylint: disable-next=[protected-access]
+                instance._process_one_task_or_recover(EventTask(event))
+            if backlog.replayed_events == replayed:
+                break
+        backlog.truncate_if_replayed()
+
+
+@dataclass
+class BacklogReplayTask(RecorderTask):
+    """An object to insert into the recorder queue to replay the spilled events."""
+
+    def run(self, instance: Recorder) -> None:
+        """Replay the next spilled events."""
+        backlog = instance.backlog
+        start = time.monotonic()
+        if (events := backlog.read_events(MAX_EVENTS_TO_REPLAY, timeout=1)) is None:
+            _LOGGER.info("Replayed the spilled recorder backlog")
+            instance.hass.loop.call_soon_threadsafe(
+                instance._async_backlog_replayed  # pylint: disable=[protected-access]
+            )
+            return
+        for event in events:
+            # pylint: disable-next=[protected-access]
+            instance._process_one_task_or_recover(EventTask(event))
+        if events:
+            backlog.replay_rate = len(events) / (time.monotonic() - start)
+        # Schedule a new replay task, new events are spilled until
+        # the backlog has been replayed
+        instance.queue.put(BacklogReplayTask())
+
+
 @dataclass
 class StopTask(RecorderTask):
     """An object to insert into the recorder queue to stop the event handler."""
@@ -494,6 +677,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
+        state_changed_event_rows: bool,
+        bulk_insert: bool = DEFAULT_BULK_INSERT,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -515,12 +700,38 @@ class Recorder(threading.Thread):
 
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
+        self.backlog = RecorderBacklog(
+            hass.config.path(STORAGE_DIR, BACKLOG_FILE),
+            self.hass.async_add_executor_job,
+        )
+        self.queue.put(BacklogLoadTask())
+        self._backlog_replayed = asyncio.Event()
+        self._backlog_replayed.set()
+        self.purge_progress: purge.PurgeProgress | None = None
+        self._purge_progress_to_save: dict[str, Any] | None = None
+        self._purge_progress_save_scheduled = False
+        self._purge_store = Store(
+            hass, PURGE_PROGRESS_STORAGE_VERSION, PURGE_PROGRESS_STORAGE_KEY
+        )
+        self.state_changed_event_rows = state_changed_event_rows
+        self.bulk_insert = bulk_insert
 
         self._timechanges_seen = 0
         self._commits_without_expire = 0
         self._keepalive_count = 0
         self._old_states: dict[str, States] = {}
+        self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
+        self._pending_state_attributes: dict[str, StateAttributes] = {}
+        self._event_data_ids: LRU = LRU(EVENT_DATA_ID_CACHE_SIZE)
+        self._pending_event_data: dict[str, EventData] = {}
+        self._states_meta_ids: LRU = LRU(STATES_META_ID_CACHE_SIZE)
+        self._pending_states_meta: dict[str, StatesMeta] = {}
+        self.states_meta_migration_done = False
+        self.timestamp_migration_done = False
         self._pending_expunge: list[States] = []
+        self._old_state_ids: dict[str, int] = {}
+        self._pending_event_rows: list[tuple[dict[str, Any], str | None]] = []
+        self._pending_state_rows: list[tuple[dict[str, Any], str, bool]] = []
         self.event_session = None
         self.get_session = None
         self._completed_first_database_setup = None
@@ -547,6 +758,48 @@ class Recorder(threading.Thread):
             self.hass, self._async_check_queue, timedelta(minutes=10)
         )
 
+    async def async_load_purge_progress(self) -> None:
+        """Resume the purge that was in progress when Home Assistant stopped."""
+        if not (data := await self._purge_store.async_load()):
+            return
+        progress = purge.PurgeProgress.from_dict(cast(dict, data))
+        _LOGGER.info(
+            "Resuming the purge of states and events before %s",
+            progress.purge_before,
+        )
+        self.purge_progress = progress
+        self.queue.put(
+            PurgeTask(
+                progress.purge_before,
+                progress.repack,
+                progress.apply_filter,
+                resume=True,
+            )
+        )
+
+    @callback
+    def _async_save_purge_progress(self, progress: dict[str, Any] | None) -> None:
+        """Persist the purge progress or remove it once the purge is finished."""
+        self._purge_progress_to_save = progress
+        if progress is None:
+            self._purge_progress_save_scheduled = False
+            self.hass.async_create_task(self._purge_store.async_remove())
+            return
+        # Do not push back a scheduled save, the latest progress is
+        # saved when it runs
+        if self._purge_progress_save_scheduled:
+            return
+        self._purge_progress_save_scheduled = True
+        self._purge_store.async_delay_save(
+            self._purge_progress_data_to_save, PURGE_PROGRESS_SAVE_DELAY
+        )
+
+    @callback
+    def _purge_progress_data_to_save(self) -> dict[str, Any]:
+        """Return the purge progress data to save."""
+        self._purge_progress_save_scheduled = False
+        return cast(dict, self._purge_progress_to_save)
+
     @callback
     def _async_check_queue(self, *_):
         """Periodic check of the queue size to ensure we do not exaust memory.
@@ -554,13 +807,23 @@ class Recorder(threading.Thread):
         The queue grows during migraton or if something really goes wrong.
         """
         size = self.queue.qsize()
-        _LOGGER.debug("Recorder queue size is: %s", size)
-        if self.queue.qsize() <= MAX_QUEUE_BACKLOG:
-            return
-        _LOGGER.error(
-            "The recorder queue reached the maximum size of %s; Events are no longer being recorded",
-            MAX_QUEUE_BACKLOG,
+        _LOGGER.debug(
+            "Recorder queue size is: %s, spilled backlog is: %s",
+            size,
+            self.backlog.pending_events,
         )
+        if self.backlog.spill_size > MAX_BACKLOG_SPILL_SIZE:
+            _LOGGER.error(
+                "The recorder backlog file reached the maximum size of %s bytes; Events are no longer being recorded",
+                MAX_BACKLOG_SPILL_SIZE,
+            )
+        elif self.queue.qsize() > MAX_QUEUE_BACKLOG:
+            _LOGGER.error(
+                "The recorder queue reached the maximum size of %s; Events are no longer being recorded",
+                MAX_QUEUE_BACKLOG,
+            )
+        else:
+            return
         self._async_stop_queue_watcher_and_event_listener()
 
     @callback
@@ -874,7 +1137,10 @@ class Recorder(threading.Thread):
             # Notify that lock is being held, wait until database can be used again.
             self.hass.add_job(_async_set_database_locked, task)
             while not task.database_unlock.wait(timeout=DB_LOCK_QUEUE_CHECK_TIMEOUT):
-                if self.queue.qsize() > MAX_QUEUE_BACKLOG * 0.9:
+                if (
+                    self.queue.qsize() > MAX_QUEUE_BACKLOG * 0.9
+                    or self.backlog.spill_size > MAX_BACKLOG_SPILL_SIZE * 0.9
+                ):
                     _LOGGER.warning(
                         "Database queue backlog reached more than 90% of maximum queue "
                         "length while waiting for backup to finish; recorder will now "
@@ -904,20 +1170,42 @@ class Recorder(threading.Thread):
         if not self.enabled:
             return
 
-        try:
-            if event.event_type == EVENT_STATE_CHANGED:
-                dbevent = Events.from_event(event, event_data="{}")
-            else:
-                dbevent = Events.from_event(event)
+        if self.bulk_insert:
+            self._add_event_rows(event)
+            if not self.commit_interval:
+                self._commit_event_session_or_retry()
+            return
+
+        dbevent = None
+        if event.event_type != EVENT_STATE_CHANGED:
+            try:
+                shared_data = EventData.shared_data_from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Event is not JSON serializable: %s", event)
+                return
+            dbevent = Events.from_event(event)
+            self._set_event_data(dbevent, shared_data)
+        elif self.state_changed_event_rows:
+            # The data of state_changed events is never used, the
+            # state is stored in the states table instead
+            dbevent = Events.from_event(event)
+
+        if dbevent is not None:
             dbevent.created = event.time_fired
             self.event_session.add(dbevent)
-        except (TypeError, ValueError):
-            _LOGGER.warning("Event is not JSON serializable: %s", event)
-            return
 
         if event.event_type == EVENT_STATE_CHANGED:
             try:
                 dbstate = States.from_event(event)
+                shared_attrs = StateAttributes.shared_attrs_from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s",
+                    event.data.get("new_state"),
+                )
+            else:
+                self._set_state_attributes(dbstate, shared_attrs)
+                self._set_states_meta(dbstate, dbstate.entity_id)
                 has_new_state = event.data.get("new_state")
                 if dbstate.entity_id in self._old_states:
                     old_state = self._old_states.pop(dbstate.entity_id)
@@ -927,23 +1215,376 @@ class Recorder(threading.Thread):
                         dbstate.old_state = old_state
                 if not has_new_state:
                     dbstate.state = None
-                dbstate.event = dbevent
+                if dbevent is not None:
+                    dbstate.event = dbevent
+                else:
+                    dbstate.context_id = event.context.id
+                    dbstate.context_user_id = event.context.user_id
+                    dbstate.context_parent_id = event.context.parent_id
                 dbstate.created = event.time_fired
                 self.event_session.add(dbstate)
                 if has_new_state:
                     self._old_states[dbstate.entity_id] = dbstate
                     self._pending_expunge.append(dbstate)
-            except (TypeError, ValueError):
-                _LOGGER.warning(
-                    "State is not JSON serializable: %s",
-                    event.data.get("new_state"),
-                )
 
         # If they do not have a commit interval
         # than we commit right away
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
+    def _add_event_rows(self, event):
+        """Queue the rows of an event for the next bulk insert."""
+        shared_data = None
+        if event.event_type != EVENT_STATE_CHANGED:
+            try:
+                shared_data = EventData.shared_data_from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Event is not JSON serializable: %s", event)
+                return
+
+        if event.event_type != EVENT_STATE_CHANGED or self.state_changed_event_rows:
+            event_row = Events.row_from_event(event)
+            event_row["created"] = event.time_fired
+            self._pending_event_rows.append((event_row, shared_data))
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return
+
+        try:
+            state_row = States.row_from_event(event)
+            shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s",
+                event.data.get("new_state"),
+            )
+            return
+
+        has_new_state = bool(event.data.get("new_state"))
+        if not has_new_state:
+            state_row["state"] = None
+        # The states are not linked to their state_changed event
+        # row since that would require fetching the event ids back,
+        # the context is stored on the state instead
+        state_row["event_id"] = None
+        state_row["context_id"] = event.context.id
+        state_row["context_user_id"] = event.context.user_id
+        state_row["context_parent_id"] = event.context.parent_id
+        state_row["created"] = event.time_fired
+        self._pending_state_rows.append((state_row, shared_attrs, has_new_state))
+
+    def _insert_rows_returning_ids(
+        self, table: Any, rows: list[dict[str, Any]]
+    ) -> list[int]:
+        """Insert rows and return their primary keys in the order of the rows."""
+        if not rows:
+            return []
+        primary_key = list(table.__table__.primary_key)[0]
+        if self.engine.dialect.insert_executemany_returning:
+            result = self.event_session.execute(
+                table.__table__.insert().returning(primary_key), rows
+            )
+            return [row[0] for row in result]
+        # Without RETURNING for executemany the ORM fetches the id of
+        # each row as it inserts them
+        dbrows = [table(**row) for row in rows]
+        self.event_session.add_all(dbrows)
+        self.event_session.flush()
+        ids = [getattr(dbrow, primary_key.key) for dbrow in dbrows]
+        for dbrow in dbrows:
+            self.event_session.expunge(dbrow)
+        return ids
+
+    def _find_shared_ids(
+        self,
+        table: Any,
+        column: str,
+        values: list[str],
+        hashes: dict[str, int] | None,
+    ) -> dict[str, int]:
+        """Find the ids of deduplicated rows in the db, one query per batch."""
+        primary_key = list(table.__table__.primary_key)[0]
+        value_column = getattr(table, column)
+        if hashes is not None:
+            filter_column = table.hash
+            lookups = list({hashes[value] for value in values})
+        else:
+            filter_column = value_column
+            lookups = values
+        wanted = set(values)
+        found: dict[str, int] = {}
+        # Do not flush the pending rows, it would start a write
+        # transaction before the commit interval is reached
+        with self.event_session.no_autoflush:
+            for i in range(0, len(lookups), MAX_ROWS_TO_PURGE):
+                for row_id, value in self.event_session.query(
+                    primary_key, value_column
+                ).filter(filter_column.in_(lookups[i : i + MAX_ROWS_TO_PURGE])):
+                    if value in wanted:
+                        found.setdefault(value, row_id)
+        return found
+
+    def _resolve_shared_ids(
+        self,
+        table: Any,
+        column: str,
+        values: set[str],
+        cached_ids: dict[str, int],
+        new_ids: dict[str, int],
+        hash_func: Callable[[str], int] | None = None,
+    ) -> None:
+        """Find or insert the deduplicated rows that are not cached yet.
+
+        The rows are looked up per batch and the missing ones inserted
+        together, their ids are added to new_ids.
+        """
+        unseen = [
+            value
+            for value in values
+            if value not in new_ids and value not in cached_ids
+        ]
+        if not unseen:
+            return
+        hashes = {value: hash_func(value) for value in unseen} if hash_func else None
+        new_ids.update(found := self._find_shared_ids(table, column, unseen, hashes))
+        if not (missing := [value for value in unseen if value not in found]):
+            return
+        rows = [
+            {column: value, "hash": hashes[value]} if hashes else {column: value}
+            for value in missing
+        ]
+        if self.engine.dialect.insert_executemany_returning:
+            new_ids.update(zip(missing, self._insert_rows_returning_ids(table, rows)))
+            return
+        # Any row with the same value will do, so the ids are looked up
+        # again rather than inserting the rows one by one
+        self.event_session.execute(table.__table__.insert(), rows)
+        new_ids.update(self._find_shared_ids(table, column, missing, hashes))
+
+    def _bulk_insert_pending_rows(
+        self,
+        new_event_data_ids: dict[str, int],
+        new_state_attributes_ids: dict[str, int],
+        new_states_meta_ids: dict[str, int],
+    ) -> dict[str, int]:
+        """Write the pending event and state rows with one executemany each.
+
+        Returns the entity_id to latest state_id map to use for the
+        old_state_id of the next states once the rows are committed.
+        """
+        session = self.event_session
+
+        self._resolve_shared_ids(
+            EventData,
+            "shared_data",
+            {
+                shared_data
+                for _, shared_data in self._pending_event_rows
+                if shared_data is not None
+            },
+            self._event_data_ids,
+            new_event_data_ids,
+            EventData.hash_shared_data,
+        )
+        event_rows = []
+        for event_row, shared_data in self._pending_event_rows:
+            event_row["data_id"] = (
+                None
+                if shared_data is None
+                else new_event_data_ids.get(shared_data)
+                or self._event_data_ids[shared_data]
+            )
+            event_rows.append(event_row)
+        if event_rows:
+            session.execute(Events.__table__.insert(), event_rows)
+
+        old_state_ids = dict(self._old_state_ids)
+        if not self._pending_state_rows:
+            return old_state_ids
+
+        self._resolve_shared_ids(
+            StateAttributes,
+            "shared_attrs",
+            {shared_attrs for _, shared_attrs, _ in self._pending_state_rows},
+            self._state_attributes_ids,
+            new_state_attributes_ids,
+            StateAttributes.hash_shared_attrs,
+        )
+        self._resolve_shared_ids(
+            StatesMeta,
+            "entity_id",
+            {state_row["entity_id"] for state_row, _, _ in self._pending_state_rows},
+            self._states_meta_ids,
+            new_states_meta_ids,
+        )
+
+        # old_state_id is resolved from the committed ids in old_state_ids,
+        # or from the position of an earlier state of the same entity in
+        # this batch, which only gets its id once it has been inserted
+        state_rows = []
+        chained_states: list[tuple[int, int]] = []
+        latest_in_batch: dict[str, int] = {}
+        for index, (state_row, shared_attrs, has_new_state) in enumerate(
+            self._pending_state_rows
+        ):
+            entity_id = state_row["entity_id"]
+            state_row["attributes_id"] = new_state_attributes_ids.get(
+                shared_attrs
+            ) or self._state_attributes_ids.get(shared_attrs)
+            state_row["metadata_id"] = new_states_meta_ids.get(
+                entity_id
+            ) or self._states_meta_ids.get(entity_id)
+            state_row["old_state_id"] = None
+            if entity_id in latest_in_batch:
+                chained_states.append((index, latest_in_batch.pop(entity_id)))
+            elif entity_id in old_state_ids:
+                state_row["old_state_id"] = old_state_ids.pop(entity_id)
+            if has_new_state:
+                latest_in_batch[entity_id] = index
+            state_rows.append(state_row)
+
+        # The rows are inserted in order so the states of an entity keep
+        # ascending ids, the runs of rows with a new state fetch their ids
+        # back and the removed states in between are inserted without
+        state_ids: dict[int, int] = {}
+        old_indexes = dict(chained_states)
+        for has_new_state, run in groupby(
+            range(len(state_rows)), key=lambda index: self._pending_state_rows[index][2]
+        ):
+            indexes = list(run)
+            for index in indexes:
+                if (old_index := old_indexes.get(index)) in state_ids:
+                    state_rows[index]["old_state_id"] = state_ids[old_index]
+            rows = [state_rows[index] for index in indexes]
+            if has_new_state:
+                state_ids.update(
+                    zip(indexes, self._insert_rows_returning_ids(States, rows))
+                )
+            else:
+                session.execute(States.__table__.insert(), rows)
+
+        # An earlier state of the entity in the same run only got its id
+        # with the insert
+        if chained_updates := [
+            {"b_state_id": state_ids[index], "b_old_state_id": state_ids[old_index]}
+            for index, old_index in chained_states
+            if state_rows[index]["old_state_id"] is None
+        ]:
+            session.execute(
+                update(States)
+                .where(States.state_id == bindparam("b_state_id"))
+                .values(old_state_id=bindparam("b_old_state_id")),
+                chained_updates,
+            )
+
+        for entity_id, index in latest_in_batch.items():
+            old_state_ids[entity_id] = state_ids[index]
+        return old_state_ids
+
+    def _find_shared_data_in_db(self, data_hash: int, shared_data: str) -> int | None:
+        """Find shared event data in the db from the hash and shared_data."""
+        # Do not flush the pending rows, it would start a write
+        # transaction before the commit interval is reached
+        with self.event_session.no_autoflush:
+            if data_id := (
+                self.event_session.query(EventData.data_id)
+                .filter(EventData.hash == data_hash)
+                .filter(EventData.shared_data == shared_data)
+                .first()
+            ):
+                return cast(int, data_id[0])
+        return None
+
+    def _find_shared_attr_in_db(self, attr_hash: int, shared_attrs: str) -> int | None:
+        """Find shared attributes in the db from the hash and shared_attrs."""
+        # Do not flush the pending rows, it would start a write
+        # transaction before the commit interval is reached
+        with self.event_session.no_autoflush:
+            if attributes_id := (
+                self.event_session.query(StateAttributes.attributes_id)
+                .filter(StateAttributes.hash == attr_hash)
+                .filter(StateAttributes.shared_attrs == shared_attrs)
+                .first()
+            ):
+                return cast(int, attributes_id[0])
+        return None
+
+    def _find_states_meta_in_db(self, entity_id: str) -> int | None:
+        """Find the states_meta metadata_id of an entity_id in the db."""
+        with self.event_session.no_autoflush:
+            if metadata_id := (
+                self.event_session.query(StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id == entity_id)
+                .first()
+            ):
+                return cast(int, metadata_id[0])
+        return None
+
+    def _set_states_meta(self, dbstate: States, entity_id: str) -> None:
+        """Link the state to the states_meta row of its entity_id."""
+        # Matching states_meta found in the pending commit
+        if pending_states_meta := self._pending_states_meta.get(entity_id):
+            dbstate.states_meta = pending_states_meta
+            return
+        # Matching metadata id found in the cache
+        if metadata_id := self._states_meta_ids.get(entity_id):
+            dbstate.metadata_id = metadata_id
+            return
+        # Matching states_meta found in the database
+        if metadata_id := self._find_states_meta_in_db(entity_id):
+            dbstate.metadata_id = metadata_id
+            self._states_meta_ids[entity_id] = metadata_id
+            return
+        # No matching states_meta found, save it in the DB
+        dbstates_meta = StatesMeta(entity_id=entity_id)
+        dbstate.states_meta = dbstates_meta
+        self._pending_states_meta[entity_id] = dbstates_meta
+        self.event_session.add(dbstates_meta)
+
+    def _set_event_data(self, dbevent: Events, shared_data: str) -> None:
+        """Link the event to a deduplicated event_data row."""
+        # Matching data found in the pending commit
+        if pending_event_data := self._pending_event_data.get(shared_data):
+            dbevent.event_data_rel = pending_event_data
+            return
+        # Matching data id found in the cache
+        if data_id := self._event_data_ids.get(shared_data):
+            dbevent.data_id = data_id
+            return
+        data_hash = EventData.hash_shared_data(shared_data)
+        # Matching data found in the database
+        if data_id := self._find_shared_data_in_db(data_hash, shared_data):
+            dbevent.data_id = data_id
+            self._event_data_ids[shared_data] = data_id
+            return
+        # No matching data found, save it in the DB
+        dbevent_data = EventData(shared_data=shared_data, hash=data_hash)
+        dbevent.event_data_rel = dbevent_data
+        self._pending_event_data[shared_data] = dbevent_data
+        self.event_session.add(dbevent_data)
+
+    def _set_state_attributes(self, dbstate: States, shared_attrs: str) -> None:
+        """Link the state to a deduplicated state_attributes row."""
+        # Matching attributes found in the pending commit
+        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+            dbstate.state_attributes = pending_attributes
+            return
+        # Matching attributes id found in the cache
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            dbstate.attributes_id = attributes_id
+            return
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        # Matching attributes found in the database
+        if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
+            dbstate.attributes_id = attributes_id
+            self._state_attributes_ids[shared_attrs] = attributes_id
+            return
+        # No matching attributes found, save them in the DB
+        dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=attr_hash)
+        dbstate.state_attributes = dbstate_attributes
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+        self.event_session.add(dbstate_attributes)
+
     def _handle_database_error(self, err):
         """Handle a database error that may result in moving away the corrupt db."""
         if isinstance(err.__cause__, sqlite3.DatabaseError):
@@ -956,7 +1597,12 @@ class Recorder(threading.Thread):
 
     def _commit_event_session_or_retry(self):
         """Commit the event session if there is work to do."""
-        if not self.event_session.new and not self.event_session.dirty:
+        if (
+            not self.event_session.new
+            and not self.event_session.dirty
+            and not self._pending_event_rows
+            and not self._pending_state_rows
+        ):
             return
         tries = 1
         while tries <= self.db_max_retries:
@@ -979,6 +1625,9 @@ class Recorder(threading.Thread):
     def _commit_event_session(self):
         self._commits_without_expire += 1
 
+        if self._pending_event_rows or self._pending_state_rows:
+            self._commit_pending_rows()
+
         if self._pending_expunge:
             self.event_session.flush()
             for dbstate in self._pending_expunge:
@@ -989,6 +1638,23 @@ class Recorder(threading.Thread):
             self._pending_expunge = []
         self.event_session.commit()
 
+        # Once the attributes have been committed they have an id
+        # and can be found in the cache from now on
+        for state_attr in self._pending_state_attributes.values():
+            if state_attr.attributes_id:
+                self._state_attributes_ids[
+                    state_attr.shared_attrs
+                ] = state_attr.attributes_id
+        self._pending_state_attributes = {}
+        for event_data in self._pending_event_data.values():
+            if event_data.data_id:
+                self._event_data_ids[event_data.shared_data] = event_data.data_id
+        self._pending_event_data = {}
+        for states_meta in self._pending_states_meta.values():
+            if states_meta.metadata_id:
+                self._states_meta_ids[states_meta.entity_id] = states_meta.metadata_id
+        self._pending_states_meta = {}
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -996,6 +1662,30 @@ class Recorder(threading.Thread):
             self._commits_without_expire = 0
             self.event_session.expire_all()
 
+    def _commit_pending_rows(self):
+        """Bulk insert and commit the pending event and state rows."""
+        new_event_data_ids: dict[str, int] = {}
+        new_state_attributes_ids: dict[str, int] = {}
+        new_states_meta_ids: dict[str, int] = {}
+        try:
+            old_state_ids = self._bulk_insert_pending_rows(
+                new_event_data_ids, new_state_attributes_ids, new_states_meta_ids
+            )
+            self.event_session.commit()
+        except SQLAlchemyError:
+            # Rollback so the rows can be written again on retry
+            self.event_session.rollback()
+            raise
+
+        # The ids can only be cached once the rows they refer to
+        # have been committed
+        self._old_state_ids = old_state_ids
+        self._event_data_ids.update(new_event_data_ids)
+        self._state_attributes_ids.update(new_state_attributes_ids)
+        self._states_meta_ids.update(new_states_meta_ids)
+        self._pending_event_rows = []
+        self._pending_state_rows = []
+
     def _handle_sqlite_corruption(self):
         """Handle the sqlite3 database being corrupt."""
         self._close_event_session()
@@ -1007,6 +1697,15 @@ class Recorder(threading.Thread):
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._old_state_ids = {}
+        self._pending_event_rows = []
+        self._pending_state_rows = []
+        self._state_attributes_ids.clear()
+        self._pending_state_attributes = {}
+        self._event_data_ids.clear()
+        self._pending_event_data = {}
+        self._states_meta_ids.clear()
+        self._pending_states_meta = {}
 
         if not self.event_session:
             return
@@ -1037,6 +1736,20 @@ class Recorder(threading.Thread):
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
+        if self.backlog.async_spill(event):
+            return
+        if self.queue.qsize() >= SPILL_QUEUE_BACKLOG:
+            _LOGGER.warning(
+                "The recorder queue reached %s tasks; Events are spilled to %s "
+                "until the recorder catches up",
+                SPILL_QUEUE_BACKLOG,
+                self.backlog.path,
+            )
+            self.backlog.async_start_spilling()
+            self._backlog_replayed.clear()
+            self.queue.put(BacklogReplayTask())
+            if self.backlog.async_spill(event):
+                return
         self.queue.put(EventTask(event))
 
     def block_till_done(self):
@@ -1051,10 +1764,28 @@ class Recorder(threading.Thread):
         after calling this to ensure the data
         is in the database.
         """
+        # The spilled events are replayed before the queued ones
+        asyncio.run_coroutine_threadsafe(
+            self._backlog_replayed.wait(), self.hass.loop
+        ).result()
         self._queue_watch.clear()
         self.queue.put(WaitTask())
         self._queue_watch.wait()
 
+    async def async_commit_pending(self) -> None:
+        """Wait until the events recorded so far have been committed."""
+        # The spilled events are replayed before the queued ones
+        await self._backlog_replayed.wait()
+        done = asyncio.Event()
+        self.queue.put(CommitTask(done))
+        await done.wait()
+
+    @callback
+    def _async_backlog_replayed(self) -> None:
+        """Release the waiters once the spilled events have been replayed."""
+        if not self.backlog.spilling:
+            self._backlog_replayed.set()
+
     async def lock_database(self) -> bool:
         """Lock database so it can be backed up safely."""
         if not self.engine or self.engine.dialect.name != "sqlite":
@@ -1163,6 +1894,8 @@ class Recorder(threading.Thread):
             self._schedule_compile_missing_statistics(session)
 
         self._open_event_session()
+        self.queue.put(StatesMetaMigrationTask())
+        self.queue.put(TimestampMigrationTask())
 
     def _schedule_compile_missing_statistics(self, session: Session) -> None:
         """Add tasks for missing statistics runs."""
@@ -1202,6 +1935,10 @@ class Recorder(threading.Thread):
         self.hass.add_job(self._async_stop_queue_watcher_and_event_listener)
         self._end_session()
         self._close_connection()
+        try:
+            self.backlog.close()
+        except OSError as err:
+            _LOGGER.error("Error saving the spilled recorder backlog: %s", err)
 
     @property
     def recording(self):
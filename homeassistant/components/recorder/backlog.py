@@ -0,0 +1,274 @@
+"""Spill the recorder queue backlog to disk when it gets too large."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import JSONEncoder
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def event_to_backlog_line(event: Event) -> str:
+    """Serialize an event to a line of the backlog file."""
+    return json.dumps(event.as_dict(), cls=JSONEncoder, separators=(",", ":"))
+
+
+def event_from_backlog_line(line: str) -> Event:
+    """Restore an event from a line of the backlog file."""
+    event_dict = json.loads(line)
+    data = event_dict["data"]
+    if event_dict["event_type"] == EVENT_STATE_CHANGED:
+        for key in ("old_state", "new_state"):
+            if (state := data.get(key)) is not None:
+                data[key] = State.from_dict(state)
+    context = event_dict["context"]
+    return Event(
+        event_dict["event_type"],
+        data,
+        EventOrigin(event_dict["origin"]),
+        dt_util.parse_datetime(event_dict["time_fired"]),
+        context=Context(
+            id=context["id"],
+            user_id=context["user_id"],
+            parent_id=context["parent_id"],
+        ),
+    )
+
+
+class RecorderBacklog:
+    """An append-only file holding the events the recorder queue has no room for.
+
+    Once the in-memory queue reaches its limit, all new events are spilled
+    to the file until the recorder has replayed every spilled event, which
+    keeps the events in order. The event loop only serializes the events,
+    the writes happen in the executor and the reads in the recorder thread.
+    The events left over from a previous run are loaded by the recorder
+    thread as well.
+    """
+
+    def __init__(
+        self, path: str, schedule_write: Callable[[Callable[[], None]], Any]
+    ) -> None:
+        """Initialize the backlog."""
+        self.path = path
+        self._schedule_write = schedule_write
+        self._lock = threading.Lock()
+        self._lines_available = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._pending_lines: list[str] = []
+        self._write_scheduled = False
+        self._closed = False
+        self._read_offset = 0
+        self._written_size = 0
+        self._loaded = False
+        self.spilling = False
+        self.spilled_events = 0
+        self.replayed_events = 0
+        self.replay_rate = 0.0
+
+    @property
+    def pending_events(self) -> int:
+        """Return the number of spilled events that still have to be replayed."""
+        return self.spilled_events - self.replayed_events
+
+    @property
+    def spill_size(self) -> int:
+        """Return the size of the backlog file in bytes."""
+        return self._written_size
+
+    def _count_lines(self) -> int:
+        """Count the events in an existing backlog file."""
+        with open(self.path, "rb") as backlog_file:
+            return sum(1 for _ in backlog_file)
+
+    def load(self) -> int:
+        """Load the events left over from a previous run.
+
+        Returns the number of events left over, they are at the start
+        of the file and have to be replayed before the queued events.
+        """
+        with self._write_lock:
+            left_over = 0
+            if os.path.exists(self.path):
+                size = os.path.getsize(self.path)
+                lines = self._count_lines()
+                with self._lock:
+                    # The events spilled since the start were appended
+                    written = self.spilled_events - len(self._pending_lines)
+                    left_over = lines - written
+                    self.spilled_events += left_over
+                    self._written_size = size
+            with self._lock:
+                self._loaded = True
+            return left_over
+
+    def truncate_if_replayed(self) -> bool:
+        """Remove the backlog file and stop spilling if it has been replayed.
+
+        Returns False if there are spilled events left to replay. The file
+        is removed while holding the write lock only, so the event loop
+        never waits for it.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self.replayed_events < self.spilled_events:
+                    return False
+                self.spilling = False
+                self._reset()
+            self._remove()
+        return True
+
+    def async_start_spilling(self) -> None:
+        """Spill all new events until the backlog has been replayed."""
+        with self._lock:
+            self.spilling = True
+
+    def async_spill(self, event: Event) -> bool:
+        """Spill an event if the backlog is spilling.
+
+        Returns False when the event should be queued instead.
+        """
+        if not self.spilling:
+            return False
+        try:
+            line = event_to_backlog_line(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return True
+        with self._lock:
+            # The backlog may have just been replayed by the recorder
+            if not self.spilling:
+                return False
+            if self._closed:
+                return True
+            self._pending_lines.append(line)
+            self.spilled_events += 1
+            if self._write_scheduled:
+                return True
+            self._write_scheduled = True
+        self._schedule_write(self.write_pending)
+        return True
+
+    def write_pending(self) -> None:
+        """Append the pending lines to the backlog file."""
+        with self._write_lock:
+            with self._lock:
+                lines = self._pending_lines
+                self._pending_lines = []
+                self._write_scheduled = False
+            if not lines:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as backlog_file:
+                    backlog_file.write("\n".join(lines) + "\n")
+                    size = backlog_file.tell()
+            except OSError as err:
+                _LOGGER.error(
+                    "Error writing %s events to the recorder backlog %s, "
+                    "they are not recorded: %s",
+                    len(lines),
+                    self.path,
+                    err,
+                )
+                self._discard_partial_write()
+                with self._lines_available:
+                    self.spilled_events -= len(lines)
+                    self._lines_available.notify_all()
+                return
+            with self._lines_available:
+                self._written_size = size
+                self._lines_available.notify_all()
+
+    def _discard_partial_write(self) -> None:
+        """Cut a partially written line from the end of the backlog file."""
+        try:
+            if os.path.getsize(self.path) > self._written_size:
+                os.truncate(self.path, self._written_size)
+        except OSError:
+            pass
+
+    def read_events(self, max_events: int, timeout: float) -> list[Event] | None:
+        """Read the next spilled events in order.
+
+        Returns None once every spilled event has been replayed, which
+        means the new events can go to the queue again.
+        """
+        with self._lines_available:
+            replayed = self.replayed_events >= self.spilled_events
+            if not replayed and self._read_offset >= self._written_size:
+                self._lines_available.wait(timeout)
+            written_size = self._written_size
+
+        if replayed:
+            # Events may have been spilled since the check
+            return None if self.truncate_if_replayed() else []
+        if self._read_offset >= written_size:
+            return []
+
+        events: list[Event] = []
+        lines = 0
+        with open(self.path, "rb") as backlog_file:
+            backlog_file.seek(self._read_offset)
+            while lines < max_events and backlog_file.tell() < written_size:
+                line = backlog_file.readline()
+                lines += 1
+                try:
+                    events.append(event_from_backlog_line(line.decode("utf-8")))
+                except (ValueError, KeyError, TypeError):
+                    _LOGGER.warning("Skipping invalid backlog line: %s", line)
+            self._read_offset = backlog_file.tell()
+
+        with self._lock:
+            self.replayed_events += lines
+        return events
+
+    def _reset(self) -> None:
+        """Reset the counters once the backlog has been replayed."""
+        self._read_offset = 0
+        self._written_size = 0
+        self.spilled_events = 0
+        self.replayed_events = 0
+
+    def _remove(self) -> None:
+        """Remove the replayed backlog file."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self) -> None:
+        """Keep only the events that have not been replayed for the next run."""
+        with self._lock:
+            self._closed = True
+        self.write_pending()
+        with self._write_lock:
+            with self._lock:
+                if not self._loaded:
+                    # The events of the previous run are still in the file
+                    return
+                replayed = self.replayed_events >= self.spilled_events
+                if replayed:
+                    self._reset()
+                read_offset = self._read_offset
+            if replayed:
+                self._remove()
+                return
+            if not read_offset:
+                return
+            with open(self.path, "rb") as backlog_file:
+                backlog_file.seek(read_offset)
+                remaining = backlog_file.read()
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as backlog_file:
+                backlog_file.write(remaining)
+            os.replace(tmp_path, self.path)
+            with self._lock:
+                self._read_offset = 0
+                self._written_size = len(remaining)
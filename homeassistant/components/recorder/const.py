@@ -8,6 +8,19 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
 MAX_QUEUE_BACKLOG = 30000
 
+# Once the queue holds this many tasks, new events are spilled
+# to the backlog file instead of being kept in memory
+SPILL_QUEUE_BACKLOG = 10000
+
+# The maximum size of the backlog file before the recorder
+# stops recording, the same way it does for MAX_QUEUE_BACKLOG
+MAX_BACKLOG_SPILL_SIZE = 1024 * 1024 * 1024
+
+BACKLOG_FILE = "recorder.backlog"
+
+# The maximum number of spilled events replayed by one task
+MAX_EVENTS_TO_REPLAY = 1000
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
@@ -15,3 +28,12 @@ MAX_QUEUE_BACKLOG = 30000
 # We can increase this back to 1000 once most
 # have upgraded their sqlite version
 MAX_ROWS_TO_PURGE = 998
+
+# The minimum number of rows purged in one batch when
+# the batch size is adapted to slow deletes
+MIN_ROWS_TO_PURGE = 100
+
+# The maximum number of states that get their metadata_id
+# backfilled in one batch, limited by the same sqlite
+# bind variable limit as MAX_ROWS_TO_PURGE
+MAX_ROWS_TO_MIGRATE = MAX_ROWS_TO_PURGE
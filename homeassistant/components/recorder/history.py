@@ -1,19 +1,32 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
-from collections import defaultdict
-from itertools import groupby
+from datetime import timedelta
+from itertools import chain, groupby
 import logging
+import math
 import time
 
 from sqlalchemy import and_, bindparam, func
 from sqlalchemy.ext import baked
 
 from homeassistant.components import recorder
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
 from homeassistant.core import split_entity_id
 import homeassistant.util.dt as dt_util
 
-from .models import LazyState, States, process_timestamp_to_utc_isoformat
+from . import statistics
+from .const import DATA_INSTANCE
+from .models import (
+    STATES_LAST_CHANGED_AS_TIMESTAMP,
+    STATES_LAST_UPDATED_AS_TIMESTAMP,
+    LazyState,
+    StateAttributes,
+    States,
+    StatesMeta,
+    process_datetime_to_timestamp,
+    timestamp_to_utc_isoformat,
+)
 from .util import execute, session_scope
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -39,17 +52,84 @@ NEED_ATTRIBUTE_DOMAINS = {
     "water_heater",
 }
 
-QUERY_STATES = [
-    States.domain,
-    States.entity_id,
-    States.state,
-    States.attributes,
-    States.last_changed,
-    States.last_updated,
-]
-
 HISTORY_BAKERY = "recorder_history_bakery"
 
+# Number of rows fetched at a time when streaming the history
+STREAM_YIELD_PER = 1000
+
+# The periods of the statistics tables that downsampling can reuse
+STATISTICS_PERIODS = (("hour", timedelta(hours=1)), ("5minute", timedelta(minutes=5)))
+DOWNSAMPLE_GAP_STATES = (STATE_UNAVAILABLE, STATE_UNKNOWN, "")
+
+
+def _timestamp_columns(migrated):
+    """Return the last_changed and last_updated epoch timestamp columns.
+
+    The DATETIME columns are read as timestamps while the timestamp
+    columns of the states recorded before schema version 28 are still
+    being backfilled.
+    """
+    if migrated:
+        return States.last_changed_ts, States.last_updated_ts
+    return STATES_LAST_CHANGED_AS_TIMESTAMP, STATES_LAST_UPDATED_AS_TIMESTAMP
+
+
+def _query_states_with_attributes(session, last_changed, last_updated):
+    """Query the states columns joined with the shared state attributes."""
+    return session.query(
+        States.domain,
+        States.entity_id,
+        States.state,
+        States.attributes,
+        last_changed.label("last_changed_ts"),
+        last_updated.label("last_updated_ts"),
+        StateAttributes.shared_attrs,
+    ).outerjoin(StateAttributes, States.attributes_id == StateAttributes.attributes_id)
+
+
+def _baked_states_query(hass):
+    """Return a baked query of the states and the timestamp columns it reads.
+
+    The baked queries are cached separately for the two kinds of
+    timestamp columns.
+    """
+    migrated = hass.data[DATA_INSTANCE].timestamp_migration_done
+    last_changed, last_updated = _timestamp_columns(migrated)
+    baked_query = hass.data[HISTORY_BAKERY](
+        lambda session: _query_states_with_attributes(
+            session, last_changed, last_updated
+        ),
+        migrated,
+    )
+    return baked_query, last_changed, last_updated
+
+
+def _metadata_ids_for_entity_ids(hass, session, entity_ids):
+    """Return the states_meta metadata_ids of entity_ids.
+
+    Returns None while the states recorded before the states_meta table
+    existed are still being migrated, the entity_id has to be used then.
+    """
+    if not hass.data[DATA_INSTANCE].states_meta_migration_done:
+        return None
+    return [
+        metadata_id
+        for (metadata_id,) in session.query(StatesMeta.metadata_id).filter(
+            StatesMeta.entity_id.in_(entity_ids)
+        )
+    ]
+
+
+def _single_metadata_id_for_entity_id(hass, session, entity_id):
+    """Return the states_meta metadata_id of a single entity_id.
+
+    Returns None while the states are being migrated or when the
+    entity_id has never been recorded, the entity_id is used then.
+    """
+    if metadata_ids := _metadata_ids_for_entity_ids(hass, session, [entity_id]):
+        return metadata_ids[0]
+    return None
+
 
 def async_setup(hass):
     """Set up the history hooks."""
@@ -87,22 +167,95 @@ def get_significant_states_with_session(
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    query = _significant_states_query(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    )
+    states = execute(query)
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
     )
 
+
+def stream_significant_states_with_session(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield the significant states during UTC period start_time - end_time.
+
+    Works like get_significant_states_with_session, but yields
+    (entity_id, states) one entity at a time and fetches the rows with
+    a server side cursor so the memory use does not depend on the period.
+    The entities are not in the order of entity_ids.
+    """
+    query = _significant_states_query(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_YIELD_PER))
+
+    initial_states = _get_initial_states(
+        hass, session, start_time, entity_ids, filters, include_start_time_state
+    )
+    yield from _sorted_states_by_entity(query, initial_states, minimal_response)
+
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the query for the significant states sorted by entity."""
+    baked_query, last_changed, last_updated = _baked_states_query(hass)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
-            (
-                States.domain.in_(SIGNIFICANT_DOMAINS)
-                | (States.last_changed == States.last_updated)
-            )
-            & (States.last_updated > bindparam("start_time"))
+            (States.domain.in_(SIGNIFICANT_DOMAINS) | (last_changed == last_updated))
+            & (last_updated > bindparam("start_time"))
         )
     else:
-        baked_query += lambda q: q.filter(States.last_updated > bindparam("start_time"))
+        baked_query += lambda q: q.filter(last_updated > bindparam("start_time"))
 
+    metadata_ids = None
     if entity_ids is not None:
+        metadata_ids = _metadata_ids_for_entity_ids(hass, session, entity_ids)
+    if metadata_ids is not None:
+        baked_query += lambda q: q.filter(
+            States.metadata_id.in_(bindparam("metadata_ids", expanding=True))
+        )
+    elif entity_ids is not None:
         baked_query += lambda q: q.filter(
             States.entity_id.in_(bindparam("entity_ids", expanding=True))
         )
@@ -112,58 +265,54 @@ def get_significant_states_with_session(
             filters.bake(baked_query)
 
     if end_time is not None:
-        baked_query += lambda q: q.filter(States.last_updated < bindparam("end_time"))
-
-    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
-
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
+        baked_query += lambda q: q.filter(last_updated < bindparam("end_time"))
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
+    if metadata_ids is not None:
+        baked_query += lambda q: q.order_by(States.metadata_id, last_updated)
+    else:
+        baked_query += lambda q: q.order_by(States.entity_id, last_updated)
 
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
+    return baked_query(session).params(
+        start_time=process_datetime_to_timestamp(start_time),
+        end_time=end_time and process_datetime_to_timestamp(end_time),
+        entity_ids=entity_ids,
+        metadata_ids=metadata_ids,
     )
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query, last_changed, last_updated = _baked_states_query(hass)
 
         baked_query += lambda q: q.filter(
-            (States.last_changed == States.last_updated)
-            & (States.last_updated > bindparam("start_time"))
+            (last_changed == last_updated) & (last_updated > bindparam("start_time"))
         )
 
         if end_time is not None:
-            baked_query += lambda q: q.filter(
-                States.last_updated < bindparam("end_time")
-            )
+            baked_query += lambda q: q.filter(last_updated < bindparam("end_time"))
 
+        metadata_id = None
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
             entity_id = entity_id.lower()
+            metadata_id = _single_metadata_id_for_entity_id(hass, session, entity_id)
+        if metadata_id is not None:
+            baked_query += lambda q: q.filter(
+                States.metadata_id == bindparam("metadata_id")
+            )
+        elif entity_id is not None:
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
 
-        baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+        baked_query += lambda q: q.order_by(States.entity_id, last_updated)
 
         states = execute(
             baked_query(session).params(
-                start_time=start_time, end_time=end_time, entity_id=entity_id
+                start_time=process_datetime_to_timestamp(start_time),
+                end_time=end_time and process_datetime_to_timestamp(end_time),
+                entity_id=entity_id,
+                metadata_id=metadata_id,
             )
         )
 
@@ -177,24 +326,31 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
-        baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
+        baked_query, last_changed, last_updated = _baked_states_query(hass)
+        baked_query += lambda q: q.filter(last_changed == last_updated)
 
+        metadata_id = None
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
             entity_id = entity_id.lower()
+            metadata_id = _single_metadata_id_for_entity_id(hass, session, entity_id)
+        if metadata_id is not None:
+            baked_query += lambda q: q.filter(
+                States.metadata_id == bindparam("metadata_id")
+            )
+        elif entity_id is not None:
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
 
-        baked_query += lambda q: q.order_by(
-            States.entity_id, States.last_updated.desc()
-        )
+        baked_query += lambda q: q.order_by(States.entity_id, last_updated.desc())
 
         baked_query += lambda q: q.limit(bindparam("number_of_states"))
 
         states = execute(
             baked_query(session).params(
-                number_of_states=number_of_states, entity_id=entity_id
+                number_of_states=number_of_states,
+                entity_id=entity_id,
+                metadata_id=metadata_id,
             )
         )
 
@@ -243,22 +399,28 @@ def _get_states_with_session(
 
     # We have more than one entity to look at so we need to do a query on states
     # since the last recorder run started.
-    query = session.query(*QUERY_STATES)
+    last_changed, last_updated = _timestamp_columns(
+        hass.data[DATA_INSTANCE].timestamp_migration_done
+    )
+    query = _query_states_with_attributes(session, last_changed, last_updated)
+    run_start_ts = process_datetime_to_timestamp(run.start)
+    utc_point_in_time_ts = process_datetime_to_timestamp(utc_point_in_time)
 
     if entity_ids:
         # We got an include-list of entities, accelerate the query by filtering already
         # in the inner query.
-        most_recent_state_ids = (
-            session.query(
-                func.max(States.state_id).label("max_state_id"),
-            )
-            .filter(
-                (States.last_updated >= run.start)
-                & (States.last_updated < utc_point_in_time)
-            )
-            .filter(States.entity_id.in_(entity_ids))
-        )
-        most_recent_state_ids = most_recent_state_ids.group_by(States.entity_id)
+        most_recent_state_ids = session.query(
+            func.max(States.state_id).label("max_state_id"),
+        ).filter((last_updated >= run_start_ts) & (last_updated < utc_point_in_time_ts))
+        metadata_ids = _metadata_ids_for_entity_ids(hass, session, entity_ids)
+        if metadata_ids is not None:
+            most_recent_state_ids = most_recent_state_ids.filter(
+                States.metadata_id.in_(metadata_ids)
+            ).group_by(States.metadata_id)
+        else:
+            most_recent_state_ids = most_recent_state_ids.filter(
+                States.entity_id.in_(entity_ids)
+            ).group_by(States.entity_id)
         most_recent_state_ids = most_recent_state_ids.subquery()
         query = query.join(
             most_recent_state_ids,
@@ -272,11 +434,10 @@ def _get_states_with_session(
         most_recent_states_by_date = (
             session.query(
                 States.entity_id.label("max_entity_id"),
-                func.max(States.last_updated).label("max_last_updated"),
+                func.max(last_updated).label("max_last_updated"),
             )
             .filter(
-                (States.last_updated >= run.start)
-                & (States.last_updated < utc_point_in_time)
+                (last_updated >= run_start_ts) & (last_updated < utc_point_in_time_ts)
             )
             .group_by(States.entity_id)
             .subquery()
@@ -287,8 +448,7 @@ def _get_states_with_session(
                 most_recent_states_by_date,
                 and_(
                     States.entity_id == most_recent_states_by_date.c.max_entity_id,
-                    States.last_updated
-                    == most_recent_states_by_date.c.max_last_updated,
+                    last_updated == most_recent_states_by_date.c.max_last_updated,
                 ),
             )
             .group_by(States.entity_id)
@@ -308,18 +468,26 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
-    baked_query += lambda q: q.filter(
-        States.last_updated < bindparam("utc_point_in_time"),
-        States.entity_id == bindparam("entity_id"),
-    )
-    baked_query += lambda q: q.order_by(States.last_updated.desc())
+    baked_query, _, last_updated = _baked_states_query(hass)
+    if (
+        metadata_id := _single_metadata_id_for_entity_id(hass, session, entity_id)
+    ) is not None:
+        baked_query += lambda q: q.filter(
+            last_updated < bindparam("utc_point_in_time"),
+            States.metadata_id == bindparam("metadata_id"),
+        )
+    else:
+        baked_query += lambda q: q.filter(
+            last_updated < bindparam("utc_point_in_time"),
+            States.entity_id == bindparam("entity_id"),
+        )
+    baked_query += lambda q: q.order_by(last_updated.desc())
     baked_query += lambda q: q.limit(1)
 
     query = baked_query(session).params(
-        utc_point_in_time=utc_point_in_time, entity_id=entity_id
+        utc_point_in_time=process_datetime_to_timestamp(utc_point_in_time),
+        entity_id=entity_id,
+        metadata_id=metadata_id,
     )
 
     return [LazyState(row) for row in execute(query)]
@@ -346,35 +514,70 @@ def _sorted_states_to_dict(
     each list of states, otherwise our graphs won't start on the Y
     axis correctly.
     """
-    result = defaultdict(list)
+    result = {}
     # Set all entity IDs to empty lists in result set to maintain the order
     if entity_ids is not None:
         for ent_id in entity_ids:
             result[ent_id] = []
 
-    # Get the states at the start time
+    initial_states = _get_initial_states(
+        hass, session, start_time, entity_ids, filters, include_start_time_state
+    )
+    for ent_id, state in initial_states.items():
+        result[ent_id] = [state]
+
+    for ent_id, ent_results in _sorted_states_by_entity(
+        states, initial_states, minimal_response
+    ):
+        result[ent_id] = ent_results
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _get_initial_states(
+    hass, session, start_time, entity_ids, filters, include_start_time_state
+):
+    """Return the states at the start time by entity_id."""
+    initial_states = {}
+    if not include_start_time_state:
+        return initial_states
+
     timer_start = time.perf_counter()
-    if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
-        ):
-            state.last_changed = start_time
-            state.last_updated = start_time
-            result[state.entity_id].append(state)
+    run = recorder.run_information_from_instance(hass, start_time)
+    for state in _get_states_with_session(
+        hass, session, start_time, entity_ids, run=run, filters=filters
+    ):
+        state.last_changed = start_time
+        state.last_updated = start_time
+        initial_states[state.entity_id] = state
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(initial_states), elapsed
+        )
+    return initial_states
+
+
+def _sorted_states_by_entity(states, initial_states, minimal_response):
+    """Yield the states of each entity, one entity at a time.
+
+    States must be sorted by entity_id and last_updated. The entities
+    that only have a state at the start time are yielded last.
+    """
+    initial_states = dict(initial_states)
 
     # Called in a tight loop so cache the function
     # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+    _timestamp_to_utc_isoformat = timestamp_to_utc_isoformat
 
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
         domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
+        ent_results = []
+        if (initial_state := initial_states.pop(ent_id, None)) is not None:
+            ent_results.append(initial_state)
         if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
             ent_results.extend(LazyState(db_state) for db_state in group)
 
@@ -397,8 +600,8 @@ def _sorted_states_to_dict(
             ent_results.append(
                 {
                     STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
+                    LAST_CHANGED_KEY: _timestamp_to_utc_isoformat(
+                        db_state.last_changed_ts
                     ),
                 }
             )
@@ -410,8 +613,232 @@ def _sorted_states_to_dict(
             # a full state
             ent_results[-1] = LazyState(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        yield ent_id, ent_results
+
+    for ent_id, initial_state in initial_states.items():
+        yield ent_id, [initial_state]
+
+
+def get_downsampled_states(hass, start_time, end_time, entity_ids, resolution):
+    """Return the history of entities downsampled to buckets of resolution.
+
+    Entities with numeric states get a list of buckets with the time
+    weighted mean and the min and max of the bucket, other entities get
+    their significant states in the minimal_response format. The buckets
+    are aligned to multiples of the resolution.
+
+    When the resolution is a multiple of the period of a statistics table,
+    the statistics of the entities that have them are used and only the
+    time after the last compiled statistics is read from the states. Those
+    entities are numeric, so their states that are not numbers are gaps.
+    """
+    resolution_s = resolution.total_seconds()
+    start_ts = process_datetime_to_timestamp(start_time)
+    # The last state does not last beyond now
+    end_ts = min(process_datetime_to_timestamp(end_time), time.time())
+    grid_start_ts = start_ts - start_ts % resolution_s
+
+    statistics_buckets = {}
+    for period, period_duration in STATISTICS_PERIODS:
+        if resolution_s % period_duration.total_seconds() == 0:
+            statistics_buckets = _downsample_statistics(
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                period,
+                grid_start_ts,
+                resolution_s,
+            )
+            break
+
+    result = {}
+    with session_scope(hass=hass) as session:
+        for entity_id in entity_ids:
+            raw_start_ts = start_ts
+            buckets = {}
+            has_statistics = entity_id in statistics_buckets
+            if has_statistics:
+                buckets, stats_end_ts = statistics_buckets[entity_id]
+                raw_start_ts = max(start_ts, stats_end_ts)
+            if raw_start_ts < end_ts:
+                raw_buckets = _downsample_states(
+                    hass,
+                    session,
+                    entity_id,
+                    raw_start_ts,
+                    end_ts,
+                    grid_start_ts,
+                    resolution_s,
+                    numeric=has_statistics,
+                )
+                if raw_buckets is None:
+                    # Not a numeric entity
+                    if states := get_significant_states_with_session(
+                        hass,
+                        session,
+                        start_time,
+                        end_time,
+                        [entity_id],
+                        minimal_response=True,
+                    ):
+                        result[entity_id] = states[entity_id]
+                    continue
+                for index, bucket in raw_buckets.items():
+                    if index in buckets:
+                        _merge_bucket(buckets[index], bucket)
+                    else:
+                        buckets[index] = bucket
+            if buckets:
+                result[entity_id] = [
+                    {
+                        "start": timestamp_to_utc_isoformat(
+                            grid_start_ts + index * resolution_s
+                        ),
+                        "mean": bucket[2] / bucket[3] if bucket[3] else None,
+                        "min": bucket[0],
+                        "max": bucket[1],
+                    }
+                    for index, bucket in sorted(buckets.items())
+                ]
+    return result
+
+
+def _merge_bucket(bucket, other):
+    """Merge a [min, max, weighted sum, duration] bucket into another."""
+    bucket[0] = min(bucket[0], other[0])
+    bucket[1] = max(bucket[1], other[1])
+    bucket[2] += other[2]
+    bucket[3] += other[3]
+
+
+def _downsample_statistics(
+    hass, start_time, end_time, entity_ids, period, grid_start_ts, resolution_s
+):
+    """Rebucket the mean statistics of the entities that have them.
+
+    Returns the buckets and the end of the last statistics by entity_id.
+    """
+    if not (
+        metadata := statistics.get_metadata(
+            hass, statistic_ids=entity_ids, statistic_type="mean"
+        )
+    ):
+        return {}
+    result = {}
+    for statistic_id, stats in statistics.statistics_during_period(
+        hass, start_time, end_time, list(metadata), period, start_time_as_datetime=True
+    ).items():
+        buckets = {}
+        stats_end_ts = None
+        for stat in stats:
+            stat_start_ts = process_datetime_to_timestamp(stat["start"])
+            stats_end_ts = process_datetime_to_timestamp(
+                dt_util.parse_datetime(stat["end"])
+            )
+            if stat_start_ts < grid_start_ts or stat["mean"] is None:
+                continue
+            duration = stats_end_ts - stat_start_ts
+            bucket = [stat["min"], stat["max"], stat["mean"] * duration, duration]
+            index = int((stat_start_ts - grid_start_ts) // resolution_s)
+            if index in buckets:
+                _merge_bucket(buckets[index], bucket)
+            else:
+                buckets[index] = bucket
+        if stats_end_ts is not None:
+            result[statistic_id] = (buckets, stats_end_ts)
+    return result
+
+
+def _downsample_states(
+    hass,
+    session,
+    entity_id,
+    start_ts,
+    end_ts,
+    grid_start_ts,
+    resolution_s,
+    numeric=False,
+):
+    """Downsample the recorded states of an entity in a single pass.
+
+    Every value is weighted by the time until the next state, unavailable
+    and unknown states are gaps. Returns None if the entity is not numeric,
+    unless it is known to be, then the states that are not numbers are gaps.
+    """
+    migrated = hass.data[DATA_INSTANCE].timestamp_migration_done
+    last_changed, last_updated = _timestamp_columns(migrated)
+    baked_query = hass.data[HISTORY_BAKERY](
+        lambda session: session.query(States.state, last_updated), migrated
+    )
+    metadata_id = _single_metadata_id_for_entity_id(hass, session, entity_id)
+    if metadata_id is not None:
+        baked_query += lambda q: q.filter(
+            States.metadata_id == bindparam("metadata_id")
+        )
+    else:
+        baked_query += lambda q: q.filter(States.entity_id == bindparam("entity_id"))
+    baked_query += lambda q: q.filter(
+        (last_changed == last_updated)
+        & (last_updated > bindparam("start_ts"))
+        & (last_updated < bindparam("end_ts"))
+    )
+    baked_query += lambda q: q.order_by(last_updated)
+    query = (
+        baked_query(session)
+        .params(
+            metadata_id=metadata_id,
+            entity_id=entity_id,
+            start_ts=start_ts,
+            end_ts=end_ts,
+        )
+        .with_post_criteria(lambda q: q.yield_per(STREAM_YIELD_PER))
+    )
+
+    buckets = {}
+
+    def _add_segment(value, segment_start_ts, segment_end_ts):
+        """Add a value to the buckets of the segment it lasted for."""
+        while segment_start_ts < segment_end_ts:
+            index = int((segment_start_ts - grid_start_ts) // resolution_s)
+            part_end_ts = min(
+                segment_end_ts, grid_start_ts + (index + 1) * resolution_s
+            )
+            duration = part_end_ts - segment_start_ts
+            if (bucket := buckets.get(index)) is None:
+                buckets[index] = [value, value, value * duration, duration]
+            else:
+                bucket[0] = min(bucket[0], value)
+                bucket[1] = max(bucket[1], value)
+                bucket[2] += value * duration
+                bucket[3] += duration
+            segment_start_ts = part_end_ts
+
+    value = None
+    since_ts = start_ts
+    initial_states = _get_single_entity_states_with_session(
+        hass, session, dt_util.utc_from_timestamp(start_ts), entity_id
+    )
+    rows = [(state.state, start_ts) for state in initial_states]
+    for state, last_updated_ts in chain(rows, query):
+        if state in DOWNSAMPLE_GAP_STATES:
+            new_value = None
+        else:
+            try:
+                new_value = float(state)
+            except (TypeError, ValueError):
+                if not numeric:
+                    return None
+                new_value = math.nan
+            if not math.isfinite(new_value):
+                new_value = None
+        if value is not None:
+            _add_segment(value, since_ts, last_updated_ts)
+        value = new_value
+        since_ts = last_updated_ts
+    if value is not None:
+        _add_segment(value, since_ts, end_ts)
+    return buckets
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -1,4 +1,5 @@
 """Schema migration helpers."""
+from collections import defaultdict
 import contextlib
 from datetime import timedelta
 import logging
@@ -15,15 +16,20 @@ from sqlalchemy.exc import (
 from sqlalchemy.schema import AddConstraint, DropConstraint
 from sqlalchemy.sql.expression import true
 
+from .const import MAX_ROWS_TO_MIGRATE
 from .models import (
     SCHEMA_VERSION,
     TABLE_STATES,
     Base,
+    Events,
     SchemaChanges,
+    States,
+    StatesMeta,
     Statistics,
     StatisticsMeta,
     StatisticsRuns,
     StatisticsShortTerm,
+    process_datetime_to_timestamp,
     process_timestamp,
 )
 from .statistics import delete_duplicates, get_start_time
@@ -639,10 +645,153 @@ def _apply_update(instance, new_version, old_version):  # noqa: C901
                 "ix_statistics_short_term_statistic_id_start",
             )
 
+    elif new_version == 25:
+        # Add the attributes_id column pointing to the deduplicated
+        # state_attributes table, the table itself is created by create_all
+        _add_columns(instance, "states", ["attributes_id INTEGER"])
+        _create_index(instance, "states", "ix_states_attributes_id")
+    elif new_version == 26:
+        # Add the data_id column pointing to the deduplicated
+        # event_data table, the table itself is created by create_all
+        _add_columns(instance, "events", ["data_id INTEGER"])
+        _create_index(instance, "events", "ix_events_data_id")
+        # Store the context on the states that are recorded without
+        # a matching state_changed row in the events table. Databases
+        # that were created before schema 9 may already have some of
+        # these columns.
+        _add_columns(
+            instance,
+            "states",
+            [
+                "context_id VARCHAR(36)",
+                "context_user_id VARCHAR(36)",
+                "context_parent_id VARCHAR(36)",
+            ],
+        )
+        _create_index(instance, "states", "ix_states_context_id")
+    elif new_version == 27:
+        # Add the metadata_id column pointing to the states_meta table,
+        # the table itself is created by create_all. Existing states are
+        # backfilled in the background by migrate_entity_ids. Its index
+        # on metadata_id and last_updated_ts is created by version 28
+        # once the timestamp columns exist.
+        _add_columns(instance, "states", ["metadata_id INTEGER"])
+    elif new_version == 28:
+        # Add epoch timestamp columns next to the DATETIME columns
+        # that history and the logbook read instead. Existing rows
+        # are backfilled in the background by migrate_timestamp_columns.
+        _add_columns(instance, "events", ["time_fired_ts DOUBLE PRECISION"])
+        _add_columns(
+            instance,
+            "states",
+            ["last_changed_ts DOUBLE PRECISION", "last_updated_ts DOUBLE PRECISION"],
+        )
+        _create_index(instance, "events", "ix_events_time_fired_ts")
+        _create_index(instance, "events", "ix_events_event_type_time_fired_ts")
+        _create_index(instance, "states", "ix_states_last_updated_ts")
+        _create_index(instance, "states", "ix_states_metadata_id_last_updated_ts")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
 
+def migrate_timestamp_columns(instance):
+    """Backfill the epoch timestamp columns of rows recorded before schema 28.
+
+    The events and then the states are migrated in batches, returns True
+    when all rows have their timestamps and False if it needs to be
+    called again.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        if events := (
+            session.query(Events.event_id, Events.time_fired)
+            .filter(Events.time_fired_ts.is_(None))
+            .filter(Events.time_fired.isnot(None))
+            .limit(MAX_ROWS_TO_MIGRATE)
+            .all()
+        ):
+            session.bulk_update_mappings(
+                Events,
+                [
+                    {
+                        "event_id": event.event_id,
+                        "time_fired_ts": process_datetime_to_timestamp(
+                            event.time_fired
+                        ),
+                    }
+                    for event in events
+                ],
+            )
+            _LOGGER.debug("Migrated the timestamps of %s events", len(events))
+            return False
+
+        if states := (
+            session.query(States.state_id, States.last_changed, States.last_updated)
+            .filter(States.last_updated_ts.is_(None))
+            .filter(States.last_updated.isnot(None))
+            .limit(MAX_ROWS_TO_MIGRATE)
+            .all()
+        ):
+            session.bulk_update_mappings(
+                States,
+                [
+                    {
+                        "state_id": state.state_id,
+                        "last_changed_ts": process_datetime_to_timestamp(
+                            state.last_changed or state.last_updated
+                        ),
+                        "last_updated_ts": process_datetime_to_timestamp(
+                            state.last_updated
+                        ),
+                    }
+                    for state in states
+                ],
+            )
+            _LOGGER.debug("Migrated the timestamps of %s states", len(states))
+            return False
+
+    return True
+
+
+def migrate_entity_ids(instance):
+    """Backfill the metadata_id of states recorded before schema version 27.
+
+    The states are migrated in batches, returns True when all states
+    have a metadata_id and False if it needs to be called again.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        states = (
+            session.query(States.state_id, States.entity_id)
+            .filter(States.metadata_id.is_(None))
+            .filter(States.entity_id.isnot(None))
+            .limit(MAX_ROWS_TO_MIGRATE)
+            .all()
+        )
+        if not states:
+            return True
+
+        state_ids_by_entity_id = defaultdict(list)
+        for state in states:
+            state_ids_by_entity_id[state.entity_id].append(state.state_id)
+
+        metadata_ids = dict(
+            session.query(StatesMeta.entity_id, StatesMeta.metadata_id).filter(
+                StatesMeta.entity_id.in_(state_ids_by_entity_id)
+            )
+        )
+        for entity_id, state_ids in state_ids_by_entity_id.items():
+            if (metadata_id := metadata_ids.get(entity_id)) is None:
+                states_meta = StatesMeta(entity_id=entity_id)
+                session.add(states_meta)
+                session.flush()
+                metadata_id = states_meta.metadata_id
+            session.query(States).filter(States.state_id.in_(state_ids)).update(
+                {"metadata_id": metadata_id}, synchronize_session=False
+            )
+
+    _LOGGER.debug("Migrated %s states to the states_meta table", len(states))
+    return False
+
+
 def _inspect_schema_version(engine, session):
     """Determine the schema version by inspecting the db structure.
 
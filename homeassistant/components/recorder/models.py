@@ -4,9 +4,11 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 import json
 import logging
-from typing import TypedDict, overload
+from typing import Any, TypedDict, cast, overload
 
+from fnvhash import fnv1a_32
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -17,7 +19,9 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    TypeDecorator,
     distinct,
+    type_coerce,
 )
 from sqlalchemy.dialects import mysql, oracle, postgresql
 from sqlalchemy.ext.declarative import declared_attr
@@ -40,14 +44,17 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 24
+SCHEMA_VERSION = 28
 
 _LOGGER = logging.getLogger(__name__)
 
 DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
+TABLE_EVENT_DATA = "event_data"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
+TABLE_STATES_META = "states_meta"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
@@ -57,7 +64,10 @@ TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 
 ALL_TABLES = [
     TABLE_STATES,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES_META,
     TABLE_EVENTS,
+    TABLE_EVENT_DATA,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
     TABLE_STATISTICS,
@@ -84,6 +94,7 @@ class Events(Base):  # type: ignore[misc,valid-type]
         # Used for fetching events at a specific time
         # see logbook
         Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index("ix_events_event_type_time_fired_ts", "event_type", "time_fired_ts"),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_EVENTS
@@ -92,33 +103,44 @@ class Events(Base):  # type: ignore[misc,valid-type]
     event_data = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
     origin = Column(String(MAX_LENGTH_EVENT_ORIGIN))
     time_fired = Column(DATETIME_TYPE, index=True)
+    # The epoch timestamp of time_fired, read by the logbook to
+    # avoid converting the DATETIME column for every row
+    time_fired_ts = Column(DOUBLE_TYPE, index=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
     context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
     context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
     context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
+    data_id = Column(Integer, ForeignKey("event_data.data_id"), index=True)
+    event_data_rel = relationship("EventData")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
         return (
             f"<recorder.Events("
-            f"id={self.event_id}, type='{self.event_type}', data='{self.event_data}', "
+            f"id={self.event_id}, type='{self.event_type}', "
             f"origin='{self.origin}', time_fired='{self.time_fired}'"
-            f")>"
+            f", data_id={self.data_id})>"
         )
 
     @staticmethod
-    def from_event(event, event_data=None):
+    def from_event(event):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=event_data
-            or json.dumps(event.data, cls=JSONEncoder, separators=(",", ":")),
-            origin=str(event.origin.value),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event) -> dict[str, Any]:
+        """Create the column values of an events row from a native event."""
+        # The event data is stored in the event_data table
+        return {
+            "event_type": event.event_type,
+            "event_data": None,
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "time_fired_ts": event.time_fired.timestamp(),
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to a native HA Event."""
@@ -130,7 +152,9 @@ class Events(Base):  # type: ignore[misc,valid-type]
         try:
             return Event(
                 self.event_type,
-                json.loads(self.event_data),
+                # Join the event_data table on data_id to get the data
+                # for newer events
+                json.loads(self.event_data) if self.event_data else {},
                 EventOrigin(self.origin),
                 process_timestamp(self.time_fired),
                 context=context,
@@ -141,6 +165,54 @@ class Events(Base):  # type: ignore[misc,valid-type]
             return None
 
 
+class EventData(Base):  # type: ignore[misc,valid-type]
+    """Event data history."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_EVENT_DATA
+    data_id = Column(Integer, Identity(), primary_key=True)
+    hash = Column(BigInteger, index=True)
+    # Note that this is not named data to avoid confusion with the events table
+    shared_data = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.EventData("
+            f"id={self.data_id}, hash='{self.hash}', data='{self.shared_data}'"
+            f")>"
+        )
+
+    @staticmethod
+    def from_event(event):
+        """Create object from an event."""
+        shared_data = EventData.shared_data_from_event(event)
+        return EventData(
+            shared_data=shared_data, hash=EventData.hash_shared_data(shared_data)
+        )
+
+    @staticmethod
+    def shared_data_from_event(event) -> str:
+        """Create shared_data from an event."""
+        return json.dumps(event.data, cls=JSONEncoder, separators=(",", ":"))
+
+    @staticmethod
+    def hash_shared_data(shared_data: str) -> int:
+        """Return the hash of json encoded shared data."""
+        return cast(int, fnv1a_32(shared_data.encode("utf-8")))
+
+    def to_native(self):
+        """Convert to an HA event data dict."""
+        try:
+            return json.loads(self.shared_data)
+        except ValueError:
+            # When json.loads fails
+            _LOGGER.exception("Error converting row to event data: %s", self)
+            return {}
+
+
 class States(Base):  # type: ignore[misc,valid-type]
     """State change history."""
 
@@ -148,6 +220,11 @@ class States(Base):  # type: ignore[misc,valid-type]
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
         Index("ix_states_entity_id_last_updated", "entity_id", "last_updated"),
+        # Used for fetching the history of entities by their
+        # integer metadata_id (history.py)
+        Index(
+            "ix_states_metadata_id_last_updated_ts", "metadata_id", "last_updated_ts"
+        ),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_STATES
@@ -161,10 +238,26 @@ class States(Base):  # type: ignore[misc,valid-type]
     )
     last_changed = Column(DATETIME_TYPE, default=dt_util.utcnow)
     last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow, index=True)
+    # The epoch timestamps of last_changed and last_updated, read by
+    # history and the logbook to avoid converting the DATETIME columns
+    # for every row
+    last_changed_ts = Column(DOUBLE_TYPE)
+    last_updated_ts = Column(DOUBLE_TYPE, index=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
     old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
+    # The context is only stored on the state when there is no
+    # matching state_changed row in the events table
+    context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
+    context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
+    context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
+    metadata_id = Column(Integer, ForeignKey("states_meta.metadata_id"))
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes")
+    states_meta = relationship("StatesMeta")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -173,48 +266,65 @@ class States(Base):  # type: ignore[misc,valid-type]
             f"id={self.state_id}, domain='{self.domain}', entity_id='{self.entity_id}', "
             f"state='{self.state}', event_id='{self.event_id}', "
             f"last_updated='{self.last_updated.isoformat(sep=' ', timespec='seconds')}', "
-            f"old_state_id={self.old_state_id}"
+            f"old_state_id={self.old_state_id}, attributes_id={self.attributes_id}"
             f")>"
         )
 
     @staticmethod
     def from_event(event):
         """Create object from a state_changed event."""
+        return States(**States.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event) -> dict[str, Any]:
+        """Create the column values of a states row from a state_changed event."""
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
+            domain = split_entity_id(entity_id)[0]
+            state_value = ""
+            last_changed = last_updated = event.time_fired
         else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(
-                dict(state.attributes), cls=JSONEncoder, separators=(",", ":")
-            )
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
+            domain = state.domain
+            state_value = state.state
+            last_changed = state.last_changed
+            last_updated = state.last_updated
 
-        return dbstate
+        # The attributes are stored in the state_attributes table
+        return {
+            "entity_id": entity_id,
+            "domain": domain,
+            "state": state_value,
+            "attributes": None,
+            "last_changed": last_changed,
+            "last_updated": last_updated,
+            "last_changed_ts": last_changed.timestamp(),
+            "last_updated_ts": last_updated.timestamp(),
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
+        attributes = self.attributes
+        if attributes is None and self.attributes_id is not None:
+            # Newer states keep their attributes in the state_attributes
+            # table, join it on attributes_id or load it here
+            attributes = self.state_attributes.shared_attrs
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(attributes) if attributes else {},
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
-                # Join the events table on event_id to get the context instead
-                # as it will always be there for state_changed events
-                context=Context(id=None),
+                # Join the events table on event_id to get the context
+                # for states that do not carry it themselves
+                context=Context(
+                    id=self.context_id,
+                    user_id=self.context_user_id,
+                    parent_id=self.context_parent_id,
+                ),
                 validate_entity_id=validate_entity_id,
             )
         except ValueError:
@@ -223,6 +333,86 @@ class States(Base):  # type: ignore[misc,valid-type]
             return None
 
 
+class StatesMeta(Base):  # type: ignore[misc,valid-type]
+    """Map entity_ids to the integer metadata_id used by the states table."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATES_META
+    metadata_id = Column(Integer, Identity(), primary_key=True)
+    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID), index=True, unique=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StatesMeta("
+            f"id={self.metadata_id}, entity_id='{self.entity_id}'"
+            f")>"
+        )
+
+
+class StateAttributes(Base):  # type: ignore[misc,valid-type]
+    """State attribute change history."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, Identity(), primary_key=True)
+    hash = Column(BigInteger, index=True)
+    # Note that this is not named attributes to avoid confusion with the states table
+    shared_attrs = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StateAttributes("
+            f"id={self.attributes_id}, hash='{self.hash}', attributes='{self.shared_attrs}'"
+            f")>"
+        )
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        return StateAttributes(
+            shared_attrs=shared_attrs,
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+        )
+
+    @staticmethod
+    def shared_attrs_from_event(event) -> str:
+        """Create shared_attrs from a state_changed event."""
+        state: State | None = event.data.get("new_state")
+        # State got deleted
+        if state is None:
+            return "{}"
+        try:
+            # Shared with the other consumers of the state
+            return state.attributes_json()
+        except ValueError:
+            # NaN and infinite floats are not valid JSON, but have
+            # always been recorded
+            return json.dumps(
+                dict(state.attributes), cls=JSONEncoder, separators=(",", ":")
+            )
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs: str) -> int:
+        """Return the hash of json encoded shared attributes."""
+        return cast(int, fnv1a_32(shared_attrs.encode("utf-8")))
+
+    def to_native(self):
+        """Convert to an HA state object."""
+        try:
+            return json.loads(self.shared_attrs)
+        except ValueError:
+            # When json.loads fails
+            _LOGGER.exception("Error converting row to state attributes: %s", self)
+            return {}
+
+
 class StatisticResult(TypedDict):
     """Statistic result data class.
 
@@ -468,6 +658,47 @@ def process_timestamp_to_utc_isoformat(ts: datetime | None) -> str | None:
     return ts.astimezone(dt_util.UTC).isoformat()
 
 
+def process_datetime_to_timestamp(ts: datetime) -> float:
+    """Process a datetime from the database into an epoch timestamp."""
+    return process_timestamp(ts).timestamp()
+
+
+def timestamp_to_utc_isoformat(ts: float) -> str:
+    """Convert an epoch timestamp into UTC isotime."""
+    return dt_util.utc_from_timestamp(ts).isoformat()
+
+
+class DatetimeAsTimestamp(TypeDecorator):  # pylint: disable=abstract-method
+    """A DATETIME column that is compared with and read as epoch timestamps."""
+
+    impl = DATETIME_TYPE
+    cache_ok = True
+
+    def process_bind_param(self, value: float | None, dialect: Any) -> Any:
+        """Convert an epoch timestamp to compare with into a datetime."""
+        if value is None:
+            return None
+        return dt_util.utc_from_timestamp(value)
+
+    def process_result_value(self, value: Any, dialect: Any) -> float | None:
+        """Convert a datetime from the database into an epoch timestamp."""
+        if value is None:
+            return None
+        return process_datetime_to_timestamp(value)
+
+
+# The DATETIME columns standing in for the epoch timestamp columns
+# until those have been backfilled for the rows recorded before
+# schema version 28
+EVENTS_TIME_FIRED_AS_TIMESTAMP = type_coerce(Events.time_fired, DatetimeAsTimestamp())
+STATES_LAST_CHANGED_AS_TIMESTAMP = type_coerce(
+    States.last_changed, DatetimeAsTimestamp()
+)
+STATES_LAST_UPDATED_AS_TIMESTAMP = type_coerce(
+    States.last_updated, DatetimeAsTimestamp()
+)
+
+
 class LazyState(State):
     """A lazy version of core State."""
 
@@ -496,7 +727,9 @@ class LazyState(State):
         """State attributes."""
         if not self._attributes:
             try:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(
+                    self._row.shared_attrs or self._row.attributes
+                )
             except ValueError:
                 # When json.loads fails
                 _LOGGER.exception("Error converting row to state: %s", self._row)
@@ -524,7 +757,7 @@ class LazyState(State):
     def last_changed(self):
         """Last changed datetime."""
         if not self._last_changed:
-            self._last_changed = process_timestamp(self._row.last_changed)
+            self._last_changed = dt_util.utc_from_timestamp(self._row.last_changed_ts)
         return self._last_changed
 
     @last_changed.setter
@@ -536,7 +769,7 @@ class LazyState(State):
     def last_updated(self):
         """Last updated datetime."""
         if not self._last_updated:
-            self._last_updated = process_timestamp(self._row.last_updated)
+            self._last_updated = dt_util.utc_from_timestamp(self._row.last_updated_ts)
         return self._last_updated
 
     @last_updated.setter
@@ -554,14 +787,19 @@ class LazyState(State):
         if self._last_changed:
             last_changed_isoformat = self._last_changed.isoformat()
         else:
-            last_changed_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_changed
+            last_changed_isoformat = timestamp_to_utc_isoformat(
+                self._row.last_changed_ts
             )
         if self._last_updated:
             last_updated_isoformat = self._last_updated.isoformat()
+        elif (
+            not self._last_changed
+            and self._row.last_updated_ts == self._row.last_changed_ts
+        ):
+            last_updated_isoformat = last_changed_isoformat
         else:
-            last_updated_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_updated
+            last_updated_isoformat = timestamp_to_utc_isoformat(
+                self._row.last_updated_ts
             )
         return {
             "entity_id": self.entity_id,
@@ -2,16 +2,27 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import func
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
-from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States, StatisticsRuns, StatisticsShortTerm
+import homeassistant.util.dt as dt_util
+
+from .const import MAX_ROWS_TO_PURGE, MIN_ROWS_TO_PURGE
+from .models import (
+    EventData,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StatisticsRuns,
+    StatisticsShortTerm,
+)
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
 
@@ -20,15 +31,90 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# The time one purge batch should take so it does not
+# hold back the events waiting in the recorder queue
+PURGE_BATCH_TARGET_DURATION = 0.5
+
+
+@dataclass
+class PurgeProgress:
+    """The progress of a purge, which is persisted to resume it after a restart."""
+
+    purge_before: datetime
+    repack: bool
+    apply_filter: bool
+    started: datetime = field(default_factory=dt_util.utcnow)
+    batch_size: int = MAX_ROWS_TO_PURGE
+    batches: int = 0
+    states_purged: int = 0
+    events_purged: int = 0
+    last_batch_duration: float = 0
+
+    def record_batch(self, duration: float) -> None:
+        """Record a purge batch and adapt the size of the next one to its duration."""
+        self.batches += 1
+        self.last_batch_duration = duration
+        if duration > PURGE_BATCH_TARGET_DURATION:
+            batch_size = int(self.batch_size * PURGE_BATCH_TARGET_DURATION / duration)
+        elif duration < PURGE_BATCH_TARGET_DURATION / 2:
+            batch_size = self.batch_size * 2
+        else:
+            return
+        self.batch_size = max(MIN_ROWS_TO_PURGE, min(MAX_ROWS_TO_PURGE, batch_size))
+
+    def merge(self, purge_before: datetime, repack: bool, apply_filter: bool) -> None:
+        """Merge a purge that was requested while this one is in progress.
+
+        The earliest purge_before is kept, what the other purge would have
+        removed on top of it is left for the next purge.
+        """
+        self.purge_before = min(self.purge_before, purge_before)
+        self.repack = self.repack or repack
+        self.apply_filter = self.apply_filter or apply_filter
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the progress."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "repack": self.repack,
+            "apply_filter": self.apply_filter,
+            "started": self.started.isoformat(),
+            "batch_size": self.batch_size,
+            "batches": self.batches,
+            "states_purged": self.states_purged,
+            "events_purged": self.events_purged,
+            "last_batch_duration": round(self.last_batch_duration, 3),
+        }
+
+    @classmethod
+    def from_dict(cls, progress: dict[str, Any]) -> PurgeProgress:
+        """Restore the progress from its dict representation."""
+        return cls(
+            purge_before=dt_util.parse_datetime(progress["purge_before"]),
+            repack=progress["repack"],
+            apply_filter=progress["apply_filter"],
+            started=dt_util.parse_datetime(progress["started"]),
+            batch_size=progress["batch_size"],
+            batches=progress["batches"],
+            states_purged=progress["states_purged"],
+            events_purged=progress["events_purged"],
+            last_batch_duration=progress["last_batch_duration"],
+        )
+
 
 @retryable_database_job("purge")
 def purge_old_data(
-    instance: Recorder, purge_before: datetime, repack: bool, apply_filter: bool = False
+    instance: Recorder,
+    purge_before: datetime,
+    repack: bool,
+    apply_filter: bool = False,
+    progress: PurgeProgress | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
     """
+    max_rows = progress.batch_size if progress else MAX_ROWS_TO_PURGE
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
@@ -36,26 +122,44 @@ def purge_old_data(
 
     with session_scope(session=instance.get_session()) as session:  # type: ignore[misc]
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-        event_ids = _select_event_ids_to_purge(session, purge_before)
-        state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
-        statistics_runs = _select_statistics_runs_to_purge(session, purge_before)
+        event_ids, data_ids = _select_event_and_data_ids_to_purge(
+            session, purge_before, max_rows
+        )
+        state_ids, attributes_ids = _select_state_and_attributes_ids_to_purge(
+            session, purge_before, event_ids, max_rows
+        )
+        statistics_runs = _select_statistics_runs_to_purge(
+            session, purge_before, max_rows
+        )
         short_term_statistics = _select_short_term_statistics_to_purge(
-            session, purge_before
+            session, purge_before, max_rows
         )
 
         if state_ids:
             _purge_state_ids(instance, session, state_ids)
 
+        if unused_attributes_ids := _select_unused_attributes_ids(
+            session, attributes_ids
+        ):
+            _purge_attributes_ids(instance, session, unused_attributes_ids)
+
         if event_ids:
             _purge_event_ids(session, event_ids)
 
+        if unused_data_ids := _select_unused_event_data_ids(session, data_ids):
+            _purge_event_data_ids(instance, session, unused_data_ids)
+
         if statistics_runs:
             _purge_statistics_runs(session, statistics_runs)
 
         if short_term_statistics:
             _purge_short_term_statistics(session, short_term_statistics)
 
-        if event_ids or statistics_runs or short_term_statistics:
+        if progress:
+            progress.states_purged += len(state_ids)
+            progress.events_purged += len(event_ids)
+
+        if event_ids or state_ids or statistics_runs or short_term_statistics:
             # Return false, as we might not be done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
             return False
@@ -70,42 +174,101 @@ def purge_old_data(
     return True
 
 
-def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list[int]:
-    """Return a list of event ids to purge."""
+def _select_event_and_data_ids_to_purge(
+    session: Session, purge_before: datetime, max_rows: int = MAX_ROWS_TO_PURGE
+) -> tuple[list[int], set[int]]:
+    """Return a list of event ids and a set of event data ids to purge."""
     events = (
-        session.query(Events.event_id)
+        session.query(Events.event_id, Events.data_id)
         .filter(Events.time_fired < purge_before)
-        .limit(MAX_ROWS_TO_PURGE)
+        .limit(max_rows)
         .all()
     )
     _LOGGER.debug("Selected %s event ids to remove", len(events))
-    return [event.event_id for event in events]
+    return [event.event_id for event in events], {
+        event.data_id for event in events if event.data_id
+    }
 
 
-def _select_state_ids_to_purge(
-    session: Session, purge_before: datetime, event_ids: list[int]
+def _select_state_and_attributes_ids_to_purge(
+    session: Session,
+    purge_before: datetime,
+    event_ids: list[int],
+    max_rows: int = MAX_ROWS_TO_PURGE,
+) -> tuple[set[int], set[int]]:
+    """Return a list of state and attribute ids to purge."""
+    if event_ids:
+        states = (
+            session.query(States.state_id, States.attributes_id)
+            .filter(States.last_updated < purge_before)
+            .filter(States.event_id.in_(event_ids))
+            .all()
+        )
+    else:
+        # Once all old events are gone, purge the remaining states,
+        # which do not have an event row when state_changed_event_rows
+        # is disabled
+        states = (
+            session.query(States.state_id, States.attributes_id)
+            .filter(States.last_updated < purge_before)
+            .limit(max_rows)
+            .all()
+        )
+    _LOGGER.debug("Selected %s state ids to remove", len(states))
+    state_ids = set()
+    attributes_ids = set()
+    for state in states:
+        state_ids.add(state.state_id)
+        if state.attributes_id:
+            attributes_ids.add(state.attributes_id)
+    return state_ids, attributes_ids
+
+
+def _select_unused_attributes_ids(
+    session: Session, attributes_ids: set[int]
 ) -> set[int]:
-    """Return a list of state ids to purge."""
-    if not event_ids:
+    """Return a set of attributes ids that are not used by any states in the database."""
+    if not attributes_ids:
         return set()
-    states = (
-        session.query(States.state_id)
-        .filter(States.last_updated < purge_before)
-        .filter(States.event_id.in_(event_ids))
+    seen_ids = {
+        state.attributes_id
+        for state in session.query(
+            distinct(States.attributes_id).label("attributes_id")
+        )
+        .filter(States.attributes_id.in_(attributes_ids))
         .all()
+    }
+    to_remove = attributes_ids - seen_ids
+    _LOGGER.debug(
+        "Selected %s shared attributes to remove",
+        len(to_remove),
     )
-    _LOGGER.debug("Selected %s state ids to remove", len(states))
-    return {state.state_id for state in states}
+    return to_remove
+
+
+def _select_unused_event_data_ids(session: Session, data_ids: set[int]) -> set[int]:
+    """Return a set of event data ids that are not used by any events in the database."""
+    if not data_ids:
+        return set()
+    seen_ids = {
+        event.data_id
+        for event in session.query(distinct(Events.data_id).label("data_id"))
+        .filter(Events.data_id.in_(data_ids))
+        .all()
+    }
+    to_remove = data_ids - seen_ids
+    _LOGGER.debug("Selected %s shared event data to remove", len(to_remove))
+    return to_remove
 
 
 def _select_statistics_runs_to_purge(
-    session: Session, purge_before: datetime
+    session: Session, purge_before: datetime, max_rows: int = MAX_ROWS_TO_PURGE
 ) -> list[int]:
     """Return a list of statistic runs to purge, but take care to keep the newest run."""
     statistic_runs = (
         session.query(StatisticsRuns.run_id)
         .filter(StatisticsRuns.start < purge_before)
-        .limit(MAX_ROWS_TO_PURGE)
+        .limit(max_rows)
         .all()
     )
     statistic_runs_list = [run.run_id for run in statistic_runs]
@@ -120,13 +283,13 @@ def _select_statistics_runs_to_purge(
 
 
 def _select_short_term_statistics_to_purge(
-    session: Session, purge_before: datetime
+    session: Session, purge_before: datetime, max_rows: int = MAX_ROWS_TO_PURGE
 ) -> list[int]:
     """Return a list of short term statistics to purge."""
     statistics = (
         session.query(StatisticsShortTerm.id)
         .filter(StatisticsShortTerm.start < purge_before)
-        .limit(MAX_ROWS_TO_PURGE)
+        .limit(max_rows)
         .all()
     )
     _LOGGER.debug("Selected %s short term statistics to remove", len(statistics))
@@ -174,6 +337,81 @@ def _evict_purged_states_from_old_states_cache(
     for purged_state_id in purged_state_ids.intersection(old_state_reversed):
         old_states.pop(old_state_reversed[purged_state_id], None)
 
+    # The bulk insert path only keeps the state ids
+    old_state_ids = instance._old_state_ids  # pylint: disable=protected-access
+    old_state_ids_reversed = {
+        old_state_id: entity_id for entity_id, old_state_id in old_state_ids.items()
+    }
+    for purged_state_id in purged_state_ids.intersection(old_state_ids_reversed):
+        old_state_ids.pop(old_state_ids_reversed[purged_state_id], None)
+
+
+def _purge_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete old attributes ids."""
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s attribute states", deleted_rows)
+
+    # Evict any entries in the state_attributes_ids cache referring to a purged state
+    _evict_purged_attributes_from_attributes_cache(instance, attributes_ids)
+
+
+def _evict_purged_attributes_from_attributes_cache(
+    instance: Recorder, purged_attributes_ids: set[int]
+) -> None:
+    """Evict purged attribute ids from the attribute ids cache."""
+    # Make a map from attributes_id to the shared attributes
+    state_attributes_ids = (
+        instance._state_attributes_ids  # pylint: disable=protected-access
+    )
+    state_attributes_ids_reversed = {
+        attributes_id: attributes
+        for attributes, attributes_id in state_attributes_ids.items()
+    }
+
+    # Evict any purged attributes from the attributes cache
+    for purged_attribute_id in purged_attributes_ids.intersection(
+        state_attributes_ids_reversed
+    ):
+        state_attributes_ids.pop(
+            state_attributes_ids_reversed[purged_attribute_id], None
+        )
+
+
+def _purge_event_data_ids(
+    instance: Recorder, session: Session, data_ids: set[int]
+) -> None:
+    """Delete old event data ids."""
+    deleted_rows = (
+        session.query(EventData)
+        .filter(EventData.data_id.in_(data_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s data events", deleted_rows)
+
+    # Evict any entries in the event_data_ids cache referring to a purged event
+    _evict_purged_data_from_data_cache(instance, data_ids)
+
+
+def _evict_purged_data_from_data_cache(
+    instance: Recorder, purged_data_ids: set[int]
+) -> None:
+    """Evict purged data ids from the data ids cache."""
+    # Make a map from data_id to the shared data
+    event_data_ids = instance._event_data_ids  # pylint: disable=protected-access
+    event_data_ids_reversed = {
+        data_id: data for data, data_id in event_data_ids.items()
+    }
+
+    # Evict any purged data from the data cache
+    for purged_data_id in purged_data_ids.intersection(event_data_ids_reversed):
+        event_data_ids.pop(event_data_ids_reversed[purged_data_id], None)
+
 
 def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None:
     """Delete by run_id."""
@@ -254,9 +492,10 @@ def _purge_filtered_states(
     """Remove filtered states and linked events."""
     state_ids: list[int]
     event_ids: list[int | None]
-    state_ids, event_ids = zip(
+    attributes_ids: list[int | None]
+    state_ids, event_ids, attributes_ids = zip(
         *(
-            session.query(States.state_id, States.event_id)
+            session.query(States.state_id, States.event_id, States.attributes_id)
             .filter(States.entity_id.in_(excluded_entity_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
@@ -266,8 +505,25 @@ def _purge_filtered_states(
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
     )
+    data_ids: set[int] = (
+        {
+            event.data_id
+            for event in session.query(Events.data_id)
+            .filter(Events.event_id.in_(event_ids))
+            .all()
+            if event.data_id
+        }
+        if event_ids
+        else set()
+    )
     _purge_state_ids(instance, session, set(state_ids))
     _purge_event_ids(session, event_ids)  # type: ignore[arg-type]  # type of event_ids already narrowed to 'list[int]'
+    if unused_data_ids := _select_unused_event_data_ids(session, data_ids):
+        _purge_event_data_ids(instance, session, unused_data_ids)
+    if unused_attributes_ids := _select_unused_attributes_ids(
+        session, {id_ for id_ in attributes_ids if id_ is not None}
+    ):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
 def _purge_filtered_events(
@@ -275,21 +531,31 @@ def _purge_filtered_events(
 ) -> None:
     """Remove filtered events and linked states."""
     events: list[Events] = (
-        session.query(Events.event_id)
+        session.query(Events.event_id, Events.data_id)
         .filter(Events.event_type.in_(excluded_event_types))
         .limit(MAX_ROWS_TO_PURGE)
         .all()
     )
     event_ids: list[int] = [event.event_id for event in events]
+    data_ids: set[int] = {event.data_id for event in events if event.data_id}
     _LOGGER.debug(
         "Selected %s event_ids to remove that should be filtered", len(event_ids)
     )
     states: list[States] = (
-        session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.event_id.in_(event_ids))
+        .all()
     )
     state_ids: set[int] = {state.state_id for state in states}
+    attributes_ids: set[int] = {
+        state.attributes_id for state in states if state.attributes_id
+    }
     _purge_state_ids(instance, session, state_ids)
     _purge_event_ids(session, event_ids)
+    if unused_data_ids := _select_unused_event_data_ids(session, data_ids):
+        _purge_event_data_ids(instance, session, unused_data_ids)
+    if unused_attributes_ids := _select_unused_attributes_ids(session, attributes_ids):
+        _purge_attributes_ids(instance, session, unused_attributes_ids)
 
 
 @retryable_database_job("purge")
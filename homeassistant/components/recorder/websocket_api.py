@@ -26,6 +26,7 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_clear_statistics)
     websocket_api.async_register_command(hass, ws_update_statistics_metadata)
     websocket_api.async_register_command(hass, ws_info)
+    websocket_api.async_register_command(hass, ws_purge_progress)
     websocket_api.async_register_command(hass, ws_backup_start)
     websocket_api.async_register_command(hass, ws_backup_end)
 
@@ -99,6 +100,7 @@ def ws_info(
     instance: Recorder = hass.data[DATA_INSTANCE]
 
     backlog = instance.queue.qsize() if instance and instance.queue else None
+    spilled_backlog = instance.backlog if instance else None
     migration_in_progress = async_migration_in_progress(hass)
     recording = instance.recording if instance else False
     thread_alive = instance.is_alive() if instance else False
@@ -106,6 +108,11 @@ def ws_info(
     recorder_info = {
         "backlog": backlog,
         "max_backlog": MAX_QUEUE_BACKLOG,
+        "spilled_backlog": spilled_backlog.pending_events if spilled_backlog else None,
+        "spill_size": spilled_backlog.spill_size if spilled_backlog else None,
+        "replay_rate": round(spilled_backlog.replay_rate, 1)
+        if spilled_backlog
+        else None,
         "migration_in_progress": migration_in_progress,
         "recording": recording,
         "thread_running": thread_alive,
@@ -113,6 +120,21 @@ def ws_info(
     connection.send_result(msg["id"], recorder_info)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "recorder/purge_progress",
+    }
+)
+@callback
+def ws_purge_progress(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the progress of the running purge, or None if no purge is running."""
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    progress = instance.purge_progress
+    connection.send_result(msg["id"], progress.as_dict() if progress else None)
+
+
 @websocket_api.ws_require_user(only_supervisor=True)
 @websocket_api.websocket_command({vol.Required("type"): "backup/start"})
 @websocket_api.async_response
@@ -6,7 +6,7 @@ from contextlib import contextmanager
 from typing import Any
 
 from homeassistant.components.trace import ActionTrace, async_store_trace
-from homeassistant.components.trace.const import CONF_STORED_TRACES
+from homeassistant.components.trace.const import CONF_COMPACT, CONF_STORED_TRACES
 from homeassistant.core import Context, HomeAssistant
 
 from .const import DOMAIN
@@ -29,6 +29,7 @@ def trace_script(
 ) -> Iterator[ScriptTrace]:
     """Trace execution of a script."""
     trace = ScriptTrace(item_id, config, blueprint_inputs, context)
+    trace.compact = trace_config[CONF_COMPACT]
     async_store_trace(hass, trace, trace_config[CONF_STORED_TRACES])
 
     try:
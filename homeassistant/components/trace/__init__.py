@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import abc
-from collections import deque
+from collections import OrderedDict, deque
 import datetime as dt
 import logging
 from typing import Any
@@ -10,13 +10,14 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import Context, HomeAssistant
+from homeassistant.core import Context, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.trace import (
     TraceElement,
+    estimate_size,
     script_execution_get,
     trace_id_get,
     trace_id_set,
@@ -28,11 +29,14 @@ import homeassistant.util.uuid as uuid_util
 
 from . import websocket_api
 from .const import (
+    CONF_COMPACT,
     CONF_STORED_TRACES,
     DATA_TRACE,
+    DATA_TRACE_MEMORY,
     DATA_TRACE_STORE,
     DATA_TRACES_RESTORED,
     DEFAULT_STORED_TRACES,
+    TRACE_MEMORY_BUDGET,
 )
 from .utils import LimitedSizeDict
 
@@ -43,14 +47,19 @@ DOMAIN = "trace"
 STORAGE_KEY = "trace.saved_traces"
 STORAGE_VERSION = 1
 
+# Rough serialized size of a trace without its elements and config
+TRACE_BASE_SIZE = 512
+
 TRACE_CONFIG_SCHEMA = {
-    vol.Optional(CONF_STORED_TRACES, default=DEFAULT_STORED_TRACES): cv.positive_int
+    vol.Optional(CONF_STORED_TRACES, default=DEFAULT_STORED_TRACES): cv.positive_int,
+    vol.Optional(CONF_COMPACT, default=False): cv.boolean,
 }
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Initialize the trace integration."""
     hass.data[DATA_TRACE] = {}
+    hass.data[DATA_TRACE_MEMORY] = TraceMemory(TRACE_MEMORY_BUDGET)
     websocket_api.async_setup(hass)
     store = Store(hass, STORAGE_VERSION, STORAGE_KEY, encoder=ExtendedJSONEncoder)
     hass.data[DATA_TRACE_STORE] = store
@@ -135,11 +144,20 @@ def async_store_trace(hass, trace, stored_traces):
     """Store a trace if its key is valid."""
     if key := trace.key:
         traces = hass.data[DATA_TRACE]
+        memory: TraceMemory = hass.data[DATA_TRACE_MEMORY]
         if key not in traces:
             traces[key] = LimitedSizeDict(size_limit=stored_traces)
         else:
             traces[key].size_limit = stored_traces
-        traces[key][trace.run_id] = trace
+        key_traces = traces[key]
+        run_ids = list(key_traces)
+        key_traces[trace.run_id] = trace
+        # Forget the traces removed by the limit of stored traces
+        for run_id in run_ids:
+            if run_id not in key_traces:
+                memory.async_remove(key, run_id)
+        memory.async_add(trace)
+        memory.async_evict(traces)
 
 
 def _async_store_restored_trace(hass, trace):
@@ -150,6 +168,63 @@ def _async_store_restored_trace(hass, trace):
         traces[key] = LimitedSizeDict()
     traces[key][trace.run_id] = trace
     traces[key].move_to_end(trace.run_id, last=False)
+    hass.data[DATA_TRACE_MEMORY].async_add(trace, oldest=True)
+
+
+class TraceMemory:
+    """Keep the stored traces within a global memory budget.
+
+    The memory used by a trace is estimated from the elements and variables
+    it recorded, once the trace has finished. When the budget is exceeded, the oldest finished
+    traces are removed, whatever automation or script they belong to.
+    """
+
+    def __init__(self, budget: int) -> None:
+        """Initialize the trace memory."""
+        self.budget = budget
+        self.size = 0
+        # Oldest first
+        self._sizes: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._running: dict[tuple[str, str], BaseTrace] = {}
+
+    @callback
+    def async_add(self, trace: BaseTrace, oldest: bool = False) -> None:
+        """Add a trace, it is measured once it has finished."""
+        trace_id = (trace.key, trace.run_id)
+        if not trace.finished_running:
+            self._running[trace_id] = trace
+            return
+        self._add_size(trace_id, trace)
+        if oldest:
+            self._sizes.move_to_end(trace_id, last=False)
+
+    @callback
+    def async_remove(self, key: str, run_id: str) -> None:
+        """Forget a trace which is no longer stored."""
+        trace_id = (key, run_id)
+        self._running.pop(trace_id, None)
+        self.size -= self._sizes.pop(trace_id, 0)
+
+    @callback
+    def async_evict(self, traces: dict[str, LimitedSizeDict]) -> None:
+        """Remove the oldest finished traces until the budget is respected."""
+        for trace_id, trace in list(self._running.items()):
+            if trace.finished_running:
+                del self._running[trace_id]
+                self._add_size(trace_id, trace)
+
+        while self.size > self.budget and self._sizes:
+            (key, run_id), size = self._sizes.popitem(last=False)
+            self.size -= size
+            if (key_traces := traces.get(key)) is None:
+                continue
+            key_traces.pop(run_id, None)
+
+    def _add_size(self, trace_id: tuple[str, str], trace: BaseTrace) -> None:
+        """Measure a finished trace."""
+        size = trace.estimated_size
+        self.size += size - self._sizes.get(trace_id, 0)
+        self._sizes[trace_id] = size
 
 
 async def async_restore_traces(hass):
@@ -184,12 +259,16 @@ async def async_restore_traces(hass):
                 continue
             _async_store_restored_trace(hass, trace)
 
+    hass.data[DATA_TRACE_MEMORY].async_evict(hass.data[DATA_TRACE])
+
 
 class BaseTrace(abc.ABC):
     """Base container for a script or automation trace."""
 
     context: Context
     key: str
+    run_id: str
+    finished_running = True
 
     def as_dict(self) -> dict[str, Any]:
         """Return an dictionary version of this ActionTrace for saving."""
@@ -206,11 +285,18 @@ class BaseTrace(abc.ABC):
     def as_short_dict(self) -> dict[str, Any]:
         """Return a brief dictionary version of this ActionTrace."""
 
+    @property
+    @abc.abstractmethod
+    def estimated_size(self) -> int:
+        """Return a rough estimate of the serialized size of the trace."""
+
 
 class ActionTrace(BaseTrace):
     """Base container for a script or automation trace."""
 
     _domain: str | None = None
+    # Keep references to the states instead of the states in the trace
+    compact = False
 
     def __init__(
         self,
@@ -250,6 +336,25 @@ class ActionTrace(BaseTrace):
         self._timestamp_finish = dt_util.utcnow()
         self._state = "stopped"
         self._script_execution = script_execution_get()
+        if self.compact and self._trace:
+            for trace_list in self._trace.values():
+                for element in trace_list:
+                    element.compact()
+
+    @property
+    def finished_running(self) -> bool:
+        """Return if the execution has stopped."""
+        return self._state == "stopped"
+
+    @property
+    def estimated_size(self) -> int:
+        """Return a rough estimate of the serialized size of the trace."""
+        size = TRACE_BASE_SIZE + estimate_size(self._config)
+        if self._trace:
+            for trace_list in self._trace.values():
+                for element in trace_list:
+                    size += element.estimated_size
+        return size
 
     def as_extended_dict(self) -> dict[str, Any]:
         """Return an extended dictionary version of this ActionTrace."""
@@ -326,6 +431,13 @@ class RestoredTrace(BaseTrace):
         self.run_id = extended_dict["run_id"]
         self._dict = extended_dict
         self._short_dict = short_dict
+        # Deep enough to reach the attributes of the states in the variables
+        self._estimated_size = TRACE_BASE_SIZE + estimate_size(extended_dict, 7)
+
+    @property
+    def estimated_size(self) -> int:
+        """Return a rough estimate of the serialized size of the trace."""
+        return self._estimated_size
 
     def as_extended_dict(self) -> dict[str, Any]:
         """Return an extended dictionary version of this RestoredTrace."""
@@ -1,7 +1,11 @@
 """Shared constants for script and automation tracing and debugging."""
 
+CONF_COMPACT = "compact"
 CONF_STORED_TRACES = "stored_traces"
 DATA_TRACE = "trace"
+DATA_TRACE_MEMORY = "trace_memory"
 DATA_TRACE_STORE = "trace_store"
 DATA_TRACES_RESTORED = "trace_traces_restored"
 DEFAULT_STORED_TRACES = 5  # Stored traces per script or automation
+# Estimated serialized size of all stored traces, the oldest traces are removed beyond it
+TRACE_MEMORY_BUDGET = 64 * 1024 * 1024
@@ -16,7 +16,7 @@ from homeassistant.const import (
     MATCH_ALL,
     SIGNAL_BOOTSTRAP_INTEGRATONS,
 )
-from homeassistant.core import Context, Event, HomeAssistant, callback
+from homeassistant.core import Context, Event, HomeAssistant, State, callback
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
@@ -33,7 +33,11 @@ from homeassistant.helpers.event import (
 from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.loader import IntegrationNotFound, async_get_integration
-from homeassistant.setup import DATA_SETUP_TIME, async_get_loaded_integrations
+from homeassistant.setup import (
+    DATA_IMPORT_TIME,
+    DATA_SETUP_TIME,
+    async_get_loaded_integrations,
+)
 from homeassistant.util.json import (
     find_paths_unserializable_data,
     format_unserializable_data,
@@ -63,6 +67,7 @@ def async_register_commands(
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
@@ -147,6 +152,83 @@ def handle_subscribe_bootstrap_integrations(
     connection.send_result(msg["id"])
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle subscribe entities command.
+
+    Sends a compressed snapshot of the states followed by only the
+    changed fields of every update.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+
+    @callback
+    def forward_entity_changes(event: Event) -> None:
+        """Forward the state diffs of the entities to websocket."""
+        if not connection.user.permissions.check_entity(
+            event.data["entity_id"], POLICY_READ
+        ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    # Listen before taking the snapshot without awaiting in between
+    # so no state change can be missed
+    states = _async_get_allowed_states(hass, connection)
+    if entity_ids:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED, "entity_id", entity_ids, forward_entity_changes
+        )
+    else:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes
+        )
+    connection.send_result(msg["id"])
+
+    # JSON serialize each state so the snapshot can recover from
+    # states containing unserializable data
+    serialized = []
+    bad_states = []
+    for state in states:
+        if entity_ids and state.entity_id not in entity_ids:
+            continue
+        try:
+            serialized.append(
+                f"{const.JSON_DUMP(state.entity_id)}:"
+                f"{const.JSON_DUMP(messages.compressed_state_dict_add(state))}"
+            )
+        except (ValueError, TypeError):
+            bad_states.append(state)
+
+    if bad_states:
+        connection.logger.error(
+            "Unable to serialize to JSON. Bad data found at %s",
+            format_unserializable_data(
+                find_paths_unserializable_data(
+                    {
+                        state.entity_id: messages.compressed_state_dict_add(state)
+                        for state in bad_states
+                    },
+                    dump=const.JSON_DUMP,
+                )
+            ),
+        )
+
+    response = const.JSON_DUMP(
+        messages.event_message(msg["id"], {messages.ENTITY_EVENT_ADD: "TO_REPLACE"})
+    )
+    connection.send_message(
+        response.replace('"TO_REPLACE"', "{" + ",".join(serialized) + "}")
+    )
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -213,51 +295,54 @@ async def handle_call_service(
         connection.send_error(msg["id"], const.ERR_UNKNOWN_ERROR, str(err))
 
 
+@callback
+def _async_get_allowed_states(
+    hass: HomeAssistant, connection: ActiveConnection
+) -> list[State]:
+    """Return the states the user of the connection is allowed to read."""
+    if connection.user.permissions.access_all_entities("read"):
+        return hass.states.async_all()
+    entity_perm = connection.user.permissions.check_entity
+    return [
+        state
+        for state in hass.states.async_all()
+        if entity_perm(state.entity_id, "read")
+    ]
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "get_states"})
 def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
-    if connection.user.permissions.access_all_entities("read"):
-        states = hass.states.async_all()
-    else:
-        entity_perm = connection.user.permissions.check_entity
-        states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
+    states = _async_get_allowed_states(hass, connection)
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
-    # to succeed for the UI to show.
-    response = messages.result_message(msg["id"], states)
-    try:
-        connection.send_message(const.JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
+    # to succeed for the UI to show. The states cache their JSON so it is
+    # shared with the other consumers of the same state.
+    serialized = []
+    has_bad_data = False
+    for state in states:
+        try:
+            serialized.append(state.as_json())
+        except (ValueError, TypeError):
+            has_bad_data = True
+
+    if has_bad_data:
         connection.logger.error(
             "Unable to serialize to JSON. Bad data found at %s",
             format_unserializable_data(
-                find_paths_unserializable_data(response, dump=const.JSON_DUMP)
+                find_paths_unserializable_data(
+                    messages.result_message(msg["id"], states),
+                    dump=const.JSON_DUMP,
+                )
             ),
         )
-    del response
-
-    # If we can't serialize, we'll filter out unserializable states
-    serialized = []
-    for state in states:
-        try:
-            serialized.append(const.JSON_DUMP(state))
-        except (ValueError, TypeError):
-            # Error is already logged above
-            pass
 
-    # We now have partially serialized states. Craft some JSON.
-    response2 = const.JSON_DUMP(messages.result_message(msg["id"], ["TO_REPLACE"]))
-    response2 = response2.replace('"TO_REPLACE"', ", ".join(serialized))
-    connection.send_message(response2)
+    response = const.JSON_DUMP(messages.result_message(msg["id"], ["TO_REPLACE"]))
+    connection.send_message(response.replace('"TO_REPLACE"', ",".join(serialized)))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -315,15 +400,26 @@ async def handle_integration_setup_info(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle integrations command."""
-    connection.send_result(
-        msg["id"],
-        [
-            {"domain": integration, "seconds": timedelta.total_seconds()}
-            for integration, timedelta in cast(
-                dict[str, dt.timedelta], hass.data[DATA_SETUP_TIME]
-            ).items()
-        ],
-    )
+    import_seconds: dict[str, float] = {}
+    for module, import_time in cast(
+        dict[str, dt.timedelta], hass.data.get(DATA_IMPORT_TIME, {})
+    ).items():
+        domain = module.partition(".")[0]
+        import_seconds[domain] = (
+            import_seconds.get(domain, 0) + import_time.total_seconds()
+        )
+    setup_info = []
+    for integration, timedelta in cast(
+        dict[str, dt.timedelta], hass.data[DATA_SETUP_TIME]
+    ).items():
+        info: dict[str, Any] = {
+            "domain": integration,
+            "seconds": timedelta.total_seconds(),
+        }
+        if integration in import_seconds:
+            info["import_seconds"] = import_seconds[integration]
+        setup_info.append(info)
+    connection.send_result(msg["id"], setup_info)
 
 
 @callback
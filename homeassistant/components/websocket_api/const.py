@@ -4,12 +4,10 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Awaitable, Callable
 from concurrent import futures
-from functools import partial
-import json
 from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSON_DUMP  # noqa: F401
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection  # noqa: F401
@@ -52,7 +50,3 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
-
-JSON_DUMP: Final = partial(
-    json.dumps, cls=JSONEncoder, allow_nan=False, separators=(",", ":")
-)
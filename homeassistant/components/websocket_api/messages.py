@@ -7,7 +7,15 @@ from typing import Any, Final
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.const import (
+    COMPRESSED_STATE_ATTRIBUTES,
+    COMPRESSED_STATE_CONTEXT,
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -31,6 +39,14 @@ BASE_COMMAND_MESSAGE_SCHEMA: Final = vol.Schema({vol.Required("id"): cv.positive
 IDEN_TEMPLATE: Final = "__IDEN__"
 IDEN_JSON_TEMPLATE: Final = '"__IDEN__"'
 
+# Keys of the entity subscription events
+ENTITY_EVENT_ADD: Final = "a"
+ENTITY_EVENT_REMOVE: Final = "r"
+ENTITY_EVENT_CHANGE: Final = "c"
+
+STATE_DIFF_ADDITIONS: Final = "+"
+STATE_DIFF_REMOVALS: Final = "-"
+
 
 def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     """Return a success result message."""
@@ -71,9 +87,115 @@ def _cached_event_message(event: Event) -> str:
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
+    if event.event_type == EVENT_STATE_CHANGED:
+        try:
+            return _state_changed_event_message_json(event)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            pass
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
+def _state_changed_event_message_json(event: Event) -> str:
+    """Serialize a state_changed event message reusing the JSON of the states."""
+    data = event.data
+    if len(data) != 3:
+        raise KeyError("Unexpected state_changed event data")
+    old_state: State | None = data["old_state"]
+    new_state: State | None = data["new_state"]
+    event_dict = event.as_dict()
+    return (
+        f'{{"id":{IDEN_JSON_TEMPLATE},"type":"event","event":{{'
+        f'"event_type":{const.JSON_DUMP(event.event_type)},'
+        f'"data":{{"entity_id":{const.JSON_DUMP(data["entity_id"])},'
+        f'"old_state":{old_state.as_json() if old_state else "null"},'
+        f'"new_state":{new_state.as_json() if new_state else "null"}}},'
+        f'"origin":{const.JSON_DUMP(event_dict["origin"])},'
+        f'"time_fired":{const.JSON_DUMP(event_dict["time_fired"])},'
+        f'"context":{const.JSON_DUMP(event_dict["context"])}}}}}'
+    )
+
+
+def cached_state_diff_message(iden: int, event: Event) -> str:
+    """Return a compressed state diff message for a state_changed event.
+
+    Serialize to json once per message.
+    """
+    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_state_diff_message(event: Event) -> str:
+    """Cache and serialize the state diff of the event to json.
+
+    The IDEN_TEMPLATE is used which will be replaced
+    with the actual iden in cached_state_diff_message
+    """
+    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+
+
+def _state_diff_event(event: Event) -> dict[str, Any]:
+    """Convert a state_changed event to the entity subscription format."""
+    if (new_state := event.data["new_state"]) is None:
+        return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
+    if (old_state := event.data["old_state"]) is None:
+        return {
+            ENTITY_EVENT_ADD: {
+                new_state.entity_id: compressed_state_dict_add(new_state)
+            }
+        }
+    return {
+        ENTITY_EVENT_CHANGE: {new_state.entity_id: _state_diff(old_state, new_state)}
+    }
+
+
+def _state_diff(old_state: State, new_state: State) -> dict[str, Any]:
+    """Return only the fields of the new state that differ from the old state."""
+    additions: dict[str, Any] = {}
+    diff: dict[str, Any] = {STATE_DIFF_ADDITIONS: additions}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+    if old_state.context != new_state.context:
+        additions[COMPRESSED_STATE_CONTEXT] = _compressed_context(new_state)
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    for key, value in new_attributes.items():
+        if key not in old_attributes or old_attributes[key] != value:
+            additions.setdefault(COMPRESSED_STATE_ATTRIBUTES, {})[key] = value
+    if removed := [key for key in old_attributes if key not in new_attributes]:
+        diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: removed}
+    return diff
+
+
+def _compressed_context(state: State) -> str | dict[str, Any]:
+    """Return the context of a state, only the id if it has no parent or user."""
+    context = state.context
+    if context.parent_id is None and context.user_id is None:
+        return context.id
+    return context.as_dict()
+
+
+def compressed_state_dict_add(state: State) -> dict[str, Any]:
+    """Build a compressed dict of a state for adds.
+
+    Omits the last_updated when it is the same as last_changed
+    and the context details when there is no parent or user.
+    Timestamps are sent as epoch floats.
+    """
+    compressed_state: dict[str, Any] = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: state.attributes,
+        COMPRESSED_STATE_CONTEXT: _compressed_context(state),
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_changed != state.last_updated:
+        compressed_state[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed_state
+
+
 def message_to_json(message: dict[str, Any]) -> str:
     """Serialize a websocket message to json."""
     try:
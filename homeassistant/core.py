@@ -19,6 +19,7 @@ import datetime
 import enum
 import functools
 import logging
+import math
 import os
 import pathlib
 import re
@@ -76,6 +77,7 @@ from .exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from .helpers.json import JSON_DUMP
 from .util import dt as dt_util, location, uuid as uuid_util
 from .util.async_ import (
     fire_coroutine_threadsafe,
@@ -703,7 +705,7 @@ class Context:
 
     user_id: str = attr.ib(default=None)
     parent_id: str | None = attr.ib(default=None)
-    id: str = attr.ib(factory=uuid_util.random_uuid_hex)
+    id: str = attr.ib(factory=uuid_util.ulid_hex)
 
     def as_dict(self) -> dict[str, str | None]:
         """Return a dictionary representation of the context."""
@@ -791,6 +793,11 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        # event_type -> data key -> data value -> listeners
+        self._keyed_listeners: dict[
+            str, dict[str, dict[str, list[_FilterableJob]]]
+        ] = {}
+        self._keyed_listener_count: dict[str, int] = {}
         self._hass = hass
 
     @callback
@@ -799,7 +806,10 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, count in self._keyed_listener_count.items():
+            listeners[event_type] = listeners.get(event_type, 0) + count
+        return listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -836,21 +846,39 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._listeners.get(event_type)
+        keyed_listeners = self._keyed_listeners.get(event_type)
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        match_all_listeners = None
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            match_all_listeners = self._listeners.get(MATCH_ALL)
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
+        if match_all_listeners is not None:
+            self._async_run_listeners(match_all_listeners, event)
+        if listeners is not None:
+            self._async_run_listeners(listeners, event)
+        if keyed_listeners is None:
             return
+        # Route on the data values with a dict lookup instead of
+        # running an event_filter for every listener of the event_type
+        for data_key, value_listeners in keyed_listeners.items():
+            value = event.data.get(data_key)
+            if isinstance(value, str) and (
+                matched_listeners := value_listeners.get(value)
+            ):
+                self._async_run_listeners(matched_listeners, event)
 
+    @callback
+    def _async_run_listeners(
+        self, listeners: list[_FilterableJob], event: Event
+    ) -> None:
+        """Schedule the listeners whose event_filter accepts the event."""
         for job, event_filter in listeners:
             if event_filter is not None:
                 try:
@@ -917,6 +945,88 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        data_key: str,
+        data_values: str | Iterable[str],
+        listener: Callable[[Event], None | Awaitable[None]],
+        event_filter: Callable[[Event], bool] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with specific data values.
+
+        The listener only runs for events of event_type where the value of
+        data_key in the event data is one of data_values, for example
+        EVENT_STATE_CHANGED events of some entity_ids or EVENT_CALL_SERVICE
+        events of a domain. The events are routed with a dict lookup, which
+        is cheaper than an event_filter when there are many listeners.
+
+        This method must be run in the event loop.
+        """
+        if event_filter is not None and not is_callback(event_filter):
+            raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        if isinstance(data_values, str):
+            data_values = [data_values]
+        else:
+            data_values = list(dict.fromkeys(data_values))
+        if not data_values:
+            # The listener would never run
+            return lambda: None
+        filterable_job = _FilterableJob(HassJob(listener), event_filter)
+
+        value_listeners = self._keyed_listeners.setdefault(event_type, {}).setdefault(
+            data_key, {}
+        )
+        for data_value in data_values:
+            value_listeners.setdefault(data_value, []).append(filterable_job)
+        self._keyed_listener_count[event_type] = (
+            self._keyed_listener_count.get(event_type, 0) + 1
+        )
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_keyed_listener(
+                event_type, data_key, data_values, filterable_job
+            )
+
+        return remove_listener
+
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        event_type: str,
+        data_key: str,
+        data_values: Iterable[str],
+        filterable_job: _FilterableJob,
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        keyed_listeners = self._keyed_listeners.get(event_type, {})
+        value_listeners = keyed_listeners.get(data_key, {})
+        # Check all the values first to not remove the listener partially
+        if any(
+            filterable_job not in value_listeners.get(data_value, ())
+            for data_value in data_values
+        ):
+            _LOGGER.error("Unable to remove unknown job listener %s", filterable_job)
+            return
+
+        for data_value in data_values:
+            job_listeners = value_listeners[data_value]
+            job_listeners.remove(filterable_job)
+            if not job_listeners:
+                del value_listeners[data_value]
+        if not value_listeners:
+            del keyed_listeners[data_key]
+        if not keyed_listeners:
+            del self._keyed_listeners[event_type]
+        self._keyed_listener_count[event_type] -= 1
+        if not self._keyed_listener_count[event_type]:
+            del self._keyed_listener_count[event_type]
+
     def listen_once(
         self, event_type: str, listener: Callable[[Event], None | Awaitable[None]]
     ) -> CALLBACK_TYPE:
@@ -1024,6 +1134,8 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
+        "_attributes_json",
     ]
 
     def __init__(
@@ -1059,6 +1171,8 @@ class State:
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: ReadOnlyDict[str, Collection[Any]] | None = None
+        self._as_json: str | None = None
+        self._attributes_json: str | None = None
 
     @property
     def name(self) -> str:
@@ -1093,6 +1207,38 @@ class State:
             )
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return the State as JSON.
+
+        Async friendly.
+
+        The result is cached so the state is only serialized once, no matter
+        how many consumers need it. Equal to JSON_DUMP(state.as_dict()).
+        Raises ValueError or TypeError if the attributes are not serializable.
+        """
+        if self._as_json is None:
+            as_dict = self.as_dict()
+            self._as_json = (
+                f'{{"entity_id":{JSON_DUMP(self.entity_id)},'
+                f'"state":{JSON_DUMP(self.state)},'
+                f'"attributes":{self.attributes_json()},'
+                f'"last_changed":"{as_dict["last_changed"]}",'
+                f'"last_updated":"{as_dict["last_updated"]}",'
+                f'"context":{JSON_DUMP(as_dict["context"])}}}'
+            )
+        return self._as_json
+
+    def attributes_json(self) -> str:
+        """Return the attributes of the State as JSON.
+
+        Async friendly.
+
+        Raises ValueError or TypeError if the attributes are not serializable.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = JSON_DUMP(self.attributes)
+        return self._attributes_json
+
     @classmethod
     def from_dict(cls: type[_StateT], json_dict: dict[str, Any]) -> _StateT | None:
         """Initialize a state from a dict.
@@ -1152,6 +1298,8 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: dict[str, State] = {}
+        # The states that are numbers, by domain and entity_id
+        self._numeric_states: dict[str, dict[str, float]] = {}
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1201,6 +1349,38 @@ class StateMachine:
             [None for state in self._states.values() if state.domain in domain_filter]
         )
 
+    @callback
+    def async_numeric_states(self, domain: str) -> Mapping[str, float]:
+        """Return the states of a domain that are numbers by entity_id.
+
+        The mapping is kept up to date and must not be modified.
+
+        This method must be run in the event loop.
+        """
+        return self._numeric_states.get(domain.lower(), {})
+
+    @callback
+    def _async_update_numeric_state(
+        self, entity_id: str, domain: str, state: str | None
+    ) -> None:
+        """Update the numeric state of an entity."""
+        value: float | None = None
+        if state is not None:
+            try:
+                value = float(state)
+            except ValueError:
+                pass
+            else:
+                if not math.isfinite(value):
+                    value = None
+
+        if value is not None:
+            if (numeric_states := self._numeric_states.get(domain)) is None:
+                numeric_states = self._numeric_states[domain] = {}
+            numeric_states[entity_id] = value
+        elif (numeric_states := self._numeric_states.get(domain)) is not None:
+            numeric_states.pop(entity_id, None)
+
     def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
         """Create a list of all states."""
         return run_callback_threadsafe(
@@ -1266,6 +1446,7 @@ class StateMachine:
         if old_state is None:
             return False
 
+        self._async_update_numeric_state(entity_id, old_state.domain, None)
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1370,6 +1551,8 @@ class StateMachine:
             old_state is None,
         )
         self._states[entity_id] = state
+        if old_state is None or old_state.state != new_state:
+            self._async_update_numeric_state(entity_id, state.domain, new_state)
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": state},
@@ -47,6 +47,9 @@ ORPHANED_DEVICE_KEEP_SECONDS = 86400 * 30
 class _DeviceIndex(NamedTuple):
     identifiers: dict[tuple[str, str], str]
     connections: dict[tuple[str, str], str]
+    # Dicts are used as ordered sets of device ids
+    area_ids: dict[str, dict[str, None]]
+    config_entries: dict[str, dict[str, None]]
 
 
 class DeviceEntryDisabler(StrEnum):
@@ -258,6 +261,24 @@ class DeviceRegistry:
             return None
         return self.deleted_devices[device_id]
 
+    @callback
+    def async_entries_for_area(self, area_id: str) -> list[DeviceEntry]:
+        """Return the devices in an area."""
+        return [
+            self.devices[device_id]
+            for device_id in self._registered_index.area_ids.get(area_id, ())
+        ]
+
+    @callback
+    def async_entries_for_config_entry(self, config_entry_id: str) -> list[DeviceEntry]:
+        """Return the devices of a config entry."""
+        return [
+            self.devices[device_id]
+            for device_id in self._registered_index.config_entries.get(
+                config_entry_id, ()
+            )
+        ]
+
     def _add_device(self, device: DeviceEntry | DeletedDeviceEntry) -> None:
         """Add a device and index it."""
         if isinstance(device, DeletedDeviceEntry):
@@ -285,13 +306,17 @@ class DeviceRegistry:
         self.devices[new_device.id] = new_device
 
         devices_index = self._registered_index
-        _remove_device_from_index(devices_index, old_device)
+        _remove_device_from_index(devices_index, old_device, new_device)
         _add_device_to_index(devices_index, new_device)
 
     def _clear_index(self) -> None:
         """Clear the index."""
-        self._registered_index = _DeviceIndex(identifiers={}, connections={})
-        self._deleted_index = _DeviceIndex(identifiers={}, connections={})
+        self._registered_index = _DeviceIndex(
+            identifiers={}, connections={}, area_ids={}, config_entries={}
+        )
+        self._deleted_index = _DeviceIndex(
+            identifiers={}, connections={}, area_ids={}, config_entries={}
+        )
 
     def _rebuild_index(self) -> None:
         """Create the index after loading devices."""
@@ -640,7 +665,7 @@ class DeviceRegistry:
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
         now_time = time.time()
-        for device in list(self.devices.values()):
+        for device in self.async_entries_for_config_entry(config_entry_id):
             self.async_update_device(device.id, remove_config_entry_id=config_entry_id)
         for deleted_device in list(self.deleted_devices.values()):
             config_entries = deleted_device.config_entries
@@ -681,9 +706,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self.async_update_device(dev_id, area_id=None)
+        for device in self.async_entries_for_area(area_id):
+            self.async_update_device(device.id, area_id=None)
 
 
 @callback
@@ -711,7 +735,7 @@ async def async_get_registry(hass: HomeAssistant) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> list[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    return registry.async_entries_for_area(area_id)
 
 
 @callback
@@ -719,11 +743,7 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> list[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    return registry.async_entries_for_config_entry(config_entry_id)
 
 
 @callback
@@ -871,16 +891,47 @@ def _add_device_to_index(
         devices_index.identifiers[identifier] = device.id
     for connection in device.connections:
         devices_index.connections[connection] = device.id
+    if not isinstance(device, DeviceEntry):
+        return
+    if device.area_id is not None:
+        devices_index.area_ids.setdefault(device.area_id, {})[device.id] = None
+    for config_entry_id in device.config_entries:
+        devices_index.config_entries.setdefault(config_entry_id, {})[device.id] = None
 
 
 def _remove_device_from_index(
     devices_index: _DeviceIndex,
     device: DeviceEntry | DeletedDeviceEntry,
+    new_device: DeviceEntry | None = None,
 ) -> None:
-    """Remove a device from the index."""
+    """Remove a device from the index.
+
+    When the device is updated, the area and config entries it keeps are
+    left in place to keep the order of the index.
+    """
     for identifier in device.identifiers:
         if identifier in devices_index.identifiers:
             del devices_index.identifiers[identifier]
     for connection in device.connections:
         if connection in devices_index.connections:
             del devices_index.connections[connection]
+    if not isinstance(device, DeviceEntry):
+        return
+    if device.area_id is not None and (
+        new_device is None or new_device.area_id != device.area_id
+    ):
+        _remove_device_id(devices_index.area_ids, device.area_id, device.id)
+    for config_entry_id in device.config_entries:
+        if new_device is None or config_entry_id not in new_device.config_entries:
+            _remove_device_id(devices_index.config_entries, config_entry_id, device.id)
+
+
+def _remove_device_id(
+    index: dict[str, dict[str, None]], key: str, device_id: str
+) -> None:
+    """Remove a device id from an area or config entry index."""
+    if (device_ids := index.get(key)) is None:
+        return
+    device_ids.pop(device_id, None)
+    if not device_ids:
+        del index[key]
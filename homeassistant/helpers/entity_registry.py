@@ -185,9 +185,12 @@ class EntityRegistryStore(storage.Store):
 class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
     """Container for entity registry items, maps entity_id -> entry.
 
-    Maintains two additional indexes:
+    Maintains additional indexes:
     - id -> entry
     - (domain, platform, unique_id) -> entry
+    - device_id -> entity_ids
+    - area_id -> entity_ids
+    - config_entry_id -> entity_ids
     """
 
     def __init__(self) -> None:
@@ -195,24 +198,62 @@ class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
         super().__init__()
         self._entry_ids: dict[str, RegistryEntry] = {}
         self._index: dict[tuple[str, str, str], str] = {}
+        # Dicts are used as ordered sets of entity_ids
+        self._device_id_index: dict[str, dict[str, None]] = {}
+        self._area_id_index: dict[str, dict[str, None]] = {}
+        self._config_entry_id_index: dict[str, dict[str, None]] = {}
 
     def __setitem__(self, key: str, entry: RegistryEntry) -> None:
         """Add an item."""
-        if key in self:
-            old_entry = self[key]
+        old_entry = self.data.get(key)
+        if old_entry is not None:
             del self._entry_ids[old_entry.id]
             del self._index[(old_entry.domain, old_entry.platform, old_entry.unique_id)]
         super().__setitem__(key, entry)
         self._entry_ids.__setitem__(entry.id, entry)
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        for index, attribute in (
+            (self._device_id_index, "device_id"),
+            (self._area_id_index, "area_id"),
+            (self._config_entry_id_index, "config_entry_id"),
+        ):
+            value = getattr(entry, attribute)
+            if old_entry is not None:
+                old_value = getattr(old_entry, attribute)
+                if old_value == value:
+                    # Keep the order of the index when nothing changed
+                    continue
+                _remove_from_index(index, old_value, key)
+            if value is not None:
+                index.setdefault(value, {})[key] = None
 
     def __delitem__(self, key: str) -> None:
         """Remove an item."""
         entry = self[key]
         self._entry_ids.__delitem__(entry.id)
         self._index.__delitem__((entry.domain, entry.platform, entry.unique_id))
+        _remove_from_index(self._device_id_index, entry.device_id, key)
+        _remove_from_index(self._area_id_index, entry.area_id, key)
+        _remove_from_index(self._config_entry_id_index, entry.config_entry_id, key)
         super().__delitem__(key)
 
+    def get_entries_for_device_id(self, device_id: str) -> list[RegistryEntry]:
+        """Get entries for a device."""
+        return [self.data[key] for key in self._device_id_index.get(device_id, ())]
+
+    def get_entries_for_area_id(self, area_id: str) -> list[RegistryEntry]:
+        """Get entries for an area."""
+        return [self.data[key] for key in self._area_id_index.get(area_id, ())]
+
+    def get_entries_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> list[RegistryEntry]:
+        """Get entries for a config entry."""
+        return [
+            self.data[key]
+            for key in self._config_entry_id_index.get(config_entry_id, ())
+        ]
+
     def get_entity_id(self, key: tuple[str, str, str]) -> str | None:
         """Get entity_id from (domain, platform, unique_id)."""
         return self._index.get(key)
@@ -222,6 +263,17 @@ class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
         return self._entry_ids.get(key)
 
 
+def _remove_from_index(
+    index: dict[str, dict[str, None]], value: str | None, key: str
+) -> None:
+    """Remove an entity_id from a secondary index."""
+    if value is None or (keys := index.get(value)) is None:
+        return
+    keys.pop(key, None)
+    if not keys:
+        del index[value]
+
+
 class EntityRegistry:
     """Class to hold a registry of entities."""
 
@@ -706,19 +758,14 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
-            self.async_remove(entity_id)
+        for entry in self.entities.get_entries_for_config_entry_id(config_entry):
+            self.async_remove(entry.entity_id)
 
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if area_id == entry.area_id:
-                self.async_update_entity(entity_id, area_id=None)
+        for entry in self.entities.get_entries_for_area_id(area_id):
+            self.async_update_entity(entry.entity_id, area_id=None)
 
 
 @callback
@@ -750,9 +797,8 @@ def async_entries_for_device(
     """Return entries that match a device."""
     return [
         entry
-        for entry in registry.entities.values()
-        if entry.device_id == device_id
-        and (not entry.disabled_by or include_disabled_entities)
+        for entry in registry.entities.get_entries_for_device_id(device_id)
+        if not entry.disabled_by or include_disabled_entities
     ]
 
 
@@ -761,7 +807,7 @@ def async_entries_for_area(
     registry: EntityRegistry, area_id: str
 ) -> list[RegistryEntry]:
     """Return entries that match an area."""
-    return [entry for entry in registry.entities.values() if entry.area_id == area_id]
+    return registry.entities.get_entries_for_area_id(area_id)
 
 
 @callback
@@ -769,11 +815,7 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> list[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    return registry.entities.get_entries_for_config_entry_id(config_entry_id)
 
 
 @callback
@@ -913,10 +955,7 @@ async def async_migrate_entries(
     """Migrator of unique IDs."""
     ent_reg = await async_get_registry(hass)
 
-    for entry in ent_reg.entities.values():
-        if entry.config_entry_id != config_entry_id:
-            continue
-
+    for entry in async_entries_for_config_entry(ent_reg, config_entry_id):
         updates = entry_callback(entry)
 
         if updates is not None:
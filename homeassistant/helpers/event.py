@@ -1596,14 +1596,14 @@ def _render_infos_to_track_states(render_infos: Iterable[RenderInfo]) -> TrackSt
 def _event_triggers_rerender(event: Event, info: RenderInfo) -> bool:
     """Determine if a template should be re-rendered from an event."""
     entity_id = cast(str, event.data.get(ATTR_ENTITY_ID))
+    new_state = event.data.get("new_state")
+    old_state = event.data.get("old_state")
 
     if info.filter(entity_id):
-        return True
+        # Skip changes of state fields and attributes the template did not read
+        return info.filter_state_change(entity_id, old_state, new_state)
 
-    if (
-        event.data.get("new_state") is not None
-        and event.data.get("old_state") is not None
-    ):
+    if new_state is not None and old_state is not None:
         return False
 
     return bool(info.filter_lifecycle(entity_id))
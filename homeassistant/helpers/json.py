@@ -1,7 +1,8 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
 import datetime
+from functools import partial
 import json
-from typing import Any
+from typing import Any, Final
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -22,6 +23,11 @@ class JSONEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, o)
 
 
+JSON_DUMP: Final = partial(
+    json.dumps, cls=JSONEncoder, allow_nan=False, separators=(",", ":")
+)
+
+
 class ExtendedJSONEncoder(JSONEncoder):
     """JSONEncoder that supports Home Assistant objects and falls back to repr(o)."""
 
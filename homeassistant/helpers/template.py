@@ -10,8 +10,11 @@ from contextlib import contextmanager, suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from functools import partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter
 import random
@@ -19,9 +22,10 @@ import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import threading
+from types import CodeType
 from typing import Any, cast
 from urllib.parse import urlencode as urllib_urlencode
-import weakref
 
 import jinja2
 from jinja2 import pass_context, pass_environment
@@ -30,12 +34,14 @@ from jinja2.utils import Namespace
 import voluptuous as vol
 
 from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
     ATTR_ENTITY_ID,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
     LENGTH_METERS,
     STATE_UNKNOWN,
+    __version__,
 )
 from homeassistant.core import (
     HomeAssistant,
@@ -56,6 +62,7 @@ from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util.thread import ThreadWithException
 
 from . import area_registry, device_registry, entity_registry, location as loc_helper
+from .storage import Store
 from .typing import TemplateVarsType
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -68,6 +75,14 @@ _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
+_BYTECODE_CACHE = "template.bytecode_cache"
+
+# Compiled code is shared by all templates with the same source
+COMPILED_CACHE_SIZE = 4096
+BYTECODE_CACHE_SIZE = 4096
+BYTECODE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_STORAGE_VERSION = 1
+BYTECODE_SAVE_DELAY = 60
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -236,6 +251,11 @@ class RenderInfo:
         self.domains: collections.abc.Set[str] = set()
         self.domains_lifecycle: collections.abc.Set[str] = set()
         self.entities: collections.abc.Set[str] = set()
+        # The state fields and attributes read of the entities, entities
+        # collected without them re-render on any change
+        self.entity_fields: dict[str, set[str]] = {}
+        self.entity_attributes: dict[str, set[str]] = {}
+        self.entities_all_fields: collections.abc.Set[str] = set()
         self.rate_limit: timedelta | None = None
         self.has_time = False
 
@@ -253,6 +273,59 @@ class RenderInfo:
         """Template should re-render if the entity state changes when we match specific entities."""
         return entity_id in self.entities
 
+    def filter_state_change(
+        self, entity_id: str, old_state: State | None, new_state: State | None
+    ) -> bool:
+        """Template should re-render if a state field or attribute it read changed."""
+        if (
+            old_state is None
+            or new_state is None
+            or entity_id in self.entities_all_fields
+            or self.all_states
+            or (self.domains and split_entity_id(entity_id)[0] in self.domains)
+        ):
+            return True
+
+        fields = self.entity_fields.get(entity_id)
+        attributes = self.entity_attributes.get(entity_id)
+        if fields is None and attributes is None:
+            return True
+
+        if fields:
+            for field in fields:
+                if getattr(old_state, field) != getattr(new_state, field):
+                    return True
+
+        if attributes:
+            old_attributes = old_state.attributes
+            new_attributes = new_state.attributes
+            for attribute in attributes:
+                if old_attributes.get(attribute) != new_attributes.get(attribute):
+                    return True
+
+        return False
+
+    def _collect_field(self, entity_id: str, field: str) -> None:
+        """Collect a field of the state of an entity."""
+        self.entities.add(entity_id)  # type: ignore[attr-defined]
+        if (fields := self.entity_fields.get(entity_id)) is None:
+            self.entity_fields[entity_id] = {field}
+        else:
+            fields.add(field)
+
+    def _collect_attribute(self, entity_id: str, attribute: str) -> None:
+        """Collect an attribute of the state of an entity."""
+        self.entities.add(entity_id)  # type: ignore[attr-defined]
+        if (attributes := self.entity_attributes.get(entity_id)) is None:
+            self.entity_attributes[entity_id] = {attribute}
+        else:
+            attributes.add(attribute)
+
+    def _collect_all_fields(self, entity_id: str) -> None:
+        """Collect the whole state of an entity."""
+        self.entities.add(entity_id)  # type: ignore[attr-defined]
+        self.entities_all_fields.add(entity_id)  # type: ignore[attr-defined]
+
     def _filter_lifecycle_domains(self, entity_id: str) -> bool:
         """Template should re-render if the entity is added or removed with domains watched."""
         return split_entity_id(entity_id)[0] in self.domains_lifecycle
@@ -270,6 +343,7 @@ class RenderInfo:
 
     def _freeze_sets(self) -> None:
         self.entities = frozenset(self.entities)
+        self.entities_all_fields = frozenset(self.entities_all_fields)
         self.domains = frozenset(self.domains)
         self.domains_lifecycle = frozenset(self.domains_lifecycle)
 
@@ -550,7 +624,8 @@ class Template:
     ):
         """Render template with value exposed.
 
-        If valid JSON will expose value_json too.
+        If valid JSON will expose value_json too, unless the caller already
+        parsed it and passed it as variable.
 
         This method must be run in the event loop.
         """
@@ -563,8 +638,9 @@ class Template:
         variables = dict(variables or {})
         variables["value"] = value
 
-        with suppress(ValueError, TypeError):
-            variables["value_json"] = json.loads(value)
+        if "value_json" not in variables:
+            with suppress(ValueError, TypeError):
+                variables["value_json"] = json.loads(value)
 
         try:
             return _render_with_context(
@@ -730,9 +806,17 @@ class TemplateState(State):
         self._state = state
         self._collect = collect
 
-    def _collect_state(self) -> None:
+    def _collect_state(self, field: str) -> None:
+        if self._collect and _RENDER_INFO in self._hass.data:
+            self._hass.data[_RENDER_INFO]._collect_field(self._state.entity_id, field)
+
+    def _get_attribute(self, name: str) -> Any:
+        """Return a single attribute and only collect that attribute."""
         if self._collect and _RENDER_INFO in self._hass.data:
-            self._hass.data[_RENDER_INFO].entities.add(self._state.entity_id)
+            self._hass.data[_RENDER_INFO]._collect_attribute(
+                self._state.entity_id, name
+            )
+        return self._state.attributes.get(name)
 
     # Jinja will try __getitem__ first and it avoids the need
     # to call is_safe_attribute
@@ -741,7 +825,9 @@ class TemplateState(State):
         if item in _COLLECTABLE_STATE_ATTRIBUTES:
             # _collect_state inlined here for performance
             if self._collect and _RENDER_INFO in self._hass.data:
-                self._hass.data[_RENDER_INFO].entities.add(self._state.entity_id)
+                self._hass.data[_RENDER_INFO]._collect_field(
+                    self._state.entity_id, item
+                )
             return getattr(self._state, item)
         if item == "entity_id":
             return self._state.entity_id
@@ -760,61 +846,62 @@ class TemplateState(State):
     @property
     def state(self):
         """Wrap State.state."""
-        self._collect_state()
+        self._collect_state("state")
         return self._state.state
 
     @property
     def attributes(self):
         """Wrap State.attributes."""
-        self._collect_state()
+        self._collect_state("attributes")
         return self._state.attributes
 
     @property
     def last_changed(self):
         """Wrap State.last_changed."""
-        self._collect_state()
+        self._collect_state("last_changed")
         return self._state.last_changed
 
     @property
     def last_updated(self):
         """Wrap State.last_updated."""
-        self._collect_state()
+        self._collect_state("last_updated")
         return self._state.last_updated
 
     @property
     def context(self):
         """Wrap State.context."""
-        self._collect_state()
+        self._collect_state("context")
         return self._state.context
 
     @property
     def domain(self):
         """Wrap State.domain."""
-        self._collect_state()
+        self._collect_state("domain")
         return self._state.domain
 
     @property
     def object_id(self):
         """Wrap State.object_id."""
-        self._collect_state()
+        self._collect_state("object_id")
         return self._state.object_id
 
     @property
     def name(self):
         """Wrap State.name."""
-        self._collect_state()
+        self._collect_state("name")
         return self._state.name
 
     @property
     def state_with_unit(self) -> str:
         """Return the state concatenated with the unit if available."""
-        self._collect_state()
-        unit = self._state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        self._collect_state("state")
+        unit = self._get_attribute(ATTR_UNIT_OF_MEASUREMENT)
         return f"{self._state.state} {unit}" if unit else self._state.state
 
     def __eq__(self, other: Any) -> bool:
         """Ensure we collect on equality check."""
-        self._collect_state()
+        if self._collect and _RENDER_INFO in self._hass.data:
+            self._hass.data[_RENDER_INFO]._collect_all_fields(self._state.entity_id)
         return self._state.__eq__(other)
 
     def __repr__(self) -> str:
@@ -824,7 +911,7 @@ class TemplateState(State):
 
 def _collect_state(hass: HomeAssistant, entity_id: str) -> None:
     if (entity_collect := hass.data.get(_RENDER_INFO)) is not None:
-        entity_collect.entities.add(entity_id)
+        entity_collect._collect_all_fields(entity_id)
 
 
 def _state_generator(hass: HomeAssistant, domain: str | None) -> Generator:
@@ -1245,6 +1332,100 @@ def distance(hass, *args):
     )
 
 
+def _numeric_states(
+    hass: HomeAssistant,
+    domain: str,
+    area_id_or_name: str | None = None,
+    device_class: str | None = None,
+) -> list[float]:
+    """Return the numeric states of a domain, optionally of an area or device class.
+
+    The values come from the numeric index of the state machine, so only
+    the domain is collected instead of every state.
+    """
+    if not valid_entity_id(f"{domain}.entity"):
+        raise TemplateError(f"Invalid domain name '{domain}'")
+
+    if (render_info := hass.data.get(_RENDER_INFO)) is not None:
+        render_info.domains.add(domain)
+
+    numeric_states = hass.states.async_numeric_states(domain)
+    if area_id_or_name is None and device_class is None:
+        return list(numeric_states.values())
+
+    area_entity_ids: set[str] | None = None
+    if area_id_or_name is not None:
+        area_entity_ids = set(area_entities(hass, area_id_or_name))
+
+    values = []
+    for entity_id, value in numeric_states.items():
+        if area_entity_ids is not None and entity_id not in area_entity_ids:
+            continue
+        if device_class is not None and (
+            (state := hass.states.get(entity_id)) is None
+            or state.attributes.get(ATTR_DEVICE_CLASS) != device_class
+        ):
+            continue
+        values.append(value)
+    return values
+
+
+def states_sum(
+    hass: HomeAssistant,
+    domain: str,
+    area_id_or_name: str | None = None,
+    device_class: str | None = None,
+) -> float:
+    """Return the sum of the numeric states of a domain."""
+    return math.fsum(_numeric_states(hass, domain, area_id_or_name, device_class))
+
+
+def states_min(
+    hass: HomeAssistant,
+    domain: str,
+    area_id_or_name: str | None = None,
+    device_class: str | None = None,
+) -> float | None:
+    """Return the lowest numeric state of a domain."""
+    return min(
+        _numeric_states(hass, domain, area_id_or_name, device_class), default=None
+    )
+
+
+def states_max(
+    hass: HomeAssistant,
+    domain: str,
+    area_id_or_name: str | None = None,
+    device_class: str | None = None,
+) -> float | None:
+    """Return the highest numeric state of a domain."""
+    return max(
+        _numeric_states(hass, domain, area_id_or_name, device_class), default=None
+    )
+
+
+def states_mean(
+    hass: HomeAssistant,
+    domain: str,
+    area_id_or_name: str | None = None,
+    device_class: str | None = None,
+) -> float | None:
+    """Return the mean of the numeric states of a domain."""
+    if not (values := _numeric_states(hass, domain, area_id_or_name, device_class)):
+        return None
+    return statistics.fmean(values)
+
+
+def states_count(
+    hass: HomeAssistant,
+    domain: str,
+    area_id_or_name: str | None = None,
+    device_class: str | None = None,
+) -> int:
+    """Return the number of numeric states of a domain."""
+    return len(_numeric_states(hass, domain, area_id_or_name, device_class))
+
+
 def is_state(hass: HomeAssistant, entity_id: str, state: State) -> bool:
     """Test if a state is a specific value."""
     state_obj = _get_state(hass, entity_id)
@@ -1260,7 +1441,7 @@ def is_state_attr(hass: HomeAssistant, entity_id: str, name: str, value: Any) ->
 def state_attr(hass: HomeAssistant, entity_id: str, name: str) -> Any:
     """Get a specific attribute from a state."""
     if (state_obj := _get_state(hass, entity_id)) is not None:
-        return state_obj.attributes.get(name)
+        return state_obj._get_attribute(name)
     return None
 
 
@@ -1866,7 +2047,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
-        self.template_cache = weakref.WeakValueDictionary()
+        self.limited = bool(limited)
+        self.strict = bool(strict)
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -2011,6 +2193,11 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 "device_id",
                 "area_id",
                 "area_name",
+                "states_sum",
+                "states_min",
+                "states_max",
+                "states_mean",
+                "states_count",
             ]
             hass_filters = ["closest", "expand", "device_id", "area_id", "area_name"]
             for glob in hass_globals:
@@ -2027,6 +2214,11 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         self.globals["is_state"] = hassfunction(is_state)
         self.globals["is_state_attr"] = hassfunction(is_state_attr)
         self.globals["state_attr"] = hassfunction(state_attr)
+        self.globals["states_sum"] = hassfunction(states_sum)
+        self.globals["states_min"] = hassfunction(states_min)
+        self.globals["states_max"] = hassfunction(states_max)
+        self.globals["states_mean"] = hassfunction(states_mean)
+        self.globals["states_count"] = hassfunction(states_count)
         self.globals["states"] = AllStates(hass)
         self.globals["utcnow"] = hassfunction(utcnow)
         self.globals["now"] = hassfunction(now)
@@ -2058,10 +2250,119 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             # any instance of this.
             return super().compile(source, name, filename, raw, defer_init)
 
-        if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+        # The filters of the environment without hass are checked at
+        # compile time as well
+        key = (source, self.limited, self.strict, self.hass is None)
+        with _COMPILED_CACHE_LOCK:
+            if (cached := _COMPILED_CACHE.pop(key, None)) is not None:
+                _COMPILED_CACHE[key] = cached
+                return cached
+
+        # Compile without the lock, templates are compiled in the
+        # executor and on the event loop
+        bytecode_cache: TemplateBytecodeCache | None = None
+        if self.hass is not None:
+            bytecode_cache = self.hass.data.get(_BYTECODE_CACHE)
+        code_key = (source, self.limited, self.strict)
+        if bytecode_cache is not None:
+            cached = bytecode_cache.load(code_key)
+        if cached is None:
+            cached = super().compile(source)
+            if bytecode_cache is not None:
+                bytecode_cache.dump(code_key, cached)
+
+        with _COMPILED_CACHE_LOCK:
+            # Another thread may have compiled it meanwhile
+            _COMPILED_CACHE.pop(key, None)
+            if len(_COMPILED_CACHE) >= COMPILED_CACHE_SIZE:
+                # Evict the least recently used code
+                del _COMPILED_CACHE[next(iter(_COMPILED_CACHE))]
+            _COMPILED_CACHE[key] = cached
 
         return cached
 
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
+_COMPILED_CACHE: dict[tuple[str, bool, bool, bool], CodeType] = {}
+_COMPILED_CACHE_LOCK = threading.Lock()
+
+
+def _bytecode_magic() -> str:
+    """Return the versions the persisted code is only valid for."""
+    return f"{MAGIC_NUMBER.hex()}-{jinja2.__version__}-{__version__}"
+
+
+class TemplateBytecodeCache:
+    """Persist the code of compiled templates between restarts.
+
+    The code is keyed by a hash of the source, so a changed template is
+    simply compiled again. The least recently used code is dropped once
+    the cache is full.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the bytecode cache."""
+        self.hass = hass
+        self._store = Store(
+            hass, BYTECODE_STORAGE_VERSION, BYTECODE_STORAGE_KEY, private=True
+        )
+        self._code: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._save_scheduled = False
+
+    async def async_load(self) -> None:
+        """Load the persisted code."""
+        data = await self._store.async_load()
+        if isinstance(data, dict) and data.get("magic") == _bytecode_magic():
+            self._code = data["code"]
+
+    @staticmethod
+    def _key(key: tuple[str, bool, bool]) -> str:
+        """Return the storage key of a template."""
+        source, limited, strict = key
+        return hashlib.sha1(f"{int(limited)}{int(strict)}{source}".encode()).hexdigest()
+
+    def load(self, key: tuple[str, bool, bool]) -> CodeType | None:
+        """Return the persisted code of a template."""
+        storage_key = self._key(key)
+        with self._lock:
+            if (encoded := self._code.pop(storage_key, None)) is None:
+                return None
+        try:
+            code = marshal.loads(base64.b64decode(encoded))
+        except (ValueError, EOFError, TypeError):
+            return None
+        with self._lock:
+            self._code[storage_key] = encoded
+        return cast(CodeType, code)
+
+    def dump(self, key: tuple[str, bool, bool], code: CodeType) -> None:
+        """Persist the code of a template."""
+        storage_key = self._key(key)
+        encoded = base64.b64encode(marshal.dumps(code)).decode()
+        with self._lock:
+            self._code.pop(storage_key, None)
+            if len(self._code) >= BYTECODE_CACHE_SIZE:
+                del self._code[next(iter(self._code))]
+            self._code[storage_key] = encoded
+            if self._save_scheduled:
+                return
+            self._save_scheduled = True
+        # Templates are compiled in the executor as well
+        self.hass.loop.call_soon_threadsafe(
+            self._store.async_delay_save, self._data_to_save, BYTECODE_SAVE_DELAY
+        )
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        with self._lock:
+            self._save_scheduled = False
+            return {"magic": _bytecode_magic(), "code": dict(self._code)}
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the persisted template code so templates skip compiling."""
+    bytecode_cache = TemplateBytecodeCache(hass)
+    await bytecode_cache.async_load()
+    hass.data[_BYTECODE_CACHE] = bytecode_cache
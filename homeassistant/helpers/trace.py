@@ -8,10 +8,15 @@ from contextvars import ContextVar
 from functools import wraps
 from typing import Any, cast
 
+from homeassistant.core import State
 import homeassistant.util.dt as dt_util
 
 from .typing import TemplateVarsType
 
+# Rough serialized sizes, used to estimate the memory used by traces
+_VALUE_SIZE = 32
+_STATE_SIZE = 512
+
 
 class TraceElement:
     """Container for trace data."""
@@ -29,13 +34,18 @@ class TraceElement:
         if variables is None:
             variables = {}
         last_variables = variables_cv.get() or {}
-        variables_cv.set(dict(variables))
         changed_variables = {
             key: value
             for key, value in variables.items()
-            if key not in last_variables or last_variables[key] != value
+            if key not in last_variables
+            or (last_variables[key] is not value and last_variables[key] != value)
         }
+        # The copy of the variables is shared by the steps not changing them
+        if changed_variables or len(variables) != len(last_variables):
+            variables_cv.set(dict(variables))
         self._variables = changed_variables
+        self._variables_size = estimate_size(changed_variables)
+        self._result_size = 0
 
     def __repr__(self) -> str:
         """Container for trace data."""
@@ -53,11 +63,28 @@ class TraceElement:
     def set_result(self, **kwargs: Any) -> None:
         """Set result."""
         self._result = {**kwargs}
+        self._result_size = estimate_size(self._result)
 
     def update_result(self, **kwargs: Any) -> None:
         """Set result."""
         old_result = self._result or {}
         self._result = {**old_result, **kwargs}
+        self._result_size += estimate_size(kwargs)
+
+    def compact(self) -> None:
+        """Replace the states in the variables and result by references."""
+        self._variables = _compact_value(self._variables)
+        self._variables_size = estimate_size(self._variables)
+        if self._result is not None:
+            self._result = _compact_value(self._result)
+            self._result_size = estimate_size(self._result)
+
+    @property
+    def estimated_size(self) -> int:
+        """Return a rough estimate of the serialized size of the element."""
+        return (
+            _VALUE_SIZE * 4 + len(self.path) + self._variables_size + self._result_size
+        )
 
     def as_dict(self) -> dict[str, Any]:
         """Return dictionary version of this TraceElement."""
@@ -78,6 +105,43 @@ class TraceElement:
         return result
 
 
+def estimate_size(value: Any, depth: int = 3) -> int:
+    """Return a rough estimate of the serialized size of a value.
+
+    Containers are only walked depth levels deep, so it stays cheap for
+    large values.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, State):
+        return _STATE_SIZE + _VALUE_SIZE * len(value.attributes)
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return _VALUE_SIZE
+    if depth == 0:
+        return _VALUE_SIZE * len(value)
+    return sum(_VALUE_SIZE + estimate_size(item, depth - 1) for item in value)
+
+
+def _compact_value(value: Any) -> Any:
+    """Replace the states in a value by their entity_id and last_updated.
+
+    Containers without states are returned as is.
+    """
+    if isinstance(value, State):
+        return {"entity_id": value.entity_id, "last_updated": value.last_updated}
+    if isinstance(value, dict):
+        compacted = {key: _compact_value(item) for key, item in value.items()}
+        if any(compacted[key] is not item for key, item in value.items()):
+            return compacted
+    elif isinstance(value, (list, tuple)):
+        compacted_items = [_compact_value(item) for item in value]
+        if any(new is not old for new, old in zip(compacted_items, value)):
+            return compacted_items
+    return value
+
+
 # Context variables for tracing
 # Current trace
 trace_cv: ContextVar[dict[str, deque[TraceElement]] | None] = ContextVar(
@@ -13,6 +13,7 @@ import functools as ft
 import importlib
 import json
 import logging
+import os
 import pathlib
 import sys
 from types import ModuleType
@@ -24,6 +25,7 @@ from awesomeversion import (
     AwesomeVersionStrategy,
 )
 
+from .const import __version__
 from .generated.dhcp import DHCP
 from .generated.mqtt import MQTT
 from .generated.ssdp import SSDP
@@ -44,6 +46,7 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_INTEGRATION_INDEX = "integration_index"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -59,6 +62,10 @@ MAX_LOAD_CONCURRENTLY = 4
 
 MOVED_ZEROCONF_PROPS = ("macaddress", "model", "manufacturer")
 
+INTEGRATION_INDEX_STORAGE_KEY = "core.integration_index"
+INTEGRATION_INDEX_STORAGE_VERSION = 1
+INTEGRATION_INDEX_SAVE_DELAY = 60
+
 
 class Manifest(TypedDict, total=False):
     """
@@ -102,40 +109,221 @@ def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
     }
 
 
+def _newest_integration_mtime(path: str) -> float | None:
+    """Return the newest mtime of an integrations directory.
+
+    The mtimes of the integration directories change when platforms are
+    added or removed, those of the manifests when they are edited.
+    """
+    try:
+        newest = os.stat(path).st_mtime
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.is_dir() or entry.name.startswith("__"):
+                    continue
+                newest = max(newest, entry.stat().st_mtime)
+                with suppress(OSError):
+                    manifest_path = os.path.join(entry.path, "manifest.json")
+                    newest = max(newest, os.stat(manifest_path).st_mtime)
+    except OSError:
+        return None
+    return newest
+
+
+def _integration_index_validation(
+    safe_mode: bool, custom_paths: list[str], custom_components: list[str]
+) -> dict[str, Any]:
+    """Return what the integration index is only valid for.
+
+    The mtime of each built-in integrations directory is the newest of the
+    directory itself, its integration directories and their manifests, so
+    a development checkout is picked up as well. The directory mtimes of
+    the custom integrations change when they are added or removed, the
+    manifest mtimes when one is updated.
+    """
+    from . import components  # pylint: disable=import-outside-toplevel
+
+    mtimes: dict[str, float | None] = {}
+    for path in components.__path__:
+        mtimes[path] = _newest_integration_mtime(path)
+    for path in custom_paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime
+        except OSError:
+            mtimes[path] = None
+        for name in custom_components:
+            for sub_path in (
+                os.path.join(path, name),
+                os.path.join(path, name, "manifest.json"),
+            ):
+                with suppress(OSError):
+                    mtimes[sub_path] = os.stat(sub_path).st_mtime
+
+    return {"version": __version__, "safe_mode": safe_mode, "mtimes": mtimes}
+
+
+def _scan_custom_components(
+    safe_mode: bool, custom_paths: list[str]
+) -> tuple[list[str], dict[str, Any]]:
+    """Return the custom integration directories and the index validation."""
+    custom_components = sorted(
+        {
+            entry.name
+            for path in custom_paths
+            for entry in pathlib.Path(path).iterdir()
+            if entry.is_dir()
+        }
+    )
+    return custom_components, _integration_index_validation(
+        safe_mode, custom_paths, custom_components
+    )
+
+
+class IntegrationIndex:
+    """Persisted manifests, module names and dependencies of integrations.
+
+    The index is thrown away when Home Assistant is upgraded or when
+    integrations are added, removed or have their manifest changed. Until
+    then startup does not have to scan for and parse the manifests.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the integration index."""
+        # pylint: disable-next=import-outside-toplevel
+        from .helpers.storage import Store
+
+        self.hass = hass
+        self._store = Store(
+            hass,
+            INTEGRATION_INDEX_STORAGE_VERSION,
+            INTEGRATION_INDEX_STORAGE_KEY,
+            private=True,
+        )
+        self.validation: dict[str, Any] = {}
+        self.custom_components: list[str] | None = None
+        self.integrations: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self, custom_paths: list[str]) -> None:
+        """Load the index if it is still valid."""
+        data = await self._store.async_load()
+        if (
+            not isinstance(data, dict)
+            or data.get("validation", {}).get("version") != __version__
+        ):
+            return
+
+        validation = await self.hass.async_add_executor_job(
+            _integration_index_validation,
+            self.hass.config.safe_mode,
+            custom_paths,
+            data["custom_components"],
+        )
+        if validation != data["validation"]:
+            return
+
+        self.validation = validation
+        self.custom_components = data["custom_components"]
+        self.integrations = data["integrations"]
+
+    def async_get(self, pkg_path: str) -> Integration | None:
+        """Return an integration from the index."""
+        if (entry := self.integrations.get(pkg_path)) is None:
+            return None
+        return Integration.from_index(self.hass, pkg_path, entry)
+
+    def async_add(self, integration: Integration) -> None:
+        """Add a resolved integration to the index."""
+        self.integrations[integration.pkg_path] = {
+            "file_path": str(integration.file_path),
+            "manifest": integration.manifest,
+            "platforms": sorted(integration.platforms),
+        }
+        self.async_schedule_save()
+
+    def async_set_dependencies(self, integration: Integration) -> None:
+        """Store the resolved dependencies of an integration."""
+        if (entry := self.integrations.get(integration.pkg_path)) is None:
+            return
+        all_dependencies = sorted(integration.all_dependencies)
+        if entry.get("all_dependencies") == all_dependencies:
+            return
+        entry["all_dependencies"] = all_dependencies
+        self.async_schedule_save()
+
+    def async_schedule_save(self) -> None:
+        """Schedule saving the index."""
+        self._store.async_delay_save(self._data_to_save, INTEGRATION_INDEX_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data of the index to store."""
+        return {
+            "validation": self.validation,
+            "custom_components": self.custom_components,
+            "integrations": self.integrations,
+        }
+
+
+async def _async_get_integration_index(
+    hass: HomeAssistant, custom_paths: list[str]
+) -> IntegrationIndex:
+    """Return the integration index, load it the first time."""
+    if (index := hass.data.get(DATA_INTEGRATION_INDEX)) is None:
+        index = hass.data[DATA_INTEGRATION_INDEX] = IntegrationIndex(hass)
+        await index.async_load(custom_paths)
+
+    if index.custom_components is None:
+        (
+            index.custom_components,
+            index.validation,
+        ) = await hass.async_add_executor_job(
+            _scan_custom_components, hass.config.safe_mode, custom_paths
+        )
+        index.integrations = {}
+        index.async_schedule_save()
+
+    return index
+
+
 async def _async_get_custom_components(
     hass: HomeAssistant,
 ) -> dict[str, Integration]:
     """Return list of custom integrations."""
-    if hass.config.safe_mode:
-        return {}
+    custom_components: ModuleType | None = None
+    if not hass.config.safe_mode:
+        try:
+            import custom_components  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            pass
 
-    try:
-        import custom_components  # pylint: disable=import-outside-toplevel
-    except ImportError:
+    custom_paths = list(custom_components.__path__) if custom_components else []
+    index = await _async_get_integration_index(hass, custom_paths)
+    if custom_components is None:
         return {}
 
-    def get_sub_directories(paths: list[str]) -> list[pathlib.Path]:
-        """Return all sub directories in a set of paths."""
-        return [
-            entry
-            for path in paths
-            for entry in pathlib.Path(path).iterdir()
-            if entry.is_dir()
-        ]
-
-    dirs = await hass.async_add_executor_job(
-        get_sub_directories, custom_components.__path__
-    )
+    integrations: list[Integration | None] = []
+    to_resolve: list[str] = []
+    for name in cast(list[str], index.custom_components):
+        if (
+            integration := index.async_get(f"{PACKAGE_CUSTOM_COMPONENTS}.{name}")
+        ) is None:
+            to_resolve.append(name)
+            continue
+        _LOGGER.warning(CUSTOM_WARNING, integration.domain)
+        integrations.append(integration)
 
-    integrations = await gather_with_concurrency(
+    resolved = await gather_with_concurrency(
         MAX_LOAD_CONCURRENTLY,
         *(
             hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
+                Integration.resolve_from_root, hass, custom_components, name
             )
-            for comp in dirs
+            for name in to_resolve
         ),
     )
+    for integration in resolved:
+        if integration is not None:
+            index.async_add(integration)
+    integrations.extend(resolved)
 
     return {
         integration.domain: integration
@@ -338,6 +526,8 @@ class Integration:
                 manifest_path.parent,
                 manifest,
             )
+            # List the modules while we are in the executor
+            integration.platforms  # pylint: disable=pointless-statement
 
             if integration.is_built_in:
                 return integration
@@ -389,6 +579,8 @@ class Integration:
         self.manifest = manifest
         manifest["is_built_in"] = self.is_built_in
 
+        self._platforms: set[str] | None = None
+
         if self.dependencies:
             self._all_dependencies_resolved: bool | None = None
             self._all_dependencies: set[str] | None = None
@@ -398,6 +590,20 @@ class Integration:
 
         _LOGGER.info("Loaded %s from %s", self.domain, pkg_path)
 
+    @classmethod
+    def from_index(
+        cls, hass: HomeAssistant, pkg_path: str, entry: dict[str, Any]
+    ) -> Integration:
+        """Create an integration from an entry of the integration index."""
+        integration = cls(
+            hass, pkg_path, pathlib.Path(entry["file_path"]), entry["manifest"]
+        )
+        integration._platforms = set(entry["platforms"])
+        if (all_dependencies := entry.get("all_dependencies")) is not None:
+            integration._all_dependencies = set(all_dependencies)
+            integration._all_dependencies_resolved = True
+        return integration
+
     @property
     def name(self) -> str:
         """Return name."""
@@ -500,6 +706,24 @@ class Integration:
             return None
         return AwesomeVersion(self.manifest["version"])
 
+    @property
+    def platforms(self) -> set[str]:
+        """Return the names of the modules of the integration, like its platforms.
+
+        Lists the integration directory the first time, which does I/O.
+        """
+        if self._platforms is None:
+            platforms: set[str] = set()
+            with suppress(OSError), os.scandir(self.file_path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".py"):
+                        platforms.add(entry.name[:-3])
+                    elif entry.is_dir() and not entry.name.startswith("__"):
+                        platforms.add(entry.name)
+            platforms.discard("__init__")
+            self._platforms = platforms
+        return self._platforms
+
     @property
     def all_dependencies(self) -> set[str]:
         """Return all dependencies including sub-dependencies."""
@@ -525,6 +749,8 @@ class Integration:
             dependencies.discard(self.domain)
             self._all_dependencies = dependencies
             self._all_dependencies_resolved = True
+            if (index := self.hass.data.get(DATA_INTEGRATION_INDEX)) is not None:
+                index.async_set_dependencies(self)
         except IntegrationNotFound as err:
             _LOGGER.error(
                 "Unable to resolve dependencies for %s:  we are unable to resolve (sub)dependency %s",
@@ -640,9 +866,17 @@ async def _async_get_integration(hass: HomeAssistant, domain: str) -> Integratio
 
     from . import components  # pylint: disable=import-outside-toplevel
 
+    index: IntegrationIndex | None = hass.data.get(DATA_INTEGRATION_INDEX)
+    if index is not None and (
+        integration := index.async_get(f"{PACKAGE_BUILTIN}.{domain}")
+    ):
+        return integration
+
     if integration := await hass.async_add_executor_job(
         Integration.resolve_from_root, hass, components, domain
     ):
+        if index is not None:
+            index.async_add(integration)
         return integration
 
     raise IntegrationNotFound(domain)
@@ -406,13 +406,16 @@ def _create_state_changed_event_from_old_new(
         [
             "event_type"
             "event_data"
-            "time_fired"
+            "time_fired_ts"
             "context_id"
             "context_user_id"
+            "context_parent_id"
+            "shared_data"
             "state"
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
@@ -420,13 +423,16 @@ def _create_state_changed_event_from_old_new(
 
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
-    row.attributes = attributes_json
-    row.time_fired = event_time_fired
+    row.shared_data = None
+    row.attributes = None
+    row.shared_attrs = attributes_json
+    row.time_fired_ts = event_time_fired.timestamp()
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and core.split_entity_id(entity_id)[0]
     row.context_id = None
     row.context_user_id = None
+    row.context_parent_id = None
     row.old_state_id = old_state and 1
     row.state_id = new_state and 1
 
@@ -32,6 +32,7 @@ BASE_PLATFORMS = {platform.value for platform in Platform}
 DATA_SETUP_DONE = "setup_done"
 DATA_SETUP_STARTED = "setup_started"
 DATA_SETUP_TIME = "setup_time"
+DATA_IMPORT_TIME = "import_time"
 
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
@@ -1,6 +1,7 @@
 """Helpers to generate uuids."""
 
 from random import getrandbits
+import time
 
 
 def random_uuid_hex() -> str:
@@ -10,3 +11,15 @@ def random_uuid_hex() -> str:
     operations.
     """
     return "%032x" % getrandbits(32 * 4)
+
+
+def ulid_hex() -> str:
+    """Generate a ULID in hex that will work for a UUID.
+
+    The first 48 bits are the time in milliseconds so the ids sort in
+    the order they were created, the other 80 bits are random.
+
+    This ulid should not be used for cryptographically secure
+    operations.
+    """
+    return f"{int(time.time() * 1000):012x}{getrandbits(80):020x}"
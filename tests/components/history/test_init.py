@@ -17,7 +17,7 @@ from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
 
-from tests.common import init_recorder_component
+from tests.common import async_fire_time_changed, init_recorder_component
 from tests.components.recorder.common import trigger_db_commit, wait_recording_done
 
 
@@ -614,6 +614,70 @@ async def test_fetch_period_api_with_minimal_response(hass, hass_client):
     assert response.status == HTTPStatus.OK
 
 
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test the fetch period view streams the same history."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on", {"brightness": 5})
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("sensor.temperature", "20")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(f"/api/history/period/{start.isoformat()}")
+    assert response.status == HTTPStatus.OK
+    expected = await response.json()
+    assert len(expected) == 2
+
+    with patch.object(recorder.history, "STREAM_YIELD_PER", 1):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params={"stream": ""}
+        )
+    assert response.status == HTTPStatus.OK
+    assert await response.json() == expected
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"stream": "", "filter_entity_id": "sensor.missing"},
+    )
+    assert response.status == HTTPStatus.OK
+    assert await response.json() == []
+
+
+async def test_fetch_period_api_with_resolution(hass, hass_client):
+    """Test the fetch period view downsamples with a resolution."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow() - timedelta(minutes=5)
+    hass.states.async_set("sensor.power", "10", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"resolution": "3600", "filter_entity_id": "sensor.power"},
+    )
+    assert response.status == HTTPStatus.OK
+    response_json = await response.json()
+    assert response_json["sensor.power"]
+    assert all(bucket["mean"] == 10.0 for bucket in response_json["sensor.power"])
+
+    for params in ({"resolution": "0"}, {"resolution": "nan"}, {"resolution": "60"}):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params=params
+        )
+        assert response.status == HTTPStatus.BAD_REQUEST
+
+
 async def test_fetch_period_api_with_no_timestamp(hass, hass_client):
     """Test the fetch period view for history with no timestamp."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -1062,3 +1126,158 @@ async def test_list_statistic_ids(hass, hass_ws_client, units, attributes, unit)
     response = await client.receive_json()
     assert response["success"]
     assert response["result"] == []
+
+
+async def test_history_stream(hass, hass_ws_client):
+    """Test history/stream sends the history and then the live changes."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on", {"brightness": 5})
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.other", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": start.isoformat(),
+            "entity_ids": ["light.kitchen"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    response = await client.receive_json()
+    assert response["id"] == 1
+    assert response["type"] == "event"
+    states = response["event"]["states"]
+    assert list(states) == ["light.kitchen"]
+    assert [state["state"] for state in states["light.kitchen"]] == ["on", "off"]
+    assert states["light.kitchen"][0]["attributes"] == {"brightness": 5}
+    assert dt_util.parse_datetime(response["event"]["end_time"]) > start
+
+    hass.states.async_set("light.other", "off")
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    hass.states.async_set("light.kitchen", "on")
+    live_state = hass.states.get("light.kitchen")
+
+    response = await client.receive_json()
+    assert response == {
+        "id": 1,
+        "type": "event",
+        "event": {
+            "states": {
+                "light.kitchen": [
+                    {
+                        "state": "on",
+                        "last_changed": live_state.last_changed.isoformat(),
+                    }
+                ]
+            }
+        },
+    }
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["id"] == 2
+    assert response["success"]
+
+
+async def test_history_stream_ended(hass, hass_ws_client):
+    """Test history/stream only sends the history when the end_time has passed."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("climate.living_room", "heat", {"temperature": 20})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    end = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "entity_ids": ["climate.living_room"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    states = response["event"]["states"]["climate.living_room"]
+    assert states[0]["attributes"] == {"temperature": 20}
+    response = await client.receive_json()
+    assert response == {"id": 1, "type": "event", "event": {"finished": True}}
+
+    hass.states.async_set("climate.living_room", "off")
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["id"] == 2
+    assert not response["success"]
+
+
+async def test_history_stream_end_time_reached(hass, hass_ws_client):
+    """Test history/stream stops the live changes once the end_time is reached."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    end = start + timedelta(minutes=5)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "entity_ids": ["light.kitchen"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    hass.states.async_set("light.kitchen", "on")
+    response = await client.receive_json()
+    states = response["event"]["states"]["light.kitchen"]
+    assert [state["state"] for state in states] == ["on"]
+
+    async_fire_time_changed(hass, end + timedelta(seconds=1))
+    response = await client.receive_json()
+    assert response == {"id": 1, "type": "event", "event": {"finished": True}}
+
+    hass.states.async_set("light.kitchen", "off")
+    await client.send_json({"id": 2, "type": "ping"})
+    response = await client.receive_json()
+    assert response == {"id": 2, "type": "pong"}
+
+
+async def test_history_stream_bad_start_time(hass, hass_ws_client):
+    """Test history/stream with a bad start_time."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream",
+            "start_time": "cats",
+            "entity_ids": ["light.kitchen"],
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
@@ -12,7 +12,12 @@ import voluptuous as vol
 from homeassistant.components import logbook, recorder
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
-from homeassistant.components.recorder.models import process_timestamp_to_utc_isoformat
+from homeassistant.components.recorder.models import (
+    Events,
+    States,
+    process_timestamp_to_utc_isoformat,
+)
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.const import (
     ATTR_DOMAIN,
@@ -270,14 +275,16 @@ def create_state_changed_event_from_old_new(
         [
             "event_type"
             "event_data"
-            "time_fired"
+            "time_fired_ts"
             "context_id"
             "context_user_id"
             "context_parent_id"
+            "shared_data"
             "state"
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
@@ -285,8 +292,10 @@ def create_state_changed_event_from_old_new(
 
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
-    row.attributes = attributes_json
-    row.time_fired = event_time_fired
+    row.shared_data = None
+    row.attributes = None
+    row.shared_attrs = attributes_json
+    row.time_fired_ts = event_time_fired.timestamp()
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
     row.domain = entity_id and ha.split_entity_id(entity_id)[0]
@@ -1460,6 +1469,44 @@ async def test_icon_and_state(hass, hass_client):
     assert response_json[2]["state"] == STATE_OFF
 
 
+async def test_logbook_before_timestamp_migration(hass, hass_client):
+    """Test the DATETIME columns are read while the timestamps are backfilled."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    hass.states.async_set("light.kitchen", STATE_ON)
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    await _async_commit_and_wait(hass)
+
+    def _clear_timestamps():
+        with session_scope(hass=hass) as session:
+            session.query(Events).update(
+                {"time_fired_ts": None}, synchronize_session=False
+            )
+            session.query(States).update(
+                {"last_changed_ts": None, "last_updated_ts": None},
+                synchronize_session=False,
+            )
+
+    await hass.async_add_executor_job(_clear_timestamps)
+    instance.timestamp_migration_done = False
+
+    client = await hass_client()
+    response_json = await _async_fetch_logbook(client)
+
+    assert [entry.get("state") for entry in response_json] == [
+        None,
+        STATE_ON,
+        STATE_OFF,
+    ]
+    assert response_json[0]["domain"] == "homeassistant"
+    assert response_json[1]["when"] <= response_json[2]["when"]
+
+
 async def test_exclude_events_domain(hass, hass_client):
     """Test if events are filtered if domain is excluded in config."""
     entity_id = "switch.bla"
@@ -1864,6 +1911,35 @@ async def test_context_filter(hass, hass_client):
     assert response.status == HTTPStatus.BAD_REQUEST
 
 
+async def test_context_filter_without_state_changed_event_rows(hass, hass_client):
+    """Test we can filter by context when state_changed rows are not recorded."""
+    await async_init_recorder_component(hass, {"state_changed_event_rows": False})
+    assert await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    entity_id = "switch.blu"
+    context = ha.Context()
+
+    hass.states.async_set(entity_id, None)
+    hass.states.async_set(entity_id, "on", context=context)
+    hass.states.async_set(entity_id, "off")
+    hass.states.async_set(entity_id, "unknown", context=context)
+
+    await _async_commit_and_wait(hass)
+    client = await hass_client()
+
+    entries = await _async_fetch_logbook(client)
+    assert len(entries) == 3
+
+    entries = await _async_fetch_logbook(client, {"context_id": context.id})
+    assert len(entries) == 2
+    _assert_entry(entries[0], entity_id=entity_id, state="on")
+    _assert_entry(entries[1], entity_id=entity_id, state="unknown")
+
+    entries = await _async_fetch_logbook(client, {"entity": entity_id})
+    assert len(entries) == 3
+
+
 async def _async_fetch_logbook(client, params=None):
     if params is None:
         params = {}
@@ -1944,3 +2020,161 @@ class MockLazyEventPartialState(ha.Event):
     def time_fired_isoformat(self):
         """Time event was fired in utc isoformat."""
         return process_timestamp_to_utc_isoformat(self.time_fired)
+
+
+async def test_logbook_event_stream(hass, hass_ws_client):
+    """Test logbook/event_stream sends the period in batches then the new entries."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    hass.states.async_set("switch.test", STATE_OFF)
+    hass.states.async_set("switch.test", STATE_ON)
+    hass.states.async_set("switch.second", STATE_OFF)
+    hass.states.async_set("switch.second", STATE_ON)
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    with patch.object(logbook, "STREAM_BATCH_SIZE", 1):
+        await client.send_json(
+            {"id": 1, "type": "logbook/event_stream", "start_time": start.isoformat()}
+        )
+        response = await client.receive_json()
+        assert response["success"]
+
+        entries = []
+        for _ in range(2):
+            response = await client.receive_json()
+            assert response["id"] == 1
+            assert response["type"] == "event"
+            assert response["event"]["start_time"] == start.isoformat()
+            assert len(response["event"]["events"]) == 1
+            entries.extend(response["event"]["events"])
+    assert [entry["entity_id"] for entry in entries] == ["switch.test", "switch.second"]
+    assert [entry["state"] for entry in entries] == [STATE_ON, STATE_ON]
+
+    hass.states.async_set("sensor.power", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.power", "2", {"unit_of_measurement": "W"})
+    hass.states.async_set("switch.test", STATE_OFF)
+    response = await client.receive_json()
+    assert response["event"] == {
+        "events": [
+            {
+                "when": hass.states.get("switch.test").last_updated.isoformat(),
+                "name": "test",
+                "state": STATE_OFF,
+                "entity_id": "switch.test",
+            }
+        ]
+    }
+
+    await hass.services.async_call(
+        logbook.DOMAIN,
+        "log",
+        {logbook.ATTR_NAME: "Alarm", logbook.ATTR_MESSAGE: "is triggered"},
+        True,
+    )
+    response = await client.receive_json()
+    entry = response["event"]["events"][0]
+    assert entry["name"] == "Alarm"
+    assert entry["message"] == "is triggered"
+    assert entry["domain"] == logbook.DOMAIN
+
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert response["id"] == 2
+    assert response["success"]
+
+
+async def test_logbook_event_stream_unserializable_event(hass, hass_ws_client):
+    """Test logbook/event_stream skips the events that cannot be serialized."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 1, "type": "logbook/event_stream", "start_time": start.isoformat()}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    hass.bus.async_fire(
+        logbook.EVENT_LOGBOOK_ENTRY,
+        {logbook.ATTR_NAME: "Bad", logbook.ATTR_MESSAGE: "data", "bad": object()},
+    )
+    await hass.services.async_call(
+        logbook.DOMAIN,
+        "log",
+        {logbook.ATTR_NAME: "Alarm", logbook.ATTR_MESSAGE: "is triggered"},
+        True,
+    )
+    response = await client.receive_json()
+    assert [entry["name"] for entry in response["event"]["events"]] == ["Alarm"]
+
+
+async def test_logbook_event_stream_entity_ids(hass, hass_ws_client):
+    """Test logbook/event_stream only sends the entries of the entity_ids."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": start.isoformat(),
+            "entity_ids": ["switch.test"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    hass.states.async_set("switch.second", STATE_OFF)
+    hass.states.async_set("switch.second", STATE_ON)
+    hass.states.async_set("switch.test", STATE_OFF)
+    hass.states.async_set("switch.test", STATE_ON)
+    response = await client.receive_json()
+    assert [entry["entity_id"] for entry in response["event"]["events"]] == [
+        "switch.test"
+    ]
+    assert response["event"]["events"][0]["state"] == STATE_ON
+
+
+async def test_logbook_event_stream_ended(hass, hass_ws_client):
+    """Test logbook/event_stream does not follow new entries after the end_time."""
+    await async_init_recorder_component(hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/event_stream",
+            "start_time": start.isoformat(),
+            "end_time": start.isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    hass.states.async_set("switch.test", STATE_OFF)
+    hass.states.async_set("switch.test", STATE_ON)
+    await client.send_json({"id": 2, "type": "ping"})
+    response = await client.receive_json()
+    assert response == {"id": 2, "type": "pong"}
+
+    await client.send_json(
+        {"id": 3, "type": "logbook/event_stream", "start_time": "cats"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
@@ -1153,6 +1153,15 @@ async def test_complex_discovery_topic_prefix(hass, mqtt_mock, caplog):
     assert ("binary_sensor", "node1 object1") in hass.data[ALREADY_DISCOVERED]
 
 
+def _subscribed_topics(mqtt_client_mock):
+    """Return the topics and qos subscribed by the MQTT client."""
+    return [
+        topic
+        for subscribe_call in mqtt_client_mock.subscribe.mock_calls
+        for topic in subscribe_call[1][0]
+    ]
+
+
 async def test_mqtt_integration_discovery_subscribe_unsubscribe(
     hass, mqtt_client_mock, mqtt_mock
 ):
@@ -1169,7 +1178,7 @@ async def test_mqtt_integration_discovery_subscribe_unsubscribe(
         await async_start(hass, "homeassistant", entry)
         await hass.async_block_till_done()
 
-    mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+    assert ("comp/discovery/#", 0) in _subscribed_topics(mqtt_client_mock)
     assert not mqtt_client_mock.unsubscribe.called
 
     class TestFlow(config_entries.ConfigFlow):
@@ -1180,12 +1189,12 @@ async def test_mqtt_integration_discovery_subscribe_unsubscribe(
             return self.async_abort(reason="already_configured")
 
     with patch.dict(config_entries.HANDLERS, {"comp": TestFlow}):
-        mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+        assert ("comp/discovery/#", 0) in _subscribed_topics(mqtt_client_mock)
         assert not mqtt_client_mock.unsubscribe.called
 
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
         await hass.async_block_till_done()
-        mqtt_client_mock.unsubscribe.assert_called_once_with("comp/discovery/#")
+        mqtt_client_mock.unsubscribe.assert_called_once_with(["comp/discovery/#"])
         mqtt_client_mock.unsubscribe.reset_mock()
 
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
@@ -1207,7 +1216,7 @@ async def test_mqtt_discovery_unsubscribe_once(hass, mqtt_client_mock, mqtt_mock
         await async_start(hass, "homeassistant", entry)
         await hass.async_block_till_done()
 
-    mqtt_client_mock.subscribe.assert_any_call("comp/discovery/#", 0)
+    assert ("comp/discovery/#", 0) in _subscribed_topics(mqtt_client_mock)
     assert not mqtt_client_mock.unsubscribe.called
 
     class TestFlow(config_entries.ConfigFlow):
@@ -1222,4 +1231,4 @@ async def test_mqtt_discovery_unsubscribe_once(hass, mqtt_client_mock, mqtt_mock
         async_fire_mqtt_message(hass, "comp/discovery/bla/config", "")
         await hass.async_block_till_done()
         await hass.async_block_till_done()
-        mqtt_client_mock.unsubscribe.assert_called_once_with("comp/discovery/#")
+        mqtt_client_mock.unsubscribe.assert_called_once_with(["comp/discovery/#"])
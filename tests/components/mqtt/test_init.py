@@ -16,6 +16,7 @@ from homeassistant.components import mqtt, websocket_api
 from homeassistant.components.mqtt import debug_info
 from homeassistant.components.mqtt.mixins import MQTT_ENTITY_DEVICE_INFO_SCHEMA
 from homeassistant.components.mqtt.models import ReceiveMessage
+from homeassistant.components.mqtt.trie import TopicTrie
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
     EVENT_HOMEASSISTANT_STARTED,
@@ -814,6 +815,52 @@ async def test_subscribe_deprecated_async(hass, mqtt_mock):
     assert len(calls) == 1
 
 
+async def test_subscribe_payload_json_parsed_once(hass, mqtt_mock):
+    """Test the JSON payload is parsed once for all subscribers."""
+    val_tpl = mqtt.MqttValueTemplate(
+        template.Template("{{ value_json.brightness }}"), hass=hass
+    ).async_render_with_possible_json_value
+    results = []
+
+    @callback
+    def record_brightness(msg):
+        results.append(val_tpl(msg.payload))
+
+    @callback
+    def record_state(msg):
+        try:
+            results.append(msg.payload_json["state"])
+        except ValueError:
+            results.append(None)
+
+    await mqtt.async_subscribe(hass, "test-topic", record_brightness)
+    await mqtt.async_subscribe(hass, "test-topic", record_state)
+
+    with patch(
+        "homeassistant.components.mqtt.models.json_loads",
+        wraps=mqtt.models.json_loads,
+    ) as json_loads:
+        async_fire_mqtt_message(
+            hass, "test-topic", '{"state": "ON", "brightness": 128}'
+        )
+        await hass.async_block_till_done()
+
+    assert results == ["128", "ON"]
+    assert json_loads.call_count == 1
+
+    # Invalid JSON is parsed once as well
+    results.clear()
+    with patch(
+        "homeassistant.components.mqtt.models.json_loads",
+        wraps=mqtt.models.json_loads,
+    ) as json_loads:
+        async_fire_mqtt_message(hass, "test-topic", "invalid")
+        await hass.async_block_till_done()
+
+    assert results == ["invalid", None]
+    assert json_loads.call_count == 1
+
+
 async def test_subscribe_topic_not_match(hass, mqtt_mock, calls, record_calls):
     """Test if subscribed topic is not a match."""
     await mqtt.async_subscribe(hass, "test-topic", record_calls)
@@ -824,6 +871,111 @@ async def test_subscribe_topic_not_match(hass, mqtt_mock, calls, record_calls):
     assert len(calls) == 0
 
 
+async def test_subscribe_topic_overlapping_unsubscribe(
+    hass, mqtt_mock, calls, record_calls
+):
+    """Test removing a subscription keeps the overlapping ones matching."""
+    unsub_exact = await mqtt.async_subscribe(hass, "test-topic/bier/on", record_calls)
+    unsub_level = await mqtt.async_subscribe(hass, "test-topic/+/on", record_calls)
+    unsub_subtree = await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+
+    async_fire_mqtt_message(hass, "test-topic/bier/on", "test-payload")
+    await hass.async_block_till_done()
+    assert [call[0].subscribed_topic for call in calls] == [
+        "test-topic/bier/on",
+        "test-topic/+/on",
+        "test-topic/#",
+    ]
+
+    calls.clear()
+    unsub_level()
+    async_fire_mqtt_message(hass, "test-topic/bier/on", "test-payload")
+    await hass.async_block_till_done()
+    assert [call[0].subscribed_topic for call in calls] == [
+        "test-topic/bier/on",
+        "test-topic/#",
+    ]
+
+    calls.clear()
+    unsub_exact()
+    unsub_subtree()
+    async_fire_mqtt_message(hass, "test-topic/bier/on", "test-payload")
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+
+
+async def test_receive_messages_in_batches(hass, mqtt_mock, calls, record_calls):
+    """Test messages received by the paho thread are handled in batches."""
+    # pylint: disable-next=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    await mqtt.async_subscribe(hass, "test-topic/#", record_calls)
+
+    def receive_messages():
+        for topic, payload, retain in (
+            ("test-topic/a", b"1", True),
+            ("test-topic/b", b"1", True),
+            ("test-topic/a", b"2", True),
+            ("test-topic/a", b"3", False),
+            ("test-topic/a", b"4", True),
+            ("test-topic/b", b"2", False),
+        ):
+            msg = MQTTMessage(topic=topic.encode())
+            msg.payload = payload
+            msg.retain = retain
+            mqtt_mock._mqtt_on_message(None, None, msg)
+
+    with patch.object(mqtt, "MESSAGE_BATCH_WINDOW", 0), patch.object(
+        mqtt, "_coalesce_retained_messages", wraps=mqtt._coalesce_retained_messages
+    ) as coalesce:
+        await hass.async_add_executor_job(receive_messages)
+        await hass.async_block_till_done()
+
+    assert coalesce.call_count == 1
+    # The retained messages followed by a retained message on their topic
+    # are dropped, the order of the other messages is kept
+    assert [(call[0].topic, call[0].payload) for call in calls] == [
+        ("test-topic/b", "1"),
+        ("test-topic/a", "3"),
+        ("test-topic/a", "4"),
+        ("test-topic/b", "2"),
+    ]
+
+
+def test_topic_trie():
+    """Test adding, matching and removing topic filters."""
+    trie = TopicTrie()
+    trie.add("a/b", 1)
+    trie.add("a/+", 2)
+    trie.add("a/#", 3)
+    trie.add("#", 4)
+    trie.add("+/b", 5)
+    trie.add("a/b", 6)
+
+    assert trie.match("a/b") == [1, 6, 2, 3, 5, 4]
+    assert trie.match("a") == [3, 4]
+    assert trie.match("a/b/c") == [3, 4]
+    assert trie.match("b/b") == [5, 4]
+    assert trie.match("$SYS/b") == []
+    assert trie.get("a/b") == [1, 6]
+    assert len(trie) == 5
+
+    trie.remove("a/b", 1)
+    assert trie.match("a/b") == [6, 2, 3, 5, 4]
+    trie.remove("a/b", 6)
+    assert "a/b" not in trie
+    assert trie.match("a/b") == [2, 3, 5, 4]
+    with pytest.raises(KeyError):
+        trie.remove("a/b", 6)
+
+    for topic, value in (("a/+", 2), ("a/#", 3), ("#", 4), ("+/b", 5)):
+        trie.remove(topic, value)
+    assert len(trie) == 0
+    assert trie.match("a/b") == []
+    # Unused levels are pruned
+    assert not trie._root.children
+
+
 async def test_subscribe_topic_level_wildcard(hass, mqtt_mock, calls, record_calls):
     """Test the subscription of wildcard topics."""
     await mqtt.async_subscribe(hass, "test-topic/+/on", record_calls)
@@ -1056,6 +1208,40 @@ async def test_not_calling_unsubscribe_with_active_subscribers(
     assert not mqtt_client_mock.unsubscribe.called
 
 
+@pytest.mark.parametrize(
+    "mqtt_config",
+    [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_DISCOVERY: False}],
+)
+async def test_subscriptions_are_batched(hass, mqtt_client_mock, mqtt_mock):
+    """Test subscription changes are sent in batches."""
+    # Fake that the client is connected
+    mqtt_mock().connected = True
+
+    with patch.object(mqtt, "MAX_SUBSCRIBES_PER_CALL", 2):
+        unsub_a = await mqtt.async_subscribe(hass, "test/a", None)
+        unsub_b = await mqtt.async_subscribe(hass, "test/b", None, qos=1)
+        await mqtt.async_subscribe(hass, "test/c", None)
+        await hass.async_block_till_done()
+
+        assert mqtt_client_mock.subscribe.mock_calls == [
+            call([("test/a", 0), ("test/b", 1)]),
+            call([("test/c", 0)]),
+        ]
+        mqtt_client_mock.subscribe.reset_mock()
+
+        # Changes within the cooldown are combined
+        unsub_a()
+        unsub_b()
+        await mqtt.async_subscribe(hass, "test/b", None)
+        await mqtt.async_subscribe(hass, "test/d", None, qos=2)
+        await hass.async_block_till_done()
+
+    assert mqtt_client_mock.unsubscribe.mock_calls == [call(["test/a"])]
+    assert mqtt_client_mock.subscribe.mock_calls == [
+        call([("test/b", 0), ("test/d", 2)])
+    ]
+
+
 @pytest.mark.parametrize(
     "mqtt_config",
     [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_DISCOVERY: False}],
@@ -1092,11 +1278,7 @@ async def test_restore_all_active_subscriptions_on_reconnect(
     await mqtt.async_subscribe(hass, "test/state", None, qos=1)
     await hass.async_block_till_done()
 
-    expected = [
-        call("test/state", 2),
-        call("test/state", 0),
-        call("test/state", 1),
-    ]
+    expected = [call([("test/state", 2)])]
     assert mqtt_client_mock.subscribe.mock_calls == expected
 
     unsub()
@@ -1108,7 +1290,7 @@ async def test_restore_all_active_subscriptions_on_reconnect(
         mqtt_client_mock.on_connect(None, None, None, 0)
         await hass.async_block_till_done()
 
-    expected.append(call("test/state", 1))
+    expected.append(call([("test/state", 1)]))
     assert mqtt_client_mock.subscribe.mock_calls == expected
 
 
@@ -1551,16 +1733,16 @@ async def test_mqtt_subscribes_topics_on_connect(hass, mqtt_client_mock, mqtt_mo
     await mqtt.async_subscribe(hass, "still/pending", None)
     await mqtt.async_subscribe(hass, "still/pending", None, 1)
 
-    hass.add_job = MagicMock()
     mqtt_client_mock.on_connect(None, None, 0, 0)
 
     await hass.async_block_till_done()
 
     assert mqtt_client_mock.disconnect.call_count == 0
 
-    expected = {"topic/test": 0, "home/sensor": 2, "still/pending": 1}
-    calls = {call[1][1]: call[1][2] for call in hass.add_job.mock_calls}
-    assert calls == expected
+    # All topics are subscribed in one call, with the highest requested qos
+    assert mqtt_client_mock.subscribe.mock_calls == [
+        call([("topic/test", 0), ("home/sensor", 2), ("still/pending", 1)])
+    ]
 
 
 async def test_setup_entry_with_config_override(hass, device_reg, mqtt_client_mock):
@@ -261,6 +261,37 @@ async def test_controlling_state_and_attributes_with_json_message_without_templa
     )
 
 
+async def test_json_message_shared_by_sirens(hass, mqtt_mock):
+    """Test sirens on the same state topic all receive the whole JSON message."""
+    assert await async_setup_component(
+        hass,
+        siren.DOMAIN,
+        {
+            siren.DOMAIN: [
+                {
+                    "platform": "mqtt",
+                    "name": name,
+                    "state_topic": "state-topic",
+                    "command_topic": "command-topic",
+                    "available_tones": ["ping", "siren", "bell"],
+                }
+                for name in ("test1", "test2")
+            ]
+        },
+    )
+    await hass.async_block_till_done()
+
+    async_fire_mqtt_message(
+        hass, "state-topic", '{"state":"ON", "tone": "bell", "duration": 10}'
+    )
+
+    for entity_id in ("siren.test1", "siren.test2"):
+        state = hass.states.get(entity_id)
+        assert state.state == STATE_ON
+        assert state.attributes.get(siren.ATTR_TONE) == "bell"
+        assert state.attributes.get(siren.ATTR_DURATION) == 10
+
+
 async def test_filtering_not_supported_attributes_optimistic(hass, mqtt_mock):
     """Test setting attributes with support flags optimistic."""
     config = {
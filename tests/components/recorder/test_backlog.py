@@ -0,0 +1,185 @@
+"""The tests for the recorder backlog spill file."""
+# pylint: disable=protected-access
+import asyncio
+import os
+from unittest.mock import patch
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.backlog import (
+    RecorderBacklog,
+    event_from_backlog_line,
+    event_to_backlog_line,
+)
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import Events, States
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, HomeAssistant, State
+
+from .common import async_wait_recording_done
+
+from tests.common import async_init_recorder_component
+
+
+def _state_changed_event(entity_id: str, state: str) -> Event:
+    """Create a state_changed event."""
+    context = Context(user_id="8a5cf8ea7a4c4e8b9b4c1f7a1d0e5f11")
+    new_state = State(entity_id, state, {"test_attr": 5}, context=context)
+    return Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "old_state": None, "new_state": new_state},
+        time_fired=new_state.last_updated,
+        context=context,
+    )
+
+
+def test_backlog_line_round_trip():
+    """Test events survive being written to the backlog file."""
+    event = _state_changed_event("test.one", "on")
+
+    restored = event_from_backlog_line(event_to_backlog_line(event))
+
+    assert restored == event
+    assert restored.data["new_state"] == event.data["new_state"]
+    assert restored.data["new_state"].last_updated == event.time_fired
+    assert restored.data["old_state"] is None
+
+
+def test_backlog_replays_in_order_after_close(tmp_path):
+    """Test the events that were not replayed are kept for the next run."""
+    path = str(tmp_path / "storage" / "recorder.backlog")
+    backlog = RecorderBacklog(path, lambda write: write())
+    assert backlog.load() == 0
+    assert not backlog.spilling
+
+    event = _state_changed_event("test.one", "on")
+    assert not backlog.async_spill(event)
+    backlog.async_start_spilling()
+    for state in ("on", "off", "on"):
+        assert backlog.async_spill(_state_changed_event("test.one", state))
+    assert backlog.pending_events == 3
+
+    events = backlog.read_events(1, timeout=0)
+    assert [event.data["new_state"].state for event in events] == ["on"]
+    assert backlog.pending_events == 2
+    backlog.close()
+
+    backlog = RecorderBacklog(path, lambda write: write())
+    assert backlog.pending_events == 0
+    backlog.async_start_spilling()
+    assert backlog.async_spill(_state_changed_event("test.one", "off"))
+    assert backlog.load() == 2
+    assert backlog.pending_events == 3
+    events = backlog.read_events(2, timeout=0)
+    assert [event.data["new_state"].state for event in events] == ["off", "on"]
+    events = backlog.read_events(10, timeout=0)
+    assert [event.data["new_state"].state for event in events] == ["off"]
+
+    def _remove(path):
+        # The event loop must be able to spill while the file is removed
+        assert not backlog._lock.locked()
+        os_remove(path)
+
+    os_remove = os.remove
+    with patch.object(os, "remove", side_effect=_remove) as mock_remove:
+        assert backlog.read_events(10, timeout=0) is None
+    assert mock_remove.call_count == 1
+    assert not backlog.spilling
+    assert not os.path.exists(path)
+
+
+def test_backlog_not_loaded_is_kept(tmp_path):
+    """Test close keeps the events of the previous run if they were not loaded."""
+    path = str(tmp_path / "recorder.backlog")
+    with open(path, "w", encoding="utf-8") as backlog_file:
+        backlog_file.write(event_to_backlog_line(_state_changed_event("a.b", "on")))
+        backlog_file.write("\n")
+
+    RecorderBacklog(path, lambda write: write()).close()
+
+    backlog = RecorderBacklog(path, lambda write: write())
+    assert backlog.load() == 1
+
+
+def test_backlog_write_error(tmp_path, caplog):
+    """Test events that could not be written stop counting as spilled."""
+    path = str(tmp_path / "recorder.backlog")
+    backlog = RecorderBacklog(path, lambda write: write())
+    backlog.load()
+    backlog.async_start_spilling()
+
+    with patch("builtins.open", side_effect=OSError("No space left on device")):
+        assert backlog.async_spill(_state_changed_event("test.one", "on"))
+    assert "No space left on device" in caplog.text
+    assert backlog.pending_events == 0
+
+    assert backlog.read_events(10, timeout=0) is None
+    assert not backlog.spilling
+    assert not backlog.async_spill(_state_changed_event("test.one", "off"))
+
+
+async def test_spilled_events_are_recorded_after_lock(hass: HomeAssistant, tmp_path):
+    """Test events are spilled while the database is locked and replayed after."""
+    # Use file DB, in memory DB cannot do write locks.
+    config = {recorder.CONF_DB_URL: "sqlite:///" + str(tmp_path / "pytest.db")}
+    await async_init_recorder_component(hass, config)
+    await hass.async_block_till_done()
+
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    instance.backlog.path = str(tmp_path / "recorder.backlog")
+
+    with patch.object(recorder, "SPILL_QUEUE_BACKLOG", 1):
+        assert await instance.lock_database()
+        for number in range(10):
+            hass.bus.async_fire("EVENT_TEST", {"number": number})
+        await hass.async_block_till_done()
+
+        assert instance.backlog.spilling
+        assert instance.backlog.pending_events > 0
+        assert instance.backlog.spill_size > 0
+        assert os.path.exists(instance.backlog.path)
+
+        # Committing waits for the spilled events to be replayed
+        commit = asyncio.create_task(instance.async_commit_pending())
+        await asyncio.sleep(0)
+        assert not commit.done()
+
+        assert instance.unlock_database()
+        await asyncio.wait_for(commit, 10)
+        assert not instance.backlog.spilling
+        await async_wait_recording_done(hass, instance)
+
+    assert not instance.backlog.spilling
+    assert not os.path.exists(instance.backlog.path)
+    assert instance.backlog.replay_rate > 0
+    with session_scope(hass=hass) as session:
+        db_events = list(
+            session.query(Events)
+            .filter_by(event_type="EVENT_TEST")
+            .order_by(Events.event_id)
+        )
+        assert [event.event_data_rel.shared_data for event in db_events] == [
+            f'{{"number":{number}}}' for number in range(10)
+        ]
+
+
+async def test_backlog_left_over_is_replayed(hass: HomeAssistant, tmp_path):
+    """Test a backlog left over by the previous run is replayed at startup."""
+    hass.config.config_dir = str(tmp_path)
+    path = hass.config.path(".storage", "recorder.backlog")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "w", encoding="utf-8") as backlog_file:
+        for state in ("on", "off"):
+            event = _state_changed_event("test.one", state)
+            backlog_file.write(event_to_backlog_line(event) + "\n")
+
+    await async_init_recorder_component(hass)
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    await async_wait_recording_done(hass, instance)
+
+    assert not os.path.exists(path)
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [db_state.state for db_state in db_states] == ["on", "off"]
+        assert db_states[1].old_state_id == db_states[0].state_id
@@ -6,7 +6,9 @@ import json
 from unittest.mock import patch, sentinel
 
 from homeassistant.components.recorder import history
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import States, process_timestamp
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -302,6 +304,56 @@ def test_get_significant_states_multiple_entity_ids(hass_recorder):
     assert states == hist
 
 
+def test_get_significant_states_entity_id_before_states_meta_migration(
+    hass_recorder,
+):
+    """Test the entity_id is used while the states_meta migration is not done."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    del states["media_player.test2"]
+    del states["media_player.test3"]
+    del states["thermostat.test2"]
+    del states["script.can_cancel_this_one"]
+
+    instance = hass.data[DATA_INSTANCE]
+    assert instance.states_meta_migration_done
+    assert states == history.get_significant_states(
+        hass, zero, four, ["media_player.test", "thermostat.test"]
+    )
+
+    instance.states_meta_migration_done = False
+    hist = history.get_significant_states(
+        hass,
+        zero,
+        four,
+        ["media_player.test", "thermostat.test"],
+    )
+    assert states == hist
+
+
+def test_get_significant_states_before_timestamp_migration(hass_recorder):
+    """Test the DATETIME columns are read while the timestamps are backfilled."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    instance = hass.data[DATA_INSTANCE]
+    assert instance.timestamp_migration_done
+
+    with session_scope(hass=hass) as session:
+        session.query(States).update(
+            {"last_changed_ts": None, "last_updated_ts": None},
+            synchronize_session=False,
+        )
+    instance.timestamp_migration_done = False
+
+    assert states == history.get_significant_states(hass, zero, four)
+    entity_id = "media_player.test"
+    assert (
+        states[entity_id][-1]
+        == history.get_last_state_changes(hass, 1, entity_id)[entity_id][0]
+    )
+    assert states[entity_id][-1] == history.get_state(hass, four, entity_id)
+
+
 def test_get_significant_states_are_ordered(hass_recorder):
     """Test order of results from get_significant_states.
 
@@ -441,3 +493,142 @@ def record_states(hass):
         )
 
     return zero, four, states
+
+
+def test_get_downsampled_states(hass_recorder):
+    """Test numeric states are downsampled to time weighted buckets."""
+    hass = hass_recorder()
+    now = dt_util.utcnow()
+    base = now.replace(second=0, microsecond=0) - timedelta(minutes=10)
+
+    def set_state(entity_id, state, when):
+        """Set the state at a point in time."""
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=when
+        ):
+            hass.states.set(entity_id, state, {"unit_of_measurement": "W"})
+            wait_recording_done(hass)
+
+    set_state("sensor.power", "10", base - timedelta(seconds=10))
+    set_state("sensor.power", "20", base + timedelta(seconds=30))
+    set_state("sensor.power", "unavailable", base + timedelta(seconds=60))
+    set_state("sensor.power", "30", base + timedelta(seconds=90))
+    set_state("sensor.text", "on", base + timedelta(seconds=10))
+    set_state("sensor.text", "off", base + timedelta(seconds=20))
+
+    result = history.get_downsampled_states(
+        hass,
+        base,
+        base + timedelta(seconds=120),
+        ["sensor.power", "sensor.text", "sensor.missing"],
+        timedelta(seconds=60),
+    )
+    assert result["sensor.power"] == [
+        {"start": base.isoformat(), "mean": 15.0, "min": 10.0, "max": 20.0},
+        {
+            "start": (base + timedelta(seconds=60)).isoformat(),
+            "mean": 30.0,
+            "min": 30.0,
+            "max": 30.0,
+        },
+    ]
+    text_states = json.loads(json.dumps(result["sensor.text"], cls=JSONEncoder))
+    assert [state["state"] for state in text_states] == ["on", "off"]
+    assert "sensor.missing" not in result
+
+
+def test_get_downsampled_states_reuses_statistics(hass_recorder):
+    """Test the statistics are used for the time they have been compiled for."""
+    hass = hass_recorder()
+    now_ts = dt_util.utcnow().timestamp()
+    # The buckets are aligned to multiples of the resolution
+    base = dt_util.utc_from_timestamp(now_ts - now_ts % 7200 - 4 * 3600)
+
+    with patch(
+        "homeassistant.components.recorder.dt_util.utcnow",
+        return_value=base + timedelta(hours=1, minutes=50),
+    ):
+        hass.states.set("sensor.power", "100", {"unit_of_measurement": "W"})
+        wait_recording_done(hass)
+
+    stats = {
+        "sensor.power": [
+            {
+                "start": base + timedelta(hours=hour),
+                "end": (base + timedelta(hours=hour + 1)).isoformat(),
+                "mean": mean,
+                "min": mean - 1,
+                "max": mean + 1,
+            }
+            for hour, mean in ((0, 10.0), (1, 20.0))
+        ]
+    }
+    with patch.object(
+        history.statistics, "get_metadata", return_value={"sensor.power": (1, {})}
+    ), patch.object(
+        history.statistics, "statistics_during_period", return_value=stats
+    ) as statistics_during_period:
+        result = history.get_downsampled_states(
+            hass,
+            base,
+            base + timedelta(hours=3),
+            ["sensor.power"],
+            timedelta(hours=2),
+        )
+    assert statistics_during_period.call_args[0][4] == "hour"
+    assert result["sensor.power"] == [
+        {"start": base.isoformat(), "mean": 15.0, "min": 9.0, "max": 21.0},
+        {
+            "start": (base + timedelta(hours=2)).isoformat(),
+            "mean": 100.0,
+            "min": 100.0,
+            "max": 100.0,
+        },
+    ]
+
+
+def test_get_downsampled_states_statistics_with_text_states(hass_recorder):
+    """Test the statistics are kept when recent states are not numbers."""
+    hass = hass_recorder()
+    now_ts = dt_util.utcnow().timestamp()
+    base = dt_util.utc_from_timestamp(now_ts - now_ts % 7200 - 4 * 3600)
+
+    for minutes, state in ((110, "100"), (130, "error"), (150, "50")):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=base + timedelta(minutes=minutes),
+        ):
+            hass.states.set("sensor.power", state, {"unit_of_measurement": "W"})
+            wait_recording_done(hass)
+
+    stats = {
+        "sensor.power": [
+            {
+                "start": base + timedelta(hours=hour),
+                "end": (base + timedelta(hours=hour + 1)).isoformat(),
+                "mean": mean,
+                "min": mean - 1,
+                "max": mean + 1,
+            }
+            for hour, mean in ((0, 10.0), (1, 20.0))
+        ]
+    }
+    with patch.object(
+        history.statistics, "get_metadata", return_value={"sensor.power": (1, {})}
+    ), patch.object(history.statistics, "statistics_during_period", return_value=stats):
+        result = history.get_downsampled_states(
+            hass,
+            base,
+            base + timedelta(hours=3),
+            ["sensor.power"],
+            timedelta(hours=2),
+        )
+    assert result["sensor.power"] == [
+        {"start": base.isoformat(), "mean": 15.0, "min": 9.0, "max": 21.0},
+        {
+            "start": (base + timedelta(hours=2)).isoformat(),
+            "mean": 62.5,
+            "min": 50.0,
+            "max": 100.0,
+        },
+    ]
@@ -28,9 +28,12 @@ from homeassistant.components.recorder import (
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
+    EventData,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     process_timestamp,
 )
@@ -39,6 +42,7 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     MATCH_ALL,
     STATE_LOCKED,
     STATE_UNLOCKED,
@@ -75,6 +79,7 @@ def _default_recorder(hass):
         db_retry_wait=3,
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_t=[],
+        state_changed_event_rows=True,
     )
 
 
@@ -141,14 +146,218 @@ async def test_saving_state(
     await async_wait_recording_done(hass, instance)
 
     with session_scope(hass=hass) as session:
-        db_states = list(session.query(States))
+        db_states = []
+        for db_state, db_state_attributes in session.query(
+            States, StateAttributes
+        ).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        ):
+            db_states.append(db_state)
+            state = db_state.to_native()
+            state.attributes = db_state_attributes.to_native()
         assert len(db_states) == 1
         assert db_states[0].event_id > 0
-        state = db_states[0].to_native()
 
     assert state == _state_empty_context(hass, entity_id)
 
 
+async def test_saving_state_with_identical_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states with identical attributes share a state_attributes row."""
+    instance = await async_setup_recorder_instance(hass)
+
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+    hass.states.async_set("test.one", "on", attributes)
+    hass.states.async_set("test.two", "on", attributes)
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.one", "off", attributes)
+    hass.states.async_set("test.two", "off", {"test_attr": 6})
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert len(db_states) == 4
+        assert all(db_state.attributes is None for db_state in db_states)
+        assert len({db_state.attributes_id for db_state in db_states}) == 2
+        assert session.query(StateAttributes).count() == 2
+
+
+async def test_saving_states_links_states_meta(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states of the same entity share a states_meta row."""
+    instance = await async_setup_recorder_instance(hass)
+
+    hass.states.async_set("test.one", "on")
+    hass.states.async_set("test.two", "on")
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.one", "off")
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        metadata_ids = {
+            entity_id: metadata_id
+            for entity_id, metadata_id in session.query(
+                StatesMeta.entity_id, StatesMeta.metadata_id
+            )
+        }
+        assert set(metadata_ids) == {"test.one", "test.two"}
+        for db_state in session.query(States):
+            assert db_state.metadata_id == metadata_ids[db_state.entity_id]
+
+    assert instance.states_meta_migration_done
+
+
+async def test_saving_events_with_identical_data(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test events with identical data share an event_data row."""
+    instance = await async_setup_recorder_instance(hass)
+
+    hass.bus.async_fire("test_event", {"test_attr": 5})
+    hass.bus.async_fire("test_event", {"test_attr": 5})
+    await async_wait_recording_done(hass, instance)
+    hass.bus.async_fire("test_event", {"test_attr": 5})
+    hass.bus.async_fire("test_event", {"test_attr": 6})
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_events = list(session.query(Events).filter_by(event_type="test_event"))
+        assert len(db_events) == 4
+        assert all(db_event.event_data is None for db_event in db_events)
+        assert len({db_event.data_id for db_event in db_events}) == 2
+        assert {event_data.shared_data for event_data in session.query(EventData)} >= {
+            '{"test_attr":5}',
+            '{"test_attr":6}',
+        }
+
+
+async def test_saving_with_bulk_insert(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the bulk insert path links the old states from the state ids."""
+    instance = await async_setup_recorder_instance(hass, {"bulk_insert": True})
+
+    context = Context(user_id="8a5cf8ea7a4c4e8b9b4c1f7a1d0e5f11")
+    hass.states.async_set("test.one", "on", {"test_attr": 5}, context=context)
+    hass.states.async_set("test.two", "on", {"test_attr": 5})
+    hass.states.async_set("test.one", "off", {"test_attr": 6})
+    hass.bus.async_fire("test_event", {"test_attr": 5})
+    hass.bus.async_fire("test_event", {"test_attr": 5})
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.one", "on", {"test_attr": 5})
+    hass.states.async_remove("test.two")
+    hass.bus.async_fire("test_event", {"test_attr": 5})
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert [(db_state.entity_id, db_state.state) for db_state in db_states] == [
+            ("test.one", "on"),
+            ("test.two", "on"),
+            ("test.one", "off"),
+            ("test.one", "on"),
+            ("test.two", None),
+        ]
+        one_on, two_on, one_off, one_on_again, two_removed = db_states
+        assert one_on.old_state_id is None
+        assert two_on.old_state_id is None
+        assert one_off.old_state_id == one_on.state_id
+        assert one_on_again.old_state_id == one_off.state_id
+        assert two_removed.old_state_id == two_on.state_id
+        assert (
+            one_on.attributes_id == two_on.attributes_id == one_on_again.attributes_id
+        )
+        assert one_on.attributes_id != one_off.attributes_id
+        assert session.query(StateAttributes).count() == 3
+        assert one_on.metadata_id == one_off.metadata_id != two_on.metadata_id
+        assert all(db_state.event_id is None for db_state in db_states)
+        assert one_on.to_native().context == context
+
+        assert (
+            session.query(Events).filter_by(event_type=EVENT_STATE_CHANGED).count() == 5
+        )
+        db_events = list(session.query(Events).filter_by(event_type="test_event"))
+        assert len(db_events) == 3
+        assert len({db_event.data_id for db_event in db_events}) == 1
+        assert db_events[0].event_data_rel.shared_data == '{"test_attr":5}'
+
+        assert instance._old_state_ids == {"test.one": one_on_again.state_id}
+
+
+async def test_saving_with_bulk_insert_batches_shared_rows(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the bulk insert looks up and inserts the new shared rows per batch."""
+    instance = await async_setup_recorder_instance(hass, {"bulk_insert": True})
+    hass.states.async_set("test.other", "on")
+    await async_wait_recording_done(hass, instance)
+    with patch.object(
+        instance, "_find_shared_ids", wraps=instance._find_shared_ids
+    ) as find_shared_ids, patch.object(
+        instance.event_session, "execute", wraps=instance.event_session.execute
+    ) as execute:
+        for number in range(10):
+            hass.states.async_set(f"test.entity_{number}", "on", {"number": number})
+        hass.states.async_remove("test.entity_0")
+        hass.states.async_set("test.entity_0", "off", {"number": 0})
+        await async_wait_recording_done(hass, instance)
+
+    # Looked up before and after inserting the missing rows
+    assert [call.args[0] for call in find_shared_ids.call_args_list] == [
+        StateAttributes,
+        StateAttributes,
+        StatesMeta,
+        StatesMeta,
+    ]
+    inserted_tables = [
+        call.args[0].table.name
+        for call in execute.call_args_list
+        if call.args[0].is_insert
+    ]
+    assert inserted_tables.count("state_attributes") == 1
+    assert inserted_tables.count("states_meta") == 1
+
+    with session_scope(hass=hass) as session:
+        db_states = list(
+            session.query(States)
+            .filter(States.entity_id == "test.entity_0")
+            .order_by(States.state_id)
+        )
+        assert [db_state.state for db_state in db_states] == ["on", None, "off"]
+        on, removed, off = db_states
+        assert removed.old_state_id == on.state_id
+        assert off.old_state_id is None
+        assert session.query(StateAttributes).count() == 11
+        assert session.query(StatesMeta).count() == 11
+        assert instance._old_state_ids["test.entity_0"] == off.state_id
+
+
+async def test_saving_state_without_state_changed_event_rows(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the context is stored on the state when state_changed rows are skipped."""
+    instance = await async_setup_recorder_instance(
+        hass, {"state_changed_event_rows": False}
+    )
+
+    context = Context(user_id="8a5cf8ea7a4c4e8b9b4c1f7a1d0e5f11")
+    hass.states.async_set("test.recorder", "on", {"test_attr": 5}, context=context)
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        assert (
+            session.query(Events).filter_by(event_type=EVENT_STATE_CHANGED).count() == 0
+        )
+        db_states = list(session.query(States))
+        assert len(db_states) == 1
+        assert db_states[0].event_id is None
+        native = db_states[0].to_native()
+
+    assert native.context == context
+
+
 async def test_saving_many_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -334,9 +543,18 @@ def test_saving_event(hass, hass_recorder):
     hass.data[DATA_INSTANCE].block_till_done()
 
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
-        assert len(db_events) == 1
-        db_event = db_events[0].to_native()
+        db_events = []
+        for select_event, event_data in (
+            session.query(Events, EventData)
+            .filter_by(event_type=event_type)
+            .outerjoin(EventData, Events.data_id == EventData.data_id)
+        ):
+            select_event = select_event.to_native()
+            select_event.data = event_data.to_native()
+            db_events.append(select_event)
+
+    assert len(db_events) == 1
+    db_event = db_events[0]
 
     assert event.event_type == db_event.event_type
     assert event.data == db_event.data
@@ -375,7 +593,14 @@ def _add_entities(hass, entity_ids):
     wait_recording_done(hass)
 
     with session_scope(hass=hass) as session:
-        return [st.to_native() for st in session.query(States)]
+        states = []
+        for state, state_attributes in session.query(States, StateAttributes).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        ):
+            native_state = state.to_native()
+            native_state.attributes = state_attributes.to_native()
+            states.append(native_state)
+        return states
 
 
 def _add_events(hass, events):
@@ -947,9 +1172,18 @@ def test_service_disable_events_not_recording(hass, hass_recorder):
     assert events[0].data != events[1].data
 
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
-        assert len(db_events) == 1
-        db_event = db_events[0].to_native()
+        db_events = []
+        for select_event, event_data in (
+            session.query(Events, EventData)
+            .filter_by(event_type=event_type)
+            .outerjoin(EventData, Events.data_id == EventData.data_id)
+        ):
+            select_event = select_event.to_native()
+            select_event.data = event_data.to_native()
+            db_events.append(select_event)
+
+    assert len(db_events) == 1
+    db_event = db_events[0]
 
     event = events[1]
 
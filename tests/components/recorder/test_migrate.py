@@ -22,7 +22,7 @@ from homeassistant.bootstrap import async_setup_component
 from homeassistant.components import persistent_notification as pn, recorder
 from homeassistant.components.recorder import RecorderRuns, migration, models
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.models import Events, States, StatesMeta
 from homeassistant.components.recorder.util import session_scope
 import homeassistant.util.dt as dt_util
 
@@ -306,6 +306,80 @@ async def test_schema_migrate(hass, start_version):
         assert recorder.util.async_migration_in_progress(hass) is not True
 
 
+def test_migrate_entity_ids(hass_recorder):
+    """Test states recorded without a metadata_id are backfilled in batches."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    now = dt_util.utcnow()
+
+    with session_scope(hass=hass) as session:
+        for entity_id in ("sensor.one", "sensor.two", "sensor.one"):
+            session.add(
+                States(
+                    entity_id=entity_id,
+                    domain="sensor",
+                    state="on",
+                    last_changed=now,
+                    last_updated=now,
+                )
+            )
+
+    with patch.object(migration, "MAX_ROWS_TO_MIGRATE", 2):
+        assert not migration.migrate_entity_ids(instance)
+        assert not migration.migrate_entity_ids(instance)
+        assert migration.migrate_entity_ids(instance)
+
+    with session_scope(hass=hass) as session:
+        states = (
+            session.query(States.entity_id, StatesMeta.entity_id)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .all()
+        )
+        assert len(states) == 3
+        assert all(
+            state_entity_id == meta_entity_id
+            for state_entity_id, meta_entity_id in states
+        )
+        assert session.query(StatesMeta).count() == 2
+
+
+def test_migrate_columns_to_timestamp(hass_recorder):
+    """Test the epoch timestamp columns are backfilled from the DATETIME columns."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    time_fired = datetime.datetime(2022, 3, 1, 12, 30, 15, 123456)
+    last_updated = datetime.datetime(2022, 3, 1, 12, 31, 0, 654321)
+
+    with session_scope(hass=hass) as session:
+        session.add(Events(event_type="test_event", time_fired=time_fired))
+        session.add(
+            States(
+                entity_id="sensor.one",
+                domain="sensor",
+                state="on",
+                last_changed=time_fired,
+                last_updated=last_updated,
+            )
+        )
+
+    with patch.object(migration, "MAX_ROWS_TO_MIGRATE", 1):
+        # One batch of events, one of states and the last finds nothing left
+        assert not migration.migrate_timestamp_columns(instance)
+        assert not migration.migrate_timestamp_columns(instance)
+        assert migration.migrate_timestamp_columns(instance)
+
+    with session_scope(hass=hass) as session:
+        event = session.query(Events).filter_by(event_type="test_event").one()
+        assert event.time_fired_ts == time_fired.replace(tzinfo=dt_util.UTC).timestamp()
+        state = session.query(States).filter_by(entity_id="sensor.one").one()
+        assert state.last_changed_ts == (
+            time_fired.replace(tzinfo=dt_util.UTC).timestamp()
+        )
+        assert state.last_updated_ts == (
+            last_updated.replace(tzinfo=dt_util.UTC).timestamp()
+        )
+
+
 def test_invalid_update():
     """Test that an invalid new version raises an exception."""
     with pytest.raises(ValueError):
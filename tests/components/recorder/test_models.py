@@ -1,5 +1,6 @@
 """The tests for the Recorder component."""
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import PropertyMock
 
 import pytest
 from sqlalchemy import create_engine
@@ -7,8 +8,11 @@ from sqlalchemy.orm import scoped_session, sessionmaker
 
 from homeassistant.components.recorder.models import (
     Base,
+    EventData,
     Events,
+    LazyState,
     RecorderRuns,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -23,7 +27,9 @@ import homeassistant.util.dt as dt_util
 def test_from_event_to_db_event():
     """Test converting event to db event."""
     event = ha.Event("test_event", {"some_data": 15})
-    assert event == Events.from_event(event).to_native()
+    db_event = Events.from_event(event)
+    db_event.event_data = EventData.from_event(event).shared_data
+    assert event == db_event.to_native()
 
 
 def test_from_event_to_db_state():
@@ -40,6 +46,57 @@ def test_from_event_to_db_state():
     assert state == States.from_event(event).to_native()
 
 
+def test_from_event_to_db_timestamps():
+    """Test the epoch timestamps are set from the event and state."""
+    state = ha.State("sensor.temperature", "18")
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+    )
+    db_event = Events.from_event(event)
+    assert db_event.time_fired_ts == event.time_fired.timestamp()
+    db_state = States.from_event(event)
+    assert db_state.last_changed_ts == state.last_changed.timestamp()
+    assert db_state.last_updated_ts == state.last_updated.timestamp()
+
+
+def test_lazy_state_timestamps():
+    """Test the LazyState converts the epoch timestamps lazily."""
+    last_changed = dt_util.utcnow() - timedelta(minutes=5)
+    last_updated = dt_util.utcnow()
+    row = PropertyMock(
+        entity_id="sensor.valid",
+        state="off",
+        shared_attrs='{"shared":true}',
+        last_changed_ts=last_changed.timestamp(),
+        last_updated_ts=last_updated.timestamp(),
+    )
+    lstate = LazyState(row)
+    assert lstate.as_dict() == {
+        "attributes": {"shared": True},
+        "entity_id": "sensor.valid",
+        "last_changed": last_changed.isoformat(),
+        "last_updated": last_updated.isoformat(),
+        "state": "off",
+    }
+    assert lstate.last_changed == last_changed
+    assert lstate.last_updated == last_updated
+
+
+def test_from_event_to_db_state_attributes():
+    """Test converting event to db state attributes."""
+    attrs = {"this_attr": True}
+    state = ha.State("sensor.temperature", "18", attrs)
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    db_attrs = StateAttributes.from_event(event)
+    assert db_attrs.to_native() == attrs
+    assert db_attrs.hash == StateAttributes.hash_shared_attrs(db_attrs.shared_attrs)
+
+
 def test_from_event_to_delete_state():
     """Test converting deleting state event to db state."""
     event = ha.Event(
@@ -209,9 +266,11 @@ async def test_event_to_db_model():
     event = ha.Event(
         "state_changed", {"some": "attr"}, ha.EventOrigin.local, dt_util.utcnow()
     )
-    native = Events.from_event(event).to_native()
+    db_event = Events.from_event(event)
+    db_event.event_data = EventData.from_event(event).shared_data
+    native = db_event.to_native()
     assert native == event
 
-    native = Events.from_event(event, event_data="{}").to_native()
+    native = Events.from_event(event).to_native()
     event.data = {}
     assert native == event
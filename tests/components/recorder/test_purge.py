@@ -8,16 +8,26 @@ from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder import PurgeTask
-from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
+from homeassistant.components.recorder import (
+    PURGE_PROGRESS_STORAGE_KEY,
+    PURGE_PROGRESS_STORAGE_VERSION,
+    PurgeTask,
+)
+from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE, MIN_ROWS_TO_PURGE
 from homeassistant.components.recorder.models import (
+    EventData,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     StatisticsRuns,
     StatisticsShortTerm,
 )
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    PURGE_BATCH_TARGET_DURATION,
+    PurgeProgress,
+    purge_old_data,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import HomeAssistant
@@ -52,12 +62,17 @@ async def test_purge_old_states(
         assert events.count() == 6
         assert "test.recorder2" in instance._old_states
 
+        # all states share the same attributes
+        state_attributes = session.query(StateAttributes)
+        assert state_attributes.count() == 1
+
         purge_before = dt_util.utcnow() - timedelta(days=4)
 
         # run purge_old_data()
         finished = purge_old_data(instance, purge_before, repack=False)
         assert not finished
         assert states.count() == 2
+        assert state_attributes.count() == 1
         assert "test.recorder2" in instance._old_states
 
         states_after_purge = session.query(States)
@@ -74,7 +89,9 @@ async def test_purge_old_states(
         finished = purge_old_data(instance, purge_before, repack=False)
         assert not finished
         assert states.count() == 0
+        assert state_attributes.count() == 0
         assert "test.recorder2" not in instance._old_states
+        assert not instance._state_attributes_ids
 
     # Add some more states
     await _add_test_states(hass, instance)
@@ -91,6 +108,136 @@ async def test_purge_old_states(
         assert "test.recorder2" in instance._old_states
 
 
+async def test_purge_old_states_with_bulk_insert(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test purged states are evicted from the old state ids of the bulk insert."""
+    instance = await async_setup_recorder_instance(hass, {"bulk_insert": True})
+
+    await _add_test_states(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        assert states.count() == 6
+        assert states[-1].old_state_id == states[-2].state_id
+        assert instance._old_state_ids == {"test.recorder2": states[-1].state_id}
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+        while not purge_old_data(instance, purge_before, repack=False):
+            pass
+        assert states.count() == 2
+        assert "test.recorder2" in instance._old_state_ids
+
+        purge_before = dt_util.utcnow()
+        while not purge_old_data(instance, purge_before, repack=False):
+            pass
+        assert states.count() == 0
+        assert "test.recorder2" not in instance._old_state_ids
+
+
+def test_purge_progress_adapts_batch_size():
+    """Test the purge batch size follows the duration of the batches."""
+    progress = PurgeProgress(dt_util.utcnow(), repack=False, apply_filter=False)
+    assert progress.batch_size == MAX_ROWS_TO_PURGE
+
+    progress.record_batch(PURGE_BATCH_TARGET_DURATION * 2)
+    assert progress.batch_size == MAX_ROWS_TO_PURGE // 2
+    assert progress.batches == 1
+
+    progress.record_batch(PURGE_BATCH_TARGET_DURATION * 0.75)
+    assert progress.batch_size == MAX_ROWS_TO_PURGE // 2
+
+    progress.record_batch(PURGE_BATCH_TARGET_DURATION * 100)
+    assert progress.batch_size == MIN_ROWS_TO_PURGE
+
+    progress.record_batch(0)
+    assert progress.batch_size == MIN_ROWS_TO_PURGE * 2
+    assert progress.last_batch_duration == 0
+
+    restored = PurgeProgress.from_dict(progress.as_dict())
+    assert restored == progress
+
+
+async def test_purge_old_states_with_progress(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the purge progress counts the purged rows in batches of its size."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass, instance)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    progress = PurgeProgress(purge_before, repack=False, apply_filter=False)
+    progress.batch_size = 1
+    finished = purge_old_data(instance, purge_before, False, False, progress)
+    assert not finished
+    assert progress.states_purged == 1
+    assert progress.events_purged == 1
+
+    while not purge_old_data(instance, purge_before, False, False, progress):
+        pass
+    assert progress.states_purged == 4
+    assert progress.events_purged == 4
+
+
+async def test_purge_requested_during_purge_is_merged(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test a purge requested while one is in progress does not reset it."""
+    instance = await async_setup_recorder_instance(hass)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    progress = instance.purge_progress = PurgeProgress(
+        purge_before,
+        repack=False,
+        apply_filter=False,
+        batch_size=MIN_ROWS_TO_PURGE,
+        batches=3,
+    )
+    earlier = purge_before - timedelta(days=1)
+    PurgeTask(earlier, repack=False, apply_filter=True).run(instance)
+    PurgeTask(purge_before, repack=True, apply_filter=False).run(instance)
+
+    assert instance.purge_progress is progress
+    assert progress.purge_before == earlier
+    assert progress.repack
+    assert progress.apply_filter
+    assert progress.batch_size == MIN_ROWS_TO_PURGE
+    assert progress.batches == 3
+
+
+async def test_purge_is_resumed_after_restart(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass_storage,
+):
+    """Test a purge that was in progress is resumed when the recorder starts."""
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    hass_storage[PURGE_PROGRESS_STORAGE_KEY] = {
+        "version": PURGE_PROGRESS_STORAGE_VERSION,
+        "key": PURGE_PROGRESS_STORAGE_KEY,
+        "data": PurgeProgress(
+            purge_before, repack=False, apply_filter=False, states_purged=10
+        ).as_dict(),
+    }
+
+    with patch.object(recorder.Recorder, "async_load_purge_progress"):
+        instance = await async_setup_recorder_instance(hass)
+    await _add_test_states(hass, instance)
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 6
+
+    await instance.async_load_purge_progress()
+    assert instance.purge_progress.states_purged == 10
+    await async_wait_purge_done(hass, instance)
+
+    assert instance.purge_progress is None
+    await hass.async_block_till_done()
+    assert PURGE_PROGRESS_STORAGE_KEY not in hass_storage
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
 async def test_purge_old_states_encouters_database_corruption(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -209,6 +356,84 @@ async def test_purge_old_events(
         assert events.count() == 2
 
 
+async def test_purge_old_events_with_shared_data(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old events removes event data that is no longer used."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass, instance)
+
+    utcnow = dt_util.utcnow()
+    five_days_ago = utcnow - timedelta(days=5)
+    with recorder.session_scope(hass=hass) as session:
+        old_data = EventData(shared_data='{"test_attr":5}', hash=1234)
+        kept_data = EventData(shared_data='{"test_attr":6}', hash=5678)
+        for timestamp, event_data in (
+            (five_days_ago, old_data),
+            (five_days_ago, kept_data),
+            (utcnow, kept_data),
+        ):
+            session.add(
+                Events(
+                    event_type="EVENT_TEST_SHARED",
+                    event_data_rel=event_data,
+                    origin="LOCAL",
+                    created=timestamp,
+                    time_fired=timestamp,
+                )
+            )
+        session.flush()
+        instance._event_data_ids[old_data.shared_data] = old_data.data_id
+
+    with session_scope(hass=hass) as session:
+        events = session.query(Events).filter(Events.event_type == "EVENT_TEST_SHARED")
+        event_data = session.query(EventData).filter(
+            EventData.shared_data.in_(['{"test_attr":5}', '{"test_attr":6}'])
+        )
+        assert events.count() == 3
+        assert event_data.count() == 2
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        assert events.count() == 1
+        assert event_data.count() == 1
+        assert event_data.one().shared_data == '{"test_attr":6}'
+        assert '{"test_attr":5}' not in instance._event_data_ids
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert finished
+
+
+async def test_purge_old_states_without_state_changed_event_rows(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old states that do not have a state_changed row."""
+    instance = await async_setup_recorder_instance(
+        hass, {"state_changed_event_rows": False}
+    )
+
+    await _add_test_states(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        assert states.count() == 6
+        assert all(state.event_id is None for state in states)
+        events = session.query(Events).filter(Events.event_type == "state_changed")
+        assert events.count() == 0
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        assert states.count() == 2
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert finished
+        assert states.count() == 2
+
+
 async def test_purge_old_recorder_runs(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -257,6 +482,22 @@ async def test_purge_old_statistics_runs(
         assert statistics_runs.count() == 1
 
 
+async def test_purge_old_statistics_runs_with_progress(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the statistics runs are purged in batches of the progress size."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_statistics_runs(hass, instance)
+
+    purge_before = dt_util.utcnow()
+    progress = PurgeProgress(purge_before, repack=False, apply_filter=False)
+    progress.batch_size = 2
+    assert not purge_old_data(instance, purge_before, False, False, progress)
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsRuns).count() == 5
+
+
 async def test_purge_method(
     hass: HomeAssistant,
     async_setup_recorder_instance: SetupRecorderInstanceT,
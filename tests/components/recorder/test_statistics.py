@@ -816,6 +816,8 @@ def test_delete_duplicates(caplog, tmpdir):
     # Create some duplicated statistics with schema version 23
     with patch.object(recorder, "models", old_models), patch.object(
         recorder.migration, "SCHEMA_VERSION", old_models.SCHEMA_VERSION
+    ), patch.object(
+        recorder.migration, "migrate_timestamp_columns", return_value=True
     ), patch(
         "homeassistant.components.recorder.create_engine", new=_create_engine_test
     ):
@@ -983,6 +985,8 @@ def test_delete_duplicates_many(caplog, tmpdir):
     # Create some duplicated statistics with schema version 23
     with patch.object(recorder, "models", old_models), patch.object(
         recorder.migration, "SCHEMA_VERSION", old_models.SCHEMA_VERSION
+    ), patch.object(
+        recorder.migration, "migrate_timestamp_columns", return_value=True
     ), patch(
         "homeassistant.components.recorder.create_engine", new=_create_engine_test
     ):
@@ -1127,6 +1131,8 @@ def test_delete_duplicates_non_identical(caplog, tmpdir):
     # Create some duplicated statistics with schema version 23
     with patch.object(recorder, "models", old_models), patch.object(
         recorder.migration, "SCHEMA_VERSION", old_models.SCHEMA_VERSION
+    ), patch.object(
+        recorder.migration, "migrate_timestamp_columns", return_value=True
     ), patch(
         "homeassistant.components.recorder.create_engine", new=_create_engine_test
     ):
@@ -1228,6 +1234,8 @@ def test_delete_duplicates_short_term(caplog, tmpdir):
     # Create some duplicated statistics with schema version 23
     with patch.object(recorder, "models", old_models), patch.object(
         recorder.migration, "SCHEMA_VERSION", old_models.SCHEMA_VERSION
+    ), patch.object(
+        recorder.migration, "migrate_timestamp_columns", return_value=True
     ), patch(
         "homeassistant.components.recorder.create_engine", new=_create_engine_test
     ):
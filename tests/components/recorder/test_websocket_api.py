@@ -264,12 +264,48 @@ async def test_recorder_info(hass, hass_ws_client):
     assert response["result"] == {
         "backlog": 0,
         "max_backlog": 30000,
+        "spilled_backlog": 0,
+        "spill_size": 0,
+        "replay_rate": 0.0,
         "migration_in_progress": False,
         "recording": True,
         "thread_running": True,
     }
 
 
+async def test_purge_progress(hass, hass_ws_client):
+    """Test getting the progress of a purge."""
+    client = await hass_ws_client()
+    await async_init_recorder_component(hass)
+    await async_wait_recording_done_without_instance(hass)
+
+    await client.send_json({"id": 1, "type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] is None
+
+    purge_before = dt_util.utcnow()
+    instance = hass.data[DATA_INSTANCE]
+    instance.purge_progress = recorder.purge.PurgeProgress(
+        purge_before, repack=False, apply_filter=False, states_purged=998
+    )
+
+    await client.send_json({"id": 2, "type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "purge_before": purge_before.isoformat(),
+        "repack": False,
+        "apply_filter": False,
+        "started": instance.purge_progress.started.isoformat(),
+        "batch_size": 998,
+        "batches": 0,
+        "states_purged": 998,
+        "events_purged": 0,
+        "last_batch_duration": 0,
+    }
+
+
 async def test_recorder_info_no_recorder(hass, hass_ws_client):
     """Test getting recorder status when recorder is not present."""
     client = await hass_ws_client()
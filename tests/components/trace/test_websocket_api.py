@@ -7,7 +7,10 @@ from unittest.mock import patch
 import pytest
 
 from homeassistant.bootstrap import async_setup_component
-from homeassistant.components.trace.const import DEFAULT_STORED_TRACES
+from homeassistant.components.trace.const import (
+    DATA_TRACE_MEMORY,
+    DEFAULT_STORED_TRACES,
+)
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import Context, CoreState, callback
 from homeassistant.helpers.typing import UNDEFINED
@@ -572,6 +575,96 @@ async def test_trace_overflow(hass, hass_ws_client, domain, stored_traces):
     assert len(_find_traces(response["result"], domain, "sun")) == 1
 
 
+@pytest.mark.parametrize("domain", ["automation", "script"])
+async def test_trace_memory_budget(hass, hass_ws_client, domain):
+    """Test the oldest traces are removed when the memory budget is exceeded."""
+    id = 1
+
+    def next_id():
+        nonlocal id
+        id += 1
+        return id
+
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "event", "event_type": "test_event"},
+        "action": {"event": "some_event"},
+    }
+    moon_config = {
+        "id": "moon",
+        "trigger": {"platform": "event", "event_type": "test_event2"},
+        "action": {"event": "another_event"},
+    }
+    await _setup_automation_or_script(hass, domain, [sun_config, moon_config])
+    client = await hass_ws_client()
+
+    await client.send_json({"id": next_id(), "type": "trace/list", "domain": domain})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == []
+
+    await _run_automation_or_script(hass, domain, sun_config, "test_event")
+    await hass.async_block_till_done()
+    for _ in range(2):
+        await _run_automation_or_script(hass, domain, moon_config, "test_event2")
+        await hass.async_block_till_done()
+
+    memory = hass.data[DATA_TRACE_MEMORY]
+    assert memory.size > 0
+    # Only leave room for the trace which is about to be stored
+    memory.budget = 1
+    await _run_automation_or_script(hass, domain, moon_config, "test_event2")
+    await hass.async_block_till_done()
+
+    await client.send_json({"id": next_id(), "type": "trace/list", "domain": domain})
+    response = await client.receive_json()
+    assert response["success"]
+    assert len(_find_traces(response["result"], domain, "sun")) == 0
+    assert len(_find_traces(response["result"], domain, "moon")) == 1
+    assert memory.size == 0
+
+
+async def test_trace_compact(hass, hass_ws_client):
+    """Test compact traces reference the states instead of keeping them."""
+    hass.states.async_set("sensor.light", "dark", {"big": "attribute"})
+    sun_config = {
+        "id": "sun",
+        "trigger": {"platform": "state", "entity_id": "sensor.light"},
+        "action": {"event": "some_event"},
+        "trace": {"compact": True},
+    }
+    await _setup_automation_or_script(hass, "automation", [sun_config])
+    client = await hass_ws_client()
+
+    hass.states.async_set("sensor.light", "bright", {"big": "attribute"})
+    await hass.async_block_till_done()
+    new_state = hass.states.get("sensor.light")
+
+    await client.send_json({"id": 1, "type": "trace/list", "domain": "automation"})
+    response = await client.receive_json()
+    run_id = _find_run_id(response["result"], "automation", "sun")
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "trace/get",
+            "domain": "automation",
+            "item_id": "sun",
+            "run_id": run_id,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    trigger = response["result"]["trace"]["trigger/0"][0]["changed_variables"][
+        "trigger"
+    ]
+    assert trigger["to_state"] == {
+        "entity_id": "sensor.light",
+        "last_updated": new_state.last_updated.isoformat(),
+    }
+    assert trigger["from_state"]["entity_id"] == "sensor.light"
+    assert "attributes" not in trigger["from_state"]
+
+
 @pytest.mark.parametrize(
     "domain,num_restored_moon_traces", [("automation", 3), ("script", 1)]
 )
@@ -19,7 +19,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.loader import async_get_integration
-from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
+from homeassistant.setup import DATA_IMPORT_TIME, DATA_SETUP_TIME, async_setup_component
 
 from tests.common import MockEntity, MockEntityPlatform, async_mock_service
 
@@ -666,6 +666,130 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities sends a snapshot followed by state diffs."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.other": True}}}
+    )
+    hass.states.async_set("light.permitted", "off", {"color": "red", "size": 1})
+    hass.states.async_set("light.not_permitted", "on")
+    original_state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "a": {"color": "red", "size": 1},
+                "c": original_state.context.id,
+                "lc": original_state.last_changed.timestamp(),
+                "s": "off",
+            }
+        }
+    }
+
+    hass.states.async_set("light.not_permitted", "off")
+    hass.states.async_set("light.permitted", "on", {"color": "blue"})
+    new_state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"color": "blue"},
+                    "c": new_state.context.id,
+                    "lc": new_state.last_changed.timestamp(),
+                    "s": "on",
+                },
+                "-": {"a": ["size"]},
+            }
+        }
+    }
+
+    hass.states.async_set("light.other", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {
+            "light.other": {
+                "a": {},
+                "c": hass.states.get("light.other").context.id,
+                "lc": hass.states.get("light.other").last_changed.timestamp(),
+                "s": "on",
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+
+async def test_subscribe_entities_filtered(hass, websocket_client):
+    """Test subscribe entities only sends the requested entities."""
+    context = Context(user_id="abc")
+    hass.states.async_set("light.one", "off", context=context)
+    hass.states.async_set("light.two", "off")
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "subscribe_entities", "entity_ids": ["light.one"]}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.one"]
+    assert msg["event"]["a"]["light.one"]["c"] == {
+        "id": context.id,
+        "parent_id": None,
+        "user_id": "abc",
+    }
+
+    hass.states.async_set("light.two", "on")
+    hass.states.async_set("light.one", "off", {"brightness": 5}, context=context)
+    state = hass.states.get("light.one")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.one": {
+                "+": {"a": {"brightness": 5}, "lu": state.last_updated.timestamp()}
+            }
+        }
+    }
+
+
+async def test_subscribe_entities_not_allows_nan(hass, websocket_client):
+    """Test subscribe entities skips the states that cannot be serialized."""
+    hass.states.async_set("greeting.hello", "world")
+    hass.states.async_set("greeting.bad", "data", {"hello": float("NaN")})
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "event"
+    assert list(msg["event"]["a"]) == ["greeting.hello"]
+
+    hass.states.async_set("greeting.hello", "universe")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["greeting.hello"]["+"]["s"] == "universe"
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
@@ -1295,6 +1419,26 @@ async def test_integration_setup_info(hass, websocket_client, hass_admin_user):
     ]
 
 
+async def test_integration_setup_info_import_time(hass, websocket_client):
+    """Test setup_info reports the time spent importing an integration."""
+    hass.data[DATA_SETUP_TIME] = {
+        "august": datetime.timedelta(seconds=12.5),
+        "isy994": datetime.timedelta(seconds=12.8),
+    }
+    hass.data[DATA_IMPORT_TIME] = {
+        "august": datetime.timedelta(seconds=0.5),
+        "august.lock": datetime.timedelta(seconds=0.25),
+    }
+    await websocket_client.send_json({"id": 7, "type": "integration/setup_info"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == [
+        {"domain": "august", "seconds": 12.5, "import_seconds": 0.75},
+        {"domain": "isy994", "seconds": 12.8},
+    ]
+
+
 @pytest.mark.parametrize(
     "key,config",
     (
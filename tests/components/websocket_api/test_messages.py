@@ -3,6 +3,7 @@
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
     cached_event_message,
+    event_message,
     message_to_json,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -96,3 +97,26 @@ async def test_message_to_json(caplog):
 
 class _Unserializeable:
     """A class that cannot be serialized."""
+
+
+async def test_state_changed_event_message_reuses_state_json(hass):
+    """Test state_changed event messages embed the cached JSON of the states."""
+
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"brightness": 100})
+    hass.states.async_set("light.window", "off")
+    await hass.async_block_till_done()
+
+    lru_event_cache.cache_clear()
+    for event in events:
+        assert cached_event_message(2, event) == message_to_json(
+            event_message(2, event)
+        )
+    assert events[1].data["old_state"].as_json() in cached_event_message(2, events[1])
@@ -679,6 +679,59 @@ async def test_deleted_device_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_for_area_and_config_entry_index(registry):
+    """Test the lookups by area and config entry follow updates."""
+    entry1 = registry.async_get_or_create(
+        config_entry_id="123",
+        identifiers={("bridgeid", "0123")},
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="123",
+        identifiers={("bridgeid", "4567")},
+    )
+    entry1 = registry.async_update_device(entry1.id, area_id="kitchen")
+    entry2 = registry.async_update_device(entry2.id, area_id="kitchen")
+
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [
+        entry1,
+        entry2,
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [
+        entry1,
+        entry2,
+    ]
+
+    # Updates that keep the area and config entries keep the order
+    entry1 = registry.async_update_device(entry1.id, name_by_user="Renamed")
+    entry1 = registry.async_get_or_create(
+        config_entry_id="456",
+        identifiers={("bridgeid", "0123")},
+    )
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [
+        entry1,
+        entry2,
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [
+        entry1,
+        entry2,
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [entry1]
+
+    entry2 = registry.async_update_device(entry2.id, area_id="living_room")
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [entry1]
+    assert device_registry.async_entries_for_area(registry, "living_room") == [entry2]
+
+    registry.async_clear_config_entry("123")
+    entry1 = registry.async_get(entry1.id)
+    assert device_registry.async_entries_for_config_entry(registry, "123") == []
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [entry1]
+    assert device_registry.async_entries_for_area(registry, "living_room") == []
+
+    registry.async_remove_device(entry1.id)
+    assert device_registry.async_entries_for_area(registry, "kitchen") == []
+    assert device_registry.async_entries_for_config_entry(registry, "456") == []
+
+
 async def test_specifying_via_device_create(registry):
     """Test specifying a via_device and removal of the hub device."""
     via = registry.async_get_or_create(
@@ -1217,6 +1217,61 @@ def test_entity_registry_items():
     assert entities.get_entry(entry2.id) is None
 
 
+async def test_entries_for_device_area_config_entry_index(hass, registry):
+    """Test the lookups by device, area and config entry follow updates."""
+    entry1 = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=MockConfigEntry(entry_id="mock-id-1")
+    )
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "2345", config_entry=MockConfigEntry(entry_id="mock-id-1")
+    )
+    entry1 = registry.async_update_entity(
+        entry1.entity_id, area_id="kitchen", device_id="device-1"
+    )
+    entry2 = registry.async_update_entity(
+        entry2.entity_id, area_id="kitchen", device_id="device-1"
+    )
+
+    assert er.async_entries_for_area(registry, "kitchen") == [entry1, entry2]
+    assert er.async_entries_for_device(registry, "device-1") == [entry1, entry2]
+    assert er.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry1,
+        entry2,
+    ]
+
+    # Updates that keep the area and device keep the order
+    entry1 = registry.async_update_entity(entry1.entity_id, name="Renamed")
+    assert er.async_entries_for_area(registry, "kitchen") == [entry1, entry2]
+
+    # A new entity_id moves the entry to the end, like in the registry itself
+    entry1 = registry.async_update_entity(
+        entry1.entity_id, new_entity_id="light.renamed"
+    )
+    assert er.async_entries_for_area(registry, "kitchen") == [entry2, entry1]
+    assert er.async_entries_for_device(registry, "device-1") == [entry2, entry1]
+
+    entry2 = registry.async_update_entity(
+        entry2.entity_id, area_id="living_room", device_id="device-2"
+    )
+    assert er.async_entries_for_area(registry, "kitchen") == [entry1]
+    assert er.async_entries_for_area(registry, "living_room") == [entry2]
+    assert er.async_entries_for_device(registry, "device-2") == [entry2]
+
+    registry.async_clear_area_id("kitchen")
+    assert er.async_entries_for_area(registry, "kitchen") == []
+
+    registry.async_remove(entry2.entity_id)
+    assert er.async_entries_for_area(registry, "living_room") == []
+    assert er.async_entries_for_device(registry, "device-2") == []
+    assert er.async_entries_for_config_entry(registry, "mock-id-1") == [
+        registry.async_get("light.renamed")
+    ]
+
+    registry.async_clear_config_entry("mock-id-1")
+    assert er.async_entries_for_config_entry(registry, "mock-id-1") == []
+    assert registry.async_get("light.renamed") is None
+
+
 async def test_deprecated_disabled_by_str(hass, registry, caplog):
     """Test deprecated str use of disabled_by converts to enum and logs a warning."""
     entry = registry.async_get_or_create(
@@ -1990,6 +1990,68 @@ async def test_track_template_result_and_conditional(hass):
     assert specific_runs[2] == "on"
 
 
+async def test_track_template_result_skips_unread_attributes(hass):
+    """Test changes of attributes the template did not read do not re-render."""
+    hass.states.async_set("climate.living_room", "heat", {"temperature": 20})
+    template_state = Template("{{ states('climate.living_room') }}", hass)
+    template_attribute = Template(
+        "{{ state_attr('climate.living_room', 'temperature') }}", hass
+    )
+    renders = []
+    original_render_to_info = Template.async_render_to_info
+
+    def render_to_info(self, *args, **kwargs):
+        renders.append(self.template)
+        return original_render_to_info(self, *args, **kwargs)
+
+    runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        runs.extend(update.result for update in updates)
+
+    with patch.object(Template, "async_render_to_info", render_to_info):
+        info = async_track_template_result(
+            hass,
+            [
+                TrackTemplate(template_state, None),
+                TrackTemplate(template_attribute, None),
+            ],
+            refresh_listener,
+        )
+        await hass.async_block_till_done()
+        renders.clear()
+
+        hass.states.async_set(
+            "climate.living_room",
+            "heat",
+            {"temperature": 20, "current_temperature": 19},
+        )
+        await hass.async_block_till_done()
+        assert renders == []
+        assert runs == []
+
+        hass.states.async_set(
+            "climate.living_room",
+            "heat",
+            {"temperature": 21, "current_temperature": 19},
+        )
+        await hass.async_block_till_done()
+        assert renders == [template_attribute.template]
+        assert runs == [21]
+
+        hass.states.async_set(
+            "climate.living_room",
+            "off",
+            {"temperature": 21, "current_temperature": 18},
+        )
+        await hass.async_block_till_done()
+        assert renders == [template_attribute.template, template_state.template]
+        assert runs == [21, "off"]
+
+    info.async_remove()
+
+
 async def test_track_template_result_iterator(hass):
     """Test tracking template."""
     iterator_runs = []
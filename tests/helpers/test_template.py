@@ -31,6 +31,7 @@ from homeassistant.util.unit_system import UnitSystem
 
 from tests.common import (
     MockConfigEntry,
+    async_fire_time_changed,
     mock_area_registry,
     mock_device_registry,
     mock_registry,
@@ -1222,6 +1223,57 @@ def test_state_attr(hass):
     assert tpl.async_render() is True
 
 
+def test_render_info_collects_fields_and_attributes(hass):
+    """Test only changes of the state fields and attributes read re-render."""
+    hass.states.async_set("media_player.one", "playing", {"volume_level": 0.5})
+    hass.states.async_set("media_player.two", "paused", {"volume_level": 0.3})
+    old_one = hass.states.get("media_player.one")
+    old_two = hass.states.get("media_player.two")
+
+    info = template.Template(
+        "{{ states('media_player.one') }}"
+        " {{ state_attr('media_player.two', 'volume_level') }}",
+        hass,
+    ).async_render_to_info()
+    assert_result_info(info, "playing 0.3", ["media_player.one", "media_player.two"])
+    assert info.entity_fields == {"media_player.one": {"state"}}
+    assert info.entity_attributes == {"media_player.two": {"volume_level"}}
+
+    hass.states.async_set("media_player.one", "playing", {"volume_level": 0.6})
+    hass.states.async_set("media_player.two", "playing", {"volume_level": 0.3})
+    assert not info.filter_state_change(
+        "media_player.one", old_one, hass.states.get("media_player.one")
+    )
+    assert not info.filter_state_change(
+        "media_player.two", old_two, hass.states.get("media_player.two")
+    )
+    assert info.filter_state_change(
+        "media_player.one", None, hass.states.get("media_player.one")
+    )
+
+    hass.states.async_set("media_player.one", "idle", {"volume_level": 0.6})
+    hass.states.async_set("media_player.two", "playing", {"volume_level": 0.4})
+    assert info.filter_state_change(
+        "media_player.one", old_one, hass.states.get("media_player.one")
+    )
+    assert info.filter_state_change(
+        "media_player.two", old_two, hass.states.get("media_player.two")
+    )
+
+    info = template.Template(
+        "{{ states.media_player.one.attributes.volume_level }}", hass
+    ).async_render_to_info()
+    assert info.entity_fields == {"media_player.one": {"attributes"}}
+
+    info = template.Template(
+        "{{ expand('media_player.one') | map(attribute='state') | list }}", hass
+    ).async_render_to_info()
+    assert info.entities_all_fields == {"media_player.one"}
+    assert info.filter_state_change(
+        "media_player.one", old_one, hass.states.get("media_player.one")
+    )
+
+
 def test_states_function(hass):
     """Test using states as a function."""
     hass.states.async_set("test.object", "available")
@@ -2576,6 +2628,44 @@ async def test_area_entities(hass):
     assert info.rate_limit is None
 
 
+async def test_states_aggregates(hass):
+    """Test the aggregate functions over numeric states."""
+    area_registry = mock_area_registry(hass)
+    entity_registry = mock_registry(hass)
+    area_entry = area_registry.async_get_or_create("Kitchen")
+    entity_registry.async_get_or_create(
+        "sensor", "test", "fridge", area_id=area_entry.id, suggested_object_id="fridge"
+    )
+    hass.states.async_set("sensor.fridge", "120", {"device_class": "power"})
+    hass.states.async_set("sensor.tv", "80", {"device_class": "power"})
+    hass.states.async_set("sensor.outside", "-5", {"device_class": "temperature"})
+    hass.states.async_set("sensor.broken", "unavailable", {"device_class": "power"})
+    hass.states.async_set("light.kitchen", "on")
+
+    info = render_to_info(
+        hass,
+        "{{ states_sum('sensor') }} {{ states_min('sensor') }}"
+        " {{ states_max('sensor') }} {{ states_count('sensor') }}",
+    )
+    assert_result_info(info, "195.0 -5.0 120.0 3", [], ["sensor"])
+    assert info.rate_limit == template.DOMAIN_STATES_RATE_LIMIT
+
+    info = render_to_info(
+        hass,
+        "{{ states_mean('sensor', device_class='power') }}"
+        " {{ states_sum('sensor', 'Kitchen') }}"
+        f" {{{{ states_count('sensor', '{area_entry.id}', 'temperature') }}}}",
+    )
+    assert info.result() == "100.0 120.0 0"
+
+    info = render_to_info(hass, "{{ states_mean('light') }} {{ states_max('light') }}")
+    assert_result_info(info, "None None", [], ["light"])
+
+    info = render_to_info(hass, "{{ states_sum('light.kitchen') }}")
+    with pytest.raises(TemplateError):
+        info.result()
+
+
 async def test_area_devices(hass):
     """Test area_devices function."""
     config_entry = MockConfigEntry(domain="light")
@@ -3225,35 +3315,86 @@ def test_iif(hass: HomeAssistant) -> None:
     assert tpl.async_render() == "no"
 
 
-async def test_cache_garbage_collection():
-    """Test caching a template."""
+async def test_compiled_code_shared_between_templates():
+    """Test templates with the same source share the compiled code."""
     template_string = (
         "{% set dict = {'foo': 'x&y', 'bar': 42} %} {{ dict | urlencode }}"
     )
-    tpl = template.Template(
-        (template_string),
-    )
+    tpl = template.Template(template_string)
     tpl.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
-
-    tpl2 = template.Template(
-        (template_string),
-    )
+    tpl2 = template.Template(template_string)
     tpl2.ensure_valid()
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    assert tpl._compiled_code is tpl2._compiled_code
 
     del tpl
-    assert template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
     del tpl2
-    assert not template._NO_HASS_ENV.template_cache.get(
-        template_string
-    )  # pylint: disable=protected-access
+    tpl3 = template.Template(template_string)
+    with patch("jinja2.sandbox.ImmutableSandboxedEnvironment.compile") as mock_compile:
+        tpl3.ensure_valid()
+    assert not mock_compile.called
+    assert tpl3._compiled_code is not None
+
+
+async def test_compiled_code_cache_eviction():
+    """Test the least recently used compiled code is evicted."""
+    template._COMPILED_CACHE.clear()
+    with patch.object(template, "COMPILED_CACHE_SIZE", 2):
+        template.Template("{{ 'evict_1' }}").ensure_valid()
+        template.Template("{{ 'evict_2' }}").ensure_valid()
+        template.Template("{{ 'evict_1' }}").ensure_valid()
+        template.Template("{{ 'evict_3' }}").ensure_valid()
+
+    cached_sources = [key[0] for key in template._COMPILED_CACHE]
+    assert "{{ 'evict_1' }}" in cached_sources
+    assert "{{ 'evict_2' }}" not in cached_sources
+    assert "{{ 'evict_3' }}" in cached_sources
+
+
+async def test_compiled_code_cache_hass_only_filters(hass):
+    """Test code compiled with the hass filters is not used without hass."""
+    template_string = "{{ 'sensor.cached' | area_id }}"
+    template.Template(template_string, hass).ensure_valid()
+
+    with pytest.raises(TemplateError):
+        template.Template(template_string).ensure_valid()
+
+
+async def test_bytecode_cache(hass, hass_storage):
+    """Test compiled code is persisted and loaded on the next run."""
+    template_string = "{{ 'bytecode' ~ states('sensor.bytecode') }}"
+    await template.async_load_bytecode_cache(hass)
+    template._COMPILED_CACHE.clear()
+
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render() == "bytecodeunknown"
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=template.BYTECODE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+
+    data = hass_storage[template.BYTECODE_STORAGE_KEY]["data"]
+    assert data["magic"] == template._bytecode_magic()
+    assert len(data["code"]) == 1
+
+    template._COMPILED_CACHE.clear()
+    await template.async_load_bytecode_cache(hass)
+    hass.states.async_set("sensor.bytecode", "ok")
+    with patch("jinja2.sandbox.ImmutableSandboxedEnvironment.compile") as mock_compile:
+        tpl = template.Template(template_string, hass)
+        assert tpl.async_render() == "bytecodeok"
+    assert not mock_compile.called
+
+    # Code persisted by another version is compiled again
+    data["magic"] = "other"
+    template._COMPILED_CACHE.clear()
+    await template.async_load_bytecode_cache(hass)
+    with patch(
+        "jinja2.sandbox.ImmutableSandboxedEnvironment.compile",
+        return_value=tpl._compiled_code,
+    ) as mock_compile:
+        template.Template(template_string, hass).ensure_valid()
+    assert mock_compile.called
 
 
 def test_is_template_string():
@@ -7,11 +7,12 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from homeassistant import bootstrap, core, runner
+from homeassistant import bootstrap, core, loader, runner
 import homeassistant.config as config_util
 from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATONS
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.setup import DATA_IMPORT_TIME
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
@@ -379,6 +380,58 @@ def mock_ensure_config_exists():
         yield ensure_config_exists
 
 
+async def test_preload_integrations(hass):
+    """Test integrations are imported after their dependencies."""
+    domains = {"automation", "blueprint", "trace", "template", "sensor"}
+    integrations = {
+        domain: await loader.async_get_integration(hass, domain) for domain in domains
+    }
+    order = []
+    original_preload = bootstrap._preload_integration
+
+    def _preload_integration(integration, platforms):
+        order.append(integration.domain)
+        return original_preload(integration, platforms)
+
+    with patch.object(bootstrap, "_preload_integration", _preload_integration):
+        await bootstrap._async_preload_integrations(hass, integrations, domains)
+
+    assert set(order) == domains
+    assert order.index("automation") > order.index("blueprint")
+    assert order.index("automation") > order.index("trace")
+    import_time = hass.data[DATA_IMPORT_TIME]
+    assert {"automation", "template", "template.sensor", "sensor"} <= set(import_time)
+    assert "template.light" not in import_time
+
+
+async def test_preload_integrations_circular_dependency(hass):
+    """Test integrations that depend on each other are still imported."""
+    integrations = {
+        domain: Mock(domain=domain, dependencies=dependencies)
+        for domain, dependencies in (
+            ("mod_a", ["mod_b"]),
+            ("mod_b", ["mod_a"]),
+            ("mod_c", ["mod_c", "mod_a"]),
+        )
+    }
+    order = []
+
+    def _preload_integration(integration, platforms):
+        order.append(integration.domain)
+        return {}
+
+    with patch.object(bootstrap, "_preload_integration", _preload_integration):
+        await asyncio.wait_for(
+            bootstrap._async_preload_integrations(
+                hass, integrations, set(integrations)
+            ),
+            5,
+        )
+
+    assert sorted(order) == ["mod_a", "mod_b", "mod_c"]
+    assert order.index("mod_c") > order.index("mod_a")
+
+
 async def test_setup_hass(
     mock_enable_logging,
     mock_is_virtual_env,
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -33,11 +34,13 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import (
+    HomeAssistantError,
     InvalidEntityFormatError,
     InvalidStateError,
     MaxLengthExceeded,
     ServiceNotFound,
 )
+from homeassistant.helpers.json import JSON_DUMP
 import homeassistant.util.dt as dt_util
 from homeassistant.util.read_only_dict import ReadOnlyDict
 from homeassistant.util.unit_system import METRIC_SYSTEM
@@ -398,6 +401,35 @@ def test_state_as_dict():
     assert state.as_dict() is as_dict_1
 
 
+def test_state_as_json():
+    """Test a State as JSON."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog", "weight": 1.5},
+        last_updated=last_time,
+        last_changed=last_time,
+        context=ha.Context(user_id="abc", parent_id="def"),
+    )
+    as_json_1 = state.as_json()
+    assert as_json_1 == JSON_DUMP(state.as_dict())
+    assert json.loads(as_json_1) == state.as_dict()
+    # 2nd time to verify cache
+    assert state.as_json() is as_json_1
+    assert state.attributes_json() == '{"pig":"dog","weight":1.5}'
+    assert state.attributes_json() is state.attributes_json()
+
+
+def test_state_as_json_not_allows_nan():
+    """Test a State with NaN attributes can not be serialized to JSON."""
+    state = ha.State("happy.happy", "on", {"pig": float("NaN")})
+    with pytest.raises(ValueError):
+        state.as_json()
+    with pytest.raises(ValueError):
+        state.attributes_json()
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -446,6 +478,116 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass):
+    """Test we can listen for events with specific data values."""
+    calls = []
+    other_calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def other_listener(event):
+        """Mock listener."""
+        other_calls.append(event)
+
+    old_count = len(hass.bus.async_listeners())
+    unsub = hass.bus.async_listen_keyed(
+        "test", "entity_id", ["light.kitchen", "light.bowl"], listener
+    )
+    unsub_other = hass.bus.async_listen_keyed(
+        "test", "entity_id", "light.kitchen", other_listener
+    )
+    assert len(hass.bus.async_listeners()) == old_count + 1
+    assert hass.bus.async_listeners()["test"] == 2
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.bowl"})
+    hass.bus.async_fire("test", {"entity_id": "light.porch"})
+    hass.bus.async_fire("test", {"entity_id": ["light.kitchen"]})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in calls] == [
+        "light.kitchen",
+        "light.bowl",
+    ]
+    assert [event.data["entity_id"] for event in other_calls] == ["light.kitchen"]
+
+    unsub()
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 2
+    assert len(other_calls) == 2
+
+    unsub_other()
+    assert len(hass.bus.async_listeners()) == old_count
+    assert not hass.bus._keyed_listeners
+
+
+async def test_eventbus_keyed_listener_remove(hass, caplog):
+    """Test removing keyed listeners leaves no empty entries behind."""
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+
+    old_count = len(hass.bus.async_listeners())
+    unsub = hass.bus.async_listen_keyed(
+        "test", "entity_id", ["light.kitchen", "light.bowl"], listener
+    )
+    unsub_other = hass.bus.async_listen_keyed(
+        "test", "entity_id", "light.kitchen", listener
+    )
+    unsub_empty = hass.bus.async_listen_keyed("test", "entity_id", [], listener)
+    assert hass.bus.async_listeners()["test"] == 2
+
+    unsub()
+    unsub()
+    assert "Unable to remove unknown job listener" in caplog.text
+    assert list(hass.bus._keyed_listeners["test"]["entity_id"]) == ["light.kitchen"]
+    assert hass.bus.async_listeners()["test"] == 1
+
+    unsub_empty()
+    unsub_other()
+    assert len(hass.bus.async_listeners()) == old_count
+    assert not hass.bus._keyed_listeners
+
+
+async def test_eventbus_keyed_listener_with_filter(hass):
+    """Test keyed listeners can still prefilter events."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def filter(event):
+        """Mock filter."""
+        return not event.data["filtered"]
+
+    unsub = hass.bus.async_listen_keyed(
+        "test", "domain", "light", listener, event_filter=filter
+    )
+
+    hass.bus.async_fire("test", {"domain": "light", "filtered": True})
+    hass.bus.async_fire("test", {"domain": "light", "filtered": False})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+
+    unsub()
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed("test", "domain", "light", listener, lambda _: True)
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -702,6 +844,27 @@ async def test_statemachine_remove(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_numeric_states(hass):
+    """Test the numeric states are indexed by domain."""
+    assert hass.states.async_numeric_states("sensor") == {}
+
+    hass.states.async_set("sensor.power", "12.5")
+    hass.states.async_set("sensor.energy", "3")
+    hass.states.async_set("sensor.text", "on")
+    hass.states.async_set("sensor.nan", "nan")
+    hass.states.async_set("number.level", "4")
+    assert hass.states.async_numeric_states("sensor") == {
+        "sensor.power": 12.5,
+        "sensor.energy": 3.0,
+    }
+    assert hass.states.async_numeric_states("number") == {"number.level": 4.0}
+
+    hass.states.async_set("sensor.power", "unavailable")
+    hass.states.async_set("sensor.text", "7")
+    hass.states.async_remove("sensor.energy")
+    assert hass.states.async_numeric_states("sensor") == {"sensor.text": 7.0}
+
+
 async def test_statemachine_case_insensitivty(hass):
     """Test insensitivty."""
     events = async_capture_events(hass, EVENT_STATE_CHANGED)
@@ -1,4 +1,5 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
@@ -6,8 +7,9 @@ import pytest
 from homeassistant import core, loader
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
+import homeassistant.util.dt as dt_util
 
-from tests.common import MockModule, mock_integration
+from tests.common import MockModule, async_fire_time_changed, mock_integration
 
 
 async def test_component_dependencies(hass):
@@ -592,6 +594,73 @@ async def test_get_custom_components_safe_mode(hass):
     assert await loader.async_get_custom_components(hass) == {}
 
 
+async def test_integration_index(hass, hass_storage, enable_custom_integrations):
+    """Test resolved integrations are persisted and used after a restart."""
+    integration = await loader.async_get_integration(hass, "automation")
+    assert await integration.resolve_dependencies()
+    custom_integration = await loader.async_get_integration(hass, "test_package")
+    assert "light" in (await loader.async_get_integration(hass, "hue")).platforms
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + timedelta(seconds=loader.INTEGRATION_INDEX_SAVE_DELAY),
+    )
+    await hass.async_block_till_done()
+
+    data = hass_storage[loader.INTEGRATION_INDEX_STORAGE_KEY]["data"]
+    entry = data["integrations"]["homeassistant.components.automation"]
+    assert entry["manifest"]["domain"] == "automation"
+    assert entry["all_dependencies"] == sorted(integration.all_dependencies)
+    assert "trace" in entry["all_dependencies"]
+    assert "custom_components.test_package" in data["integrations"]
+    assert "test_package" in data["custom_components"]
+
+    def _restart():
+        for key in (
+            loader.DATA_INTEGRATIONS,
+            loader.DATA_CUSTOM_COMPONENTS,
+            loader.DATA_INTEGRATION_INDEX,
+        ):
+            hass.data.pop(key)
+
+    _restart()
+    with patch.object(
+        loader.Integration,
+        "resolve_from_root",
+        wraps=loader.Integration.resolve_from_root,
+    ) as mock_resolve:
+        restored = await loader.async_get_integration(hass, "automation")
+        restored_custom = await loader.async_get_integration(hass, "test_package")
+    # Only the custom integrations that were blocked from loading are resolved
+    resolved = {call[0][2] for call in mock_resolve.call_args_list}
+    assert "automation" not in resolved
+    assert "test_package" not in resolved
+    assert "test_no_version" in resolved
+    assert restored.all_dependencies_resolved
+    assert restored.all_dependencies == integration.all_dependencies
+    assert restored.file_path == integration.file_path
+    assert restored_custom.manifest == custom_integration.manifest
+    assert restored_custom.pkg_path == "custom_components.test_package"
+
+    # The index is thrown away when a built-in integration changes
+    _restart()
+    with patch.object(
+        loader, "_newest_integration_mtime", return_value=1.0
+    ), patch.object(
+        loader.Integration,
+        "resolve_from_root",
+        wraps=loader.Integration.resolve_from_root,
+    ) as mock_resolve:
+        assert (await loader.async_get_integration(hass, "automation")).manifest
+    assert "automation" in {call[0][2] for call in mock_resolve.call_args_list}
+    assert 1.0 in hass.data[loader.DATA_INTEGRATION_INDEX].validation["mtimes"].values()
+
+    # The index is thrown away after an upgrade
+    _restart()
+    with patch.object(loader, "__version__", "2000.1.0"):
+        assert (await loader.async_get_integration(hass, "automation")).manifest
+    assert hass.data[loader.DATA_INTEGRATION_INDEX].validation["version"] == "2000.1.0"
+
+
 async def test_custom_integration_missing_version(hass, caplog):
     """Test trying to load a custom integration without a version twice does not deadlock."""
     with pytest.raises(loader.IntegrationNotFound):
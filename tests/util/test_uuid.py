@@ -1,5 +1,6 @@
 """Test Home Assistant uuid util methods."""
 
+from unittest.mock import patch
 import uuid
 
 import homeassistant.util.uuid as uuid_util
@@ -9,3 +10,14 @@ async def test_uuid_util_random_uuid_hex():
     """Verify we can generate a random uuid."""
     assert len(uuid_util.random_uuid_hex()) == 32
     assert uuid.UUID(uuid_util.random_uuid_hex())
+
+
+async def test_uuid_util_ulid_hex():
+    """Verify we can generate a ulid that sorts by creation time."""
+    with patch("homeassistant.util.uuid.time.time", return_value=1):
+        first = uuid_util.ulid_hex()
+    second = uuid_util.ulid_hex()
+    assert len(first) == 32
+    assert uuid.UUID(first)
+    assert first.startswith("0000000003e8")
+    assert first < second